@@ -0,0 +1,207 @@
+"""Benchmarks for the render and export pipeline on synthetic events"""
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from lobby_data import SESSION_SCHEMA, SPEAKER_SCHEMA, coerce_table
+from lobby_renderer import LobbyRenderer, RenderCache, fingerprint_data
+
+# Synthetic event sizes exercised by default
+BENCHMARK_SCENARIOS = [
+    {'name': 'small', 'sessions': 100, 'speakers': 40, 'tags': 20},
+    {'name': 'medium', 'sessions': 10_000, 'speakers': 2_000, 'tags': 200},
+    {'name': 'large', 'sessions': 100_000, 'speakers': 20_000, 'tags': 2_000}
+]
+
+# Pipeline stages timed for each scenario, in pipeline order
+BENCHMARK_STAGES = ['generate_css', 'generate_html', 'generate_sections_html', 'export_complete_package']
+
+# Fraction by which a stage may exceed its baseline before the run counts as a regression
+DEFAULT_REGRESSION_BUDGET = 0.25
+
+# Absolute differences below these are treated as measurement noise, never as regressions
+MIN_REGRESSION_SECONDS = 0.005
+MIN_REGRESSION_MB = 1.0
+
+# Fixed package timestamp so export output sizes are comparable between runs
+BENCHMARK_TIMESTAMP = datetime(2024, 1, 1)
+
+# Config used for synthetic events unless another is given
+DEFAULT_BENCHMARK_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+SYNTHETIC_STATUSES = ['live', 'upcoming', 'finished']
+SYNTHETIC_TRACKS = ['AI/ML', 'Quantum', 'Blockchain', 'Automotive', 'DevOps', 'Security', 'Cloud', 'Data']
+SYNTHETIC_LEVELS = ['Beginner', 'Intermediate', 'Advanced', 'Expert']
+
+
+def synthetic_event(sessions, speakers, tags, seed=0):
+    """Generate reproducible session and speaker data of the requested size
+
+    Sessions are spread over the speakers at random and each session gets
+    one to three tags drawn from a vocabulary of the given cardinality.
+    """
+    rng = np.random.default_rng(seed)
+    speaker_names = [f"Speaker {number}" for number in range(speakers)]
+    tag_vocabulary = np.array([f"Tag {number}" for number in range(tags)])
+    start_hours = rng.integers(8, 18, sessions)
+
+    session_data = pd.DataFrame({
+        'id': np.arange(1, sessions + 1),
+        'title': [f"Session {number}: Building Systems at Scale" for number in range(1, sessions + 1)],
+        'speaker': np.array(speaker_names)[rng.integers(0, speakers, sessions)],
+        'company': [f"Company {number % 500}" for number in range(sessions)],
+        'time': [f"{hour % 12 or 12}:00 {'AM' if hour < 12 else 'PM'} - {(hour + 1) % 12 or 12}:00 {'AM' if hour + 1 < 12 else 'PM'}"
+                 for hour in start_hours],
+        'description': "A deep dive into the techniques, trade-offs and tooling behind this topic.",
+        'status': rng.choice(SYNTHETIC_STATUSES, sessions),
+        'featured': rng.random(sessions) < 0.1,
+        'track': rng.choice(SYNTHETIC_TRACKS, sessions),
+        'level': rng.choice(SYNTHETIC_LEVELS, sessions),
+        'tags': [list(rng.choice(tag_vocabulary, rng.integers(1, 4), replace=False)) for _ in range(sessions)]
+    })
+    speaker_data = pd.DataFrame({
+        'name': speaker_names,
+        'title': "Principal Engineer",
+        'company': [f"Company {number % 500}" for number in range(speakers)],
+        'bio': "Builds and operates large distributed systems.",
+        'sessions': 0,
+        'twitter': [f"@speaker{number}" for number in range(speakers)],
+        'linkedin': [f"speaker{number}" for number in range(speakers)],
+        'photo': ''
+    })
+
+    session_data, _ = coerce_table(session_data, SESSION_SCHEMA)
+    speaker_data, _ = coerce_table(speaker_data, SPEAKER_SCHEMA)
+    return session_data.reset_index(drop=True), speaker_data.reset_index(drop=True)
+
+
+def stage_runners(config, session_data, speaker_data):
+    """Return a prepare callable per stage
+
+    Each prepare callable sets up a renderer with a cold cache and returns
+    the zero-argument run callable that is actually measured.
+    """
+    def fresh_renderer():
+        return LobbyRenderer(config, session_data, speaker_data, RenderCache())
+
+    def prepare_sections():
+        renderer = fresh_renderer()
+        session_fingerprint = fingerprint_data(session_data)
+        speaker_fingerprint = fingerprint_data(speaker_data)
+        session_cards = renderer.render_session_cards(session_data)
+        speaker_cards = renderer.render_speaker_cards(
+            speaker_data, renderer.speaker_session_counts(session_fingerprint), True
+        )
+        return lambda: renderer.generate_sections_html(
+            session_cards, speaker_cards, session_fingerprint, speaker_fingerprint
+        )
+
+    def prepare_export():
+        renderer = fresh_renderer()
+
+        def run():
+            buffer = BytesIO()
+            renderer.write_package_zip(buffer, BENCHMARK_TIMESTAMP)
+            return buffer.getvalue()
+
+        return run
+
+    return {
+        'generate_css': lambda: fresh_renderer().generate_css,
+        'generate_html': lambda: fresh_renderer().generate_html,
+        'generate_sections_html': prepare_sections,
+        'export_complete_package': prepare_export
+    }
+
+
+def measure(prepare, repeat):
+    """Time a stage (best of repeat runs), then rerun it once under tracemalloc for its peak memory
+
+    tracemalloc only sees Python allocations, so Arrow-backed column buffers
+    are not part of the reported peak.
+    """
+    timings = []
+    for _ in range(repeat):
+        run = prepare()
+        started = time.perf_counter()
+        output = run()
+        timings.append(time.perf_counter() - started)
+
+    run = prepare()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    output_bytes = len(output) if isinstance(output, bytes) else len(output.encode('utf-8'))
+    return {'seconds': min(timings), 'peak_mb': peak / 1e6, 'bytes': output_bytes}
+
+
+def run_benchmarks(scenarios, config, repeat=3, stages=None, log=print):
+    """Benchmark every stage for every scenario and return the results document"""
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'repeat': repeat,
+        'scenarios': {}
+    }
+
+    for scenario in scenarios:
+        session_data, speaker_data = synthetic_event(scenario['sessions'], scenario['speakers'], scenario['tags'])
+        runners = stage_runners(config, session_data, speaker_data)
+        scenario_results = {'parameters': dict(scenario), 'stages': {}}
+
+        for stage in stages or BENCHMARK_STAGES:
+            scenario_results['stages'][stage] = measure(runners[stage], repeat)
+            stage_result = scenario_results['stages'][stage]
+            log(f"  {scenario['name']:<10} {stage:<26} {stage_result['seconds'] * 1000:>10.1f} ms "
+                f"{stage_result['peak_mb']:>9.1f} MB peak {stage_result['bytes'] / 1e6:>9.2f} MB out")
+
+        results['scenarios'][scenario['name']] = scenario_results
+
+    return results
+
+
+def find_regressions(results, baseline, budget=DEFAULT_REGRESSION_BUDGET):
+    """Return a description of every stage whose time or peak memory exceeds its baseline by more than budget"""
+    regressions = []
+
+    for name, scenario in results['scenarios'].items():
+        baseline_stages = baseline.get('scenarios', {}).get(name, {}).get('stages', {})
+        for stage, measured in scenario['stages'].items():
+            reference = baseline_stages.get(stage)
+            if not reference:
+                continue
+            for metric, noise_floor in (('seconds', MIN_REGRESSION_SECONDS), ('peak_mb', MIN_REGRESSION_MB)):
+                limit = reference[metric] * (1 + budget)
+                if measured[metric] > limit and measured[metric] - reference[metric] > noise_floor:
+                    regressions.append(
+                        f"{name}/{stage} {metric}: {measured[metric]:.4g} exceeds "
+                        f"baseline {reference[metric]:.4g} by more than {budget:.0%}"
+                    )
+
+    return regressions
+
+
+def select_scenarios(names=None, sessions=None, speakers=None, tags=None):
+    """Return the named default scenarios, or a single custom one when sessions is given"""
+    if sessions:
+        return [{
+            'name': f"custom-{sessions}",
+            'sessions': sessions,
+            'speakers': speakers or max(1, sessions // 5),
+            'tags': tags or 100
+        }]
+    if names:
+        unknown = set(names) - {scenario['name'] for scenario in BENCHMARK_SCENARIOS}
+        if unknown:
+            raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        return [scenario for scenario in BENCHMARK_SCENARIOS if scenario['name'] in names]
+    return BENCHMARK_SCENARIOS
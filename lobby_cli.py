@@ -0,0 +1,269 @@
+"""Headless command-line rendering of lobby packages, without Streamlit"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+from lobby_benchmark import (
+    DEFAULT_BENCHMARK_CONFIG, DEFAULT_REGRESSION_BUDGET, find_regressions, run_benchmarks, select_scenarios
+)
+from lobby_data import SESSION_SCHEMA, load_table
+from lobby_feed import STATUS_FEED_FILE, FeedSource, StatusFeed, serve_feed, status_feed_settings
+from lobby_renderer import LobbyRenderer
+from lobby_server import PackageSource, serve_package
+from lobby_watch import WATCH_INTERVAL_SECONDS, EventWatcher, load_event_file
+
+# Files an event directory must contain to be rendered
+EVENT_FILES = ("config.json", "sessions.csv", "speakers.csv")
+
+
+def find_events(events_dir, exclude=None):
+    """Return event directories in events_dir (including itself) that hold a full set of event files"""
+    excluded = os.path.realpath(exclude) if exclude else None
+    candidates = [events_dir] + sorted(
+        os.path.join(events_dir, entry) for entry in os.listdir(events_dir)
+    )
+
+    events = []
+    for candidate in candidates:
+        if not os.path.isdir(candidate) or os.path.realpath(candidate) == excluded:
+            continue
+        if all(os.path.isfile(os.path.join(candidate, file_name)) for file_name in EVENT_FILES):
+            events.append(candidate)
+    return events
+
+
+def event_name(event_dir):
+    """Return the name used for an event's output directory"""
+    return os.path.basename(os.path.normpath(os.path.abspath(event_dir)))
+
+
+def load_event(event_dir):
+    """Load the config, session data and speaker data for one event"""
+    return tuple(load_event_file(event_dir, file_name) for file_name in EVENT_FILES)
+
+
+def render_event(event_dir, output_dir, as_zip=False):
+    """Render one event's package into output_dir and return a result record
+
+    Errors are captured in the record rather than raised, so a broken event
+    cannot take down the rest of the batch.
+    """
+    started = time.perf_counter()
+    result = {'event': event_name(event_dir), 'ok': False, 'sessions': 0, 'bytes': 0, 'seconds': 0.0, 'error': None}
+
+    try:
+        config, session_data, speaker_data = load_event(event_dir)
+        renderer = LobbyRenderer(config, session_data, speaker_data, base_dir=event_dir)
+
+        if as_zip:
+            # Stream into a temporary name so a failed render never leaves a truncated archive behind
+            os.makedirs(os.path.dirname(output_dir) or ".", exist_ok=True)
+            partial_path = f"{output_dir}.zip.partial"
+            try:
+                with open(partial_path, "wb") as f:
+                    renderer.write_package_zip(f)
+                    result['bytes'] = f.tell()
+                os.replace(partial_path, f"{output_dir}.zip")
+            finally:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+        else:
+            os.makedirs(output_dir, exist_ok=True)
+            for file_name, content in renderer.package_files():
+                data = content if isinstance(content, bytes) else content.encode('utf-8')
+                os.makedirs(os.path.dirname(os.path.join(output_dir, file_name)), exist_ok=True)
+                with open(os.path.join(output_dir, file_name), "wb") as f:
+                    f.write(data)
+                result['bytes'] += len(data)
+
+        result['sessions'] = len(session_data)
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+def render_events(event_dirs, output_root, workers=None, as_zip=False):
+    """Render every event in parallel across a process pool and return the result records"""
+    jobs = [(event_dir, os.path.join(output_root, event_name(event_dir))) for event_dir in event_dirs]
+
+    if workers == 1:
+        return [render_event(event_dir, output_dir, as_zip) for event_dir, output_dir in jobs]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(render_event, event_dir, output_dir, as_zip): event_dir for event_dir, output_dir in jobs}
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # The worker process itself died; record it against the event and carry on
+                results.append({
+                    'event': event_name(futures[future]), 'ok': False, 'sessions': 0,
+                    'bytes': 0, 'seconds': 0.0, 'error': f"{type(e).__name__}: {e}"
+                })
+    return sorted(results, key=lambda result: result['event'])
+
+
+def print_summary(results, elapsed):
+    """Print per-event timings and overall throughput"""
+    succeeded = [result for result in results if result['ok']]
+    total_sessions = sum(result['sessions'] for result in succeeded)
+    total_bytes = sum(result['bytes'] for result in succeeded)
+
+    for result in results:
+        if result['ok']:
+            print(f"  ok      {result['event']:<30} {result['sessions']:>8,} sessions "
+                  f"{result['bytes'] / 1e6:>8.2f} MB {result['seconds']:>7.2f}s")
+        else:
+            print(f"  FAILED  {result['event']:<30} {result['error']}")
+
+    rate = len(succeeded) / elapsed if elapsed else 0.0
+    print(f"Rendered {len(succeeded)}/{len(results)} events in {elapsed:.2f}s "
+          f"({rate:.1f} events/s, {total_sessions:,} sessions, {total_bytes / 1e6:.2f} MB)")
+
+
+def run_render(args):
+    """Handle the render command"""
+    event_dirs = find_events(args.events_dir, exclude=args.output)
+    if not event_dirs:
+        print(f"No event directories with {', '.join(EVENT_FILES)} found in {args.events_dir}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    results = render_events(event_dirs, args.output, args.workers, args.zip)
+    print_summary(results, time.perf_counter() - started)
+    return 0 if all(result['ok'] for result in results) else 1
+
+
+def run_bench(args):
+    """Handle the bench command"""
+    with open(args.config) as f:
+        config = json.load(f)
+    scenarios = select_scenarios(args.scenario, args.sessions, args.speakers, args.tags)
+
+    results = run_benchmarks(scenarios, config, repeat=args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.budget)
+        for regression in regressions:
+            print(f"  REGRESSION  {regression}")
+        if regressions:
+            return 1
+        print(f"No stage exceeded its baseline by more than {args.budget:.0%}")
+    return 0
+
+
+def run_feed(args):
+    """Handle the feed command"""
+    config, session_data, speaker_data = load_event(args.event_dir)
+    # The feed starts from the statuses the exported page was rendered with
+    feed = StatusFeed(LobbyRenderer(config, session_data, speaker_data).session_data)
+    source = FeedSource(
+        feed, config, session_data,
+        sessions_path=os.path.join(args.event_dir, "sessions.csv"),
+        load_sessions=lambda path: load_table(path, "sessions.csv", SESSION_SCHEMA)[0],
+        log=print
+    )
+    feed_path = "/" + (urlsplit(status_feed_settings(config)['url']).path.lstrip("/") or STATUS_FEED_FILE)
+
+    print(f"Serving statuses for {len(feed.ids):,} sessions at http://{args.host}:{args.port}{feed_path}")
+    print(f"Edit {os.path.join(args.event_dir, 'sessions.csv')} or POST {{\"<id>\": \"<status>\"}} to publish changes")
+    try:
+        serve_feed(source, args.host, args.port, args.directory or args.event_dir, feed_path)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run_serve(args):
+    """Handle the serve command"""
+    source = PackageSource(args.event_dir, load_event, EVENT_FILES, log=print)
+    source.package()
+    print(f"Serving {event_name(args.event_dir)} at http://{args.host}:{args.port}/")
+    print(f"Edit the files in {args.event_dir} and the next request re-renders the package")
+    try:
+        serve_package(source, args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run_watch(args):
+    """Handle the watch command"""
+    output_dir = args.output or os.path.join("lobby_build", event_name(args.event_dir))
+    watcher = EventWatcher(args.event_dir, output_dir, EVENT_FILES)
+    print(f"Watching {', '.join(EVENT_FILES)} in {args.event_dir}, writing to {output_dir}")
+    try:
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_parser():
+    """Build the command-line argument parser"""
+    parser = argparse.ArgumentParser(description="Headless tools for the event lobby customizer")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render = commands.add_parser("render", help="Render lobby packages for a directory of events")
+    render.add_argument("events_dir", help="Directory of events, each holding config.json, sessions.csv and speakers.csv")
+    render.add_argument("-o", "--output", default="lobby_build", help="Directory to write one package per event into")
+    render.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: one per CPU core)")
+    render.add_argument("--zip", action="store_true", help="Write each package as a single <event>.zip archive")
+    render.set_defaults(handler=run_render)
+
+    bench = commands.add_parser("bench", help="Benchmark the render and export pipeline on synthetic events")
+    bench.add_argument("--scenario", action="append", help="Default scenario to run (small, medium, large); repeatable")
+    bench.add_argument("--sessions", type=int, help="Run a single custom scenario with this many sessions")
+    bench.add_argument("--speakers", type=int, help="Speaker count for a custom scenario")
+    bench.add_argument("--tags", type=int, help="Tag vocabulary size for a custom scenario")
+    bench.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the best is reported")
+    bench.add_argument("--config", default=DEFAULT_BENCHMARK_CONFIG, help="Lobby config used for every scenario")
+    bench.add_argument("-o", "--output", help="Write results as JSON to this file")
+    bench.add_argument("--baseline", help="Results JSON from another branch to compare against")
+    bench.add_argument("--budget", type=float, default=DEFAULT_REGRESSION_BUDGET,
+                       help="Allowed fractional slowdown or memory growth over the baseline")
+    bench.set_defaults(handler=run_bench)
+
+    feed = commands.add_parser("feed", help="Serve a live session status feed for one event")
+    feed.add_argument("event_dir", help="Event directory holding config.json, sessions.csv and speakers.csv")
+    feed.add_argument("--directory", help="Directory of static files served alongside the feed, e.g. the rendered package")
+    feed.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    feed.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    feed.set_defaults(handler=run_feed)
+
+    serve = commands.add_parser("serve", help="Render one event on demand and serve it with ETags and compression")
+    serve.add_argument("event_dir", help="Event directory holding config.json, sessions.csv and speakers.csv")
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    serve.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    serve.set_defaults(handler=run_serve)
+
+    watch = commands.add_parser("watch", help="Re-render one event's package whenever its files change")
+    watch.add_argument("event_dir", help="Event directory holding config.json, sessions.csv and speakers.csv")
+    watch.add_argument("-o", "--output", help="Directory to keep the package in (default: lobby_build/<event>)")
+    watch.add_argument("--interval", type=float, default=WATCH_INTERVAL_SECONDS, help="Seconds between checks for changes")
+    watch.set_defaults(handler=run_watch)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Precompressed gzip and Brotli copies of export package files, for static hosts that serve them as-is"""
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:
+    # Brotli is optional; without it packages carry gzip copies only
+    brotli = None
+
+# Package files with these extensions get precompressed siblings
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.json', '.js', '.svg', '.xml')
+
+# Package file recording each compressed file's sizes and ratios
+COMPRESSION_MANIFEST_FILE = "compression-manifest.json"
+
+# Package files never served to browsers: the configuration backup is imported into the customizer instead
+UNCOMPRESSED_FILES = {"config.json", COMPRESSION_MANIFEST_FILE}
+
+# Worker threads compressing package files; zlib and brotli release the GIL, so threads run in parallel
+COMPRESSION_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def compression_encodings():
+    """Return the (encoding, file suffix) pairs available for precompression, gzip first"""
+    encodings = [('gzip', '.gz')]
+    if brotli is not None:
+        encodings.append(('br', '.br'))
+    return encodings
+
+
+def is_compressible(file_name):
+    """Return whether a package file gets precompressed siblings"""
+    return file_name.endswith(COMPRESSIBLE_EXTENSIONS) and file_name not in UNCOMPRESSED_FILES
+
+
+def compress(data, encoding):
+    """Compress bytes at the encoding's maximum level
+
+    Gzip output carries no timestamp, so equal input gives byte-identical
+    files from one export to the next.
+    """
+    if encoding == 'br':
+        return brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_file(file_name, data):
+    """Compress one file with every available encoding
+
+    Returns the (sibling file name, bytes) pairs worth shipping, leaving out
+    copies no smaller than the original, and the file's manifest entry.
+    """
+    siblings = []
+    entry = {'bytes': len(data)}
+    for encoding, suffix in compression_encodings():
+        compressed = compress(data, encoding)
+        entry[encoding] = {
+            'file': file_name + suffix,
+            'bytes': len(compressed),
+            'ratio': round(len(compressed) / len(data), 4) if data else 1.0,
+            'shipped': len(compressed) < len(data)
+        }
+        if entry[encoding]['shipped']:
+            siblings.append((file_name + suffix, compressed))
+    return siblings, entry
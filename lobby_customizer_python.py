@@ -3,10 +3,23 @@ import json
 import pandas as pd
 from datetime import datetime, timedelta
 import base64
-from io import StringIO
-import zipfile
-import tempfile
-import os
+from io import BytesIO
+from lobby_renderer import (
+    LobbyRenderer, RenderCache, DEFAULT_HEADER_TEXTS, DEFAULT_SECTION_LIMIT, OUTPUT_MODES, STYLESHEET_MODES
+)
+from lobby_compress import compression_encodings
+from lobby_data import (
+    EVENT_STAT_NAMES, SESSION_SCHEMA, SPEAKER_SCHEMA, RowHashes, SpeakerSessionIndex, apply_editor_edits, coerce_table,
+    load_table
+)
+from lobby_feed import DEFAULT_STATUS_FEED
+from lobby_images import DEFAULT_IMAGE_ASSETS, available_image_formats
+from lobby_metrics import StageTimings
+from lobby_optimize import OPTIMIZATION_STAGE_LABELS
+from lobby_schedule import DEFAULT_SCHEDULE, STATUS_MODES, schedule_errors
+from lobby_site import DEFAULT_STATIC_SITE
+from lobby_styles import THEME_PRESETS
+from zoneinfo import available_timezones
 
 # Configure Streamlit page
 st.set_page_config(
@@ -16,6 +29,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Help text for inputs that accept statistics computed from the session and speaker data
+STAT_PLACEHOLDER_HELP = (
+    "Placeholders filled from your data: " + ", ".join(f"{{{name}}}" for name in EVENT_STAT_NAMES)
+    + ". Type plain text to override."
+)
+
 # Custom CSS for better styling
 st.markdown("""
 <style>
@@ -86,6 +105,11 @@ class LobbyCustomizer:
                         'live': True, 'upcoming': True, 'featured': True, 
                         'finished': True, 'speakers': True
                     },
+                    'section_limits': {
+                        'live': DEFAULT_SECTION_LIMIT, 'upcoming': DEFAULT_SECTION_LIMIT,
+                        'featured': DEFAULT_SECTION_LIMIT, 'finished': DEFAULT_SECTION_LIMIT,
+                        'speakers': DEFAULT_SECTION_LIMIT
+                    },
                     'grid_columns': 'repeat(auto-fit, minmax(400px, 1fr))',
                     'grid_gap': 25,
                     'section_spacing': 50,
@@ -106,7 +130,8 @@ class LobbyCustomizer:
                     'padding': '15px 40px',
                     'show_live_indicator': True,
                     'show_bookmarks': True,
-                    'show_user_info': True
+                    'show_user_info': True,
+                    **DEFAULT_HEADER_TEXTS
                 },
                 'masthead': {
                     'background_type': 'gradient',
@@ -121,8 +146,8 @@ class LobbyCustomizer:
                     'show_stats': True,
                     'show_countdown': False,
                     'custom_stats': [
-                        {'number': '100+', 'label': 'Sessions'},
-                        {'number': '150+', 'label': 'Speakers'},
+                        {'number': '{sessions}', 'label': 'Sessions'},
+                        {'number': '{speakers}', 'label': 'Speakers'},
                         {'number': '5000+', 'label': 'Attendees'}
                     ]
                 },
@@ -161,6 +186,7 @@ class LobbyCustomizer:
                     'avatar_size': 80,
                     'show_session_count': True
                 },
+                'schedule': dict(DEFAULT_SCHEDULE),
                 'quick_actions': {
                     'background_color': '#ffffff',
                     'border_radius': 12,
@@ -222,6 +248,15 @@ class LobbyCustomizer:
                 },
                 'advanced': {
                     'custom_css': '',
+                    'output_mode': 'static',
+                    'stylesheet_mode': 'inline',
+                    'theme_switcher': False,
+                    'optimize_output': False,
+                    'precompress': False,
+                    'image_assets': dict(DEFAULT_IMAGE_ASSETS),
+                    'static_site': dict(DEFAULT_STATIC_SITE),
+                    'service_worker': False,
+                    'status_feed': dict(DEFAULT_STATUS_FEED),
                     'analytics_code': '',
                     'meta_tags': {
                         'description': 'Join TechConnect 2024 for cutting-edge technology sessions',
@@ -242,10 +277,24 @@ class LobbyCustomizer:
             
         if 'speaker_data' not in st.session_state:
             st.session_state.speaker_data = self.get_sample_speaker_data()
+            
+        if 'render_cache' not in st.session_state:
+            st.session_state.render_cache = RenderCache()
+            
+        if 'speaker_index' not in st.session_state:
+            st.session_state.speaker_index = SpeakerSessionIndex()
+            
+        # Row hashes of each table, updated row by row as the data editors change them
+        for state_key in ('session_data', 'speaker_data'):
+            if f"{state_key}_hashes" not in st.session_state:
+                st.session_state[f"{state_key}_hashes"] = RowHashes()
+            
+        if 'stage_timings' not in st.session_state:
+            st.session_state.stage_timings = StageTimings()
 
     def get_sample_session_data(self):
         """Generate sample session data"""
-        return pd.DataFrame([
+        session_data, _ = coerce_table(pd.DataFrame([
             {
                 'id': 1,
                 'title': 'Neural Networks & Deep Learning Frontiers',
@@ -311,11 +360,12 @@ class LobbyCustomizer:
                 'level': 'Beginner',
                 'tags': ['DevOps', 'Docker', 'Cloud']
             }
-        ])
+        ]), SESSION_SCHEMA)
+        return session_data.reset_index(drop=True)
 
     def get_sample_speaker_data(self):
         """Generate sample speaker data"""
-        return pd.DataFrame([
+        speaker_data, _ = coerce_table(pd.DataFrame([
             {
                 'name': 'Dr. Sarah Chen',
                 'title': 'AI Research Director',
@@ -346,7 +396,8 @@ class LobbyCustomizer:
                 'linkedin': 'elenarodriguez',
                 'photo': ''
             }
-        ])
+        ]), SPEAKER_SCHEMA)
+        return speaker_data.reset_index(drop=True)
 
     def render_header(self):
         """Render the main header"""
@@ -395,21 +446,14 @@ class LobbyCustomizer:
                     st.error(f"Error loading configuration: {e}")
             
             # Data upload
-            uploaded_sessions = st.file_uploader(
-                "Upload Session Data", 
-                type=['csv', 'json'],
-                help="Upload your event session data"
+            self.render_data_upload(
+                "Upload Session Data", 'session_data', SESSION_SCHEMA, "sessions",
+                "Upload your event session data"
+            )
+            self.render_data_upload(
+                "Upload Speaker Data", 'speaker_data', SPEAKER_SCHEMA, "speakers",
+                "Upload your event speaker data; session counts are derived from the session data"
             )
-            if uploaded_sessions:
-                try:
-                    if uploaded_sessions.name.endswith('.csv'):
-                        session_data = pd.read_csv(uploaded_sessions)
-                    else:
-                        session_data = pd.read_json(uploaded_sessions)
-                    st.session_state.session_data = session_data
-                    st.success(f"Loaded {len(session_data)} sessions!")
-                except Exception as e:
-                    st.error(f"Error loading session data: {e}")
             
             # Export buttons
             if st.button("📥 Export Configuration"):
@@ -417,40 +461,92 @@ class LobbyCustomizer:
                 
             if st.button("🌐 Export Complete Package"):
                 self.export_complete_package()
+            
+            # Diagnostics
+            st.markdown("### 🩺 Diagnostics")
+            st.checkbox(
+                "Show Stage Timings",
+                key="show_diagnostics",
+                help="Time every tab, the preview and HTML generation on each rerun"
+            )
+
+    def render_data_upload(self, label, state_key, schema, noun, help_text):
+        """Render an uploader that loads a data file into session state through its schema"""
+        uploaded = st.file_uploader(label, type=['csv', 'json', 'jsonl'], help=help_text)
+        upload_id_key = f"{state_key}_upload_id"
+        rejected_key = f"{state_key}_upload_rejected"
+        
+        # Parse each upload once; later reruns keep the loaded (and possibly edited) data
+        if uploaded and st.session_state.get(upload_id_key) != uploaded.file_id:
+            try:
+                data, rejected = load_table(uploaded, uploaded.name, schema, size=uploaded.size)
+                st.session_state[state_key] = data
+                st.session_state[upload_id_key] = uploaded.file_id
+                st.session_state[rejected_key] = rejected
+            except Exception as e:
+                st.error(f"Error loading {noun}: {e}")
+        
+        if uploaded and st.session_state.get(upload_id_key) == uploaded.file_id:
+            rejected = st.session_state[rejected_key]
+            st.success(f"Loaded {len(st.session_state[state_key])} {noun}!")
+            if len(rejected):
+                st.warning(f"Rejected {rejected['row'].nunique()} rows")
+                st.dataframe(rejected, hide_index=True, use_container_width=True)
+
+    def render_data_editor(self, state_key, schema):
+        """Render an editor over a table in session state, applying its edits in place as row-level changes
+
+        The editor shows a snapshot taken when editing began, so its widget
+        state accumulates edits against a fixed base. Each rerun writes only
+        the rows whose edits changed since the last one, rehashes just those
+        rows, syncs the speaker-session index by the rows' ids and publishes
+        the change set under <state_key>_changes, so one edit re-renders one
+        card rather than the whole table.
+        """
+        editor_key = f"{state_key}_editor"
+        tracked_key = f"{state_key}_editor_tracked"
+        data = st.session_state[state_key]
+        tracked = st.session_state.get(tracked_key)
+        
+        # Editing starts afresh when the editor opens and when an upload or reset replaces the table
+        if editor_key not in st.session_state or tracked is None or tracked['data'] is not data:
+            tracked = st.session_state[tracked_key] = {
+                'data': data,
+                'base': data.copy(),
+                'state': {'edited_rows': {}, 'deleted_rows': [], 'added_rows': [], 'labels': []}
+            }
+        
+        edited = st.data_editor(tracked['base'], num_rows="dynamic", use_container_width=True, key=editor_key)
+        changes, tracked['state'], labels = apply_editor_edits(
+            data, tracked['base'], edited, tracked['state'], st.session_state[editor_key], schema
+        )
+        if len(changes):
+            st.session_state[f"{state_key}_hashes"].update(data, labels)
+            st.session_state[f"{state_key}_changes"] = changes
+            speaker_index = st.session_state.speaker_index
+            if state_key == 'session_data' and speaker_index.data is data:
+                speaker_index.sync(data, changes.keys('speaker'))
+        
+        if f"{state_key}_changes" in st.session_state:
+            st.caption(f"Last edit: {st.session_state[f'{state_key}_changes'].summary()}")
 
     def render_tabs(self):
         """Render the main customization tabs"""
-        tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
+        tabs = st.tabs([
             "📐 Layout", "🎨 Header", "🏆 Masthead", "📋 Navigation", 
             "📄 Sessions", "👥 Speakers", "⚡ Actions", "🎨 Theme", "⚙️ Advanced"
         ])
         
-        with tab1:
-            self.render_layout_tab()
-            
-        with tab2:
-            self.render_header_tab()
-            
-        with tab3:
-            self.render_masthead_tab()
-            
-        with tab4:
-            self.render_navigation_tab()
-            
-        with tab5:
-            self.render_sessions_tab()
-            
-        with tab6:
-            self.render_speakers_tab()
-            
-        with tab7:
-            self.render_actions_tab()
-            
-        with tab8:
-            self.render_theme_tab()
-            
-        with tab9:
-            self.render_advanced_tab()
+        tab_renderers = [
+            self.render_layout_tab, self.render_header_tab, self.render_masthead_tab,
+            self.render_navigation_tab, self.render_sessions_tab, self.render_speakers_tab,
+            self.render_actions_tab, self.render_theme_tab, self.render_advanced_tab
+        ]
+        timings = st.session_state.stage_timings
+        
+        for tab, render_tab in zip(tabs, tab_renderers):
+            with tab, timings.time(render_tab.__name__):
+                render_tab()
 
     def render_layout_tab(self):
         """Render layout customization options"""
@@ -530,6 +626,19 @@ class LobbyCustomizer:
                 key="layout_content_padding"
             )
             
+            st.markdown("##### Cards per Section")
+            st.session_state.config['layout'].setdefault('section_limits', {})
+            section_limits = st.session_state.config['layout']['section_limits']
+            for section_id in new_order:
+                section_limits[section_id] = st.number_input(
+                    f"Max Cards: {sections[section_id]['title']}",
+                    min_value=1,
+                    max_value=200,
+                    value=section_limits.get(section_id, DEFAULT_SECTION_LIMIT),
+                    key=f"layout_limit_{section_id}",
+                    help="Cards beyond this limit are reachable through the section's View all link"
+                )
+            
             # Advanced grid settings
             st.markdown("##### Advanced Grid")
             st.session_state.config['layout']['grid_columns'] = st.text_input(
@@ -591,18 +700,39 @@ class LobbyCustomizer:
                 value=st.session_state.config['header']['show_live_indicator'],
                 key="header_show_live_indicator"
             )
+            if st.session_state.config['header']['show_live_indicator']:
+                st.session_state.config['header']['live_indicator_text'] = st.text_input(
+                    "Live Indicator Text",
+                    value=st.session_state.config['header'].get('live_indicator_text', DEFAULT_HEADER_TEXTS['live_indicator_text']),
+                    key="header_live_indicator_text",
+                    help=STAT_PLACEHOLDER_HELP
+                )
             
             st.session_state.config['header']['show_bookmarks'] = st.checkbox(
                 "Show Bookmarks", 
                 value=st.session_state.config['header']['show_bookmarks'],
                 key="header_show_bookmarks"
             )
+            if st.session_state.config['header']['show_bookmarks']:
+                st.session_state.config['header']['bookmarks_text'] = st.text_input(
+                    "Bookmarks Text",
+                    value=st.session_state.config['header'].get('bookmarks_text', DEFAULT_HEADER_TEXTS['bookmarks_text']),
+                    key="header_bookmarks_text",
+                    help=STAT_PLACEHOLDER_HELP
+                )
             
             st.session_state.config['header']['show_user_info'] = st.checkbox(
                 "Show User Info", 
                 value=st.session_state.config['header']['show_user_info'],
                 key="header_show_user_info"
             )
+            if st.session_state.config['header']['show_user_info']:
+                st.session_state.config['header']['user_info_text'] = st.text_input(
+                    "User Info Text",
+                    value=st.session_state.config['header'].get('user_info_text', DEFAULT_HEADER_TEXTS['user_info_text']),
+                    key="header_user_info_text",
+                    help=STAT_PLACEHOLDER_HELP
+                )
 
     def render_masthead_tab(self):
         """Render masthead customization options"""
@@ -628,7 +758,8 @@ class LobbyCustomizer:
             elif bg_type == 'image':
                 st.session_state.config['masthead']['background_image'] = st.text_input(
                     "Image URL", 
-                    value=st.session_state.config['masthead']['background_image']
+                    value=st.session_state.config['masthead']['background_image'],
+                    help="A local image file is resized and optimized when Image Assets is on in the Advanced tab"
                 )
             
             st.session_state.config['masthead']['text_color'] = st.color_picker(
@@ -677,11 +808,15 @@ class LobbyCustomizer:
         if st.session_state.config['masthead']['show_stats']:
             st.markdown("##### Customize Stats")
             stats = st.session_state.config['masthead']['custom_stats']
+            computed = self.get_renderer().event_stats()
+            st.caption(" · ".join(f"{{{name}}} = {computed[name]:,}" for name in EVENT_STAT_NAMES))
             
             for i, stat in enumerate(stats):
                 col_a, col_b, col_c = st.columns([2, 2, 1])
                 with col_a:
-                    stats[i]['number'] = st.text_input(f"Number {i+1}", value=stat['number'], key=f"stat_num_{i}")
+                    stats[i]['number'] = st.text_input(
+                        f"Number {i+1}", value=stat['number'], key=f"stat_num_{i}", help=STAT_PLACEHOLDER_HELP
+                    )
                 with col_b:
                     stats[i]['label'] = st.text_input(f"Label {i+1}", value=stat['label'], key=f"stat_label_{i}")
                 with col_c:
@@ -847,15 +982,86 @@ class LobbyCustomizer:
                 key="session_animation_duration"
             )
         
+        self.render_schedule_settings()
+        
         # Session Data Management
         st.markdown("#### Session Data")
         if st.checkbox("Edit Session Data", key="edit_session_data_checkbox"):
-            edited_df = st.data_editor(
-                st.session_state.session_data,
-                num_rows="dynamic",
-                use_container_width=True
+            self.render_data_editor('session_data', SESSION_SCHEMA)
+
+    def render_schedule_settings(self):
+        """Render the settings that turn session time strings into computed statuses"""
+        st.markdown("#### Schedule")
+        schedule = st.session_state.config.setdefault('schedule', dict(DEFAULT_SCHEDULE))
+        for key, value in DEFAULT_SCHEDULE.items():
+            schedule.setdefault(key, value)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            schedule['status_mode'] = st.selectbox(
+                "Session Status",
+                options=STATUS_MODES,
+                index=STATUS_MODES.index(schedule['status_mode']) if schedule['status_mode'] in STATUS_MODES else 0,
+                format_func=lambda mode: {'manual': 'As entered in session data', 'computed': 'Computed from session times'}[mode],
+                key="schedule_status_mode"
+            )
+            
+            try:
+                event_date = datetime.fromisoformat(schedule['event_date']).date()
+            except (TypeError, ValueError):
+                st.warning(f"Event date {schedule['event_date']!r} is not a date; showing {DEFAULT_SCHEDULE['event_date']} instead")
+                event_date = datetime.fromisoformat(DEFAULT_SCHEDULE['event_date']).date()
+            schedule['event_date'] = st.date_input(
+                "Event Date (Day 1)",
+                value=event_date,
+                key="schedule_event_date",
+                help="Times without a date or \"Day N\" prefix fall on this day"
+            ).isoformat()
+            
+            time_zones = sorted(available_timezones() | {'UTC'})
+            schedule['timezone'] = st.selectbox(
+                "Event Time Zone",
+                options=time_zones,
+                index=time_zones.index(schedule['timezone']) if schedule['timezone'] in time_zones else time_zones.index('UTC'),
+                key="schedule_timezone"
             )
-            st.session_state.session_data = edited_df
+        
+        with col2:
+            schedule['upcoming_window_minutes'] = st.number_input(
+                "Upcoming Window (minutes)",
+                min_value=5,
+                max_value=24 * 60,
+                value=int(schedule['upcoming_window_minutes']),
+                step=5,
+                key="schedule_upcoming_window",
+                help="Sessions starting within this window are listed under Coming Up Next"
+            )
+            
+            schedule['preview_time'] = st.text_input(
+                "Preview Time",
+                value=schedule['preview_time'],
+                key="schedule_preview_time",
+                help="Compute statuses as of this time, e.g. 2024-03-15 10:30; leave blank for the current time"
+            )
+        
+        errors = schedule_errors(schedule)
+        for error in errors:
+            st.error(error)
+        
+        if schedule['status_mode'] == 'computed':
+            if errors:
+                st.warning("Session statuses are shown as entered until the schedule settings are fixed")
+                return
+            renderer = self.get_renderer()
+            counts = renderer.session_data['status'].value_counts()
+            unparsed = renderer.schedule.size - int(renderer.schedule.valid.sum()) if renderer.schedule else 0
+            st.caption(
+                f"{counts.get('live', 0)} live, {counts.get('upcoming', 0)} upcoming, "
+                f"{counts.get('scheduled', 0)} later and {counts.get('finished', 0)} finished sessions"
+            )
+            if unparsed:
+                st.warning(f"{unparsed} session times could not be parsed; those sessions keep their entered status")
 
     def render_speakers_tab(self):
         """Render speaker customization options"""
@@ -924,12 +1130,7 @@ class LobbyCustomizer:
         # Speaker Data Management
         st.markdown("#### Speaker Data")
         if st.checkbox("Edit Speaker Data", key="edit_speaker_data_checkbox"):
-            edited_df = st.data_editor(
-                st.session_state.speaker_data,
-                num_rows="dynamic",
-                use_container_width=True
-            )
-            st.session_state.speaker_data = edited_df
+            self.render_data_editor('speaker_data', SPEAKER_SCHEMA)
 
     def render_actions_tab(self):
         """Render quick actions customization"""
@@ -993,6 +1194,20 @@ class LobbyCustomizer:
                 "Search Placeholder", 
                 value=st.session_state.config['quick_actions']['search_placeholder']
             )
+            
+            # The index is exported as a sidecar file; it is rebuilt only when session data changes
+            report = self.get_renderer().search_index_report()
+            st.caption(
+                f"Search index: {report['terms']:,} terms, {report['postings']:,} postings, "
+                f"{report['bytes'] / 1024:,.1f} KB, built in {report['seconds'] * 1000:,.1f} ms"
+            )
+            
+            if st.session_state.config['quick_actions']['search_suggestions']:
+                report = self.get_renderer().suggestion_index_report()
+                st.caption(
+                    f"Suggestion index: {report['phrases']:,} phrases, {report['trigrams']:,} trigrams, "
+                    f"{report['bytes'] / 1024:,.1f} KB, built in {report['seconds'] * 1000:,.1f} ms"
+                )
 
     def render_theme_tab(self):
         """Render theme and global color settings"""
@@ -1018,6 +1233,13 @@ class LobbyCustomizer:
             if st.button("🔴 Red Energy"):
                 self.apply_theme('red')
         
+        st.session_state.config['advanced']['theme_switcher'] = st.checkbox(
+            "Let attendees switch between preset themes",
+            value=st.session_state.config['advanced'].get('theme_switcher', False),
+            help="Adds a theme picker to the header; switching only swaps CSS variables, so no stylesheet is regenerated",
+            key="theme_switcher"
+        )
+        
         # Custom colors
         st.markdown("#### Custom Colors")
         col1, col2 = st.columns(2)
@@ -1085,6 +1307,166 @@ class LobbyCustomizer:
             help="Add custom CSS to override or extend styling"
         )
         
+        # Output Mode
+        st.markdown("#### Output Mode")
+        output_mode = st.session_state.config['advanced'].get('output_mode', 'static')
+        st.session_state.config['advanced']['output_mode'] = st.selectbox(
+            "Card Data Delivery",
+            options=OUTPUT_MODES,
+            index=OUTPUT_MODES.index(output_mode) if output_mode in OUTPUT_MODES else 0,
+            format_func=lambda mode: {
+                'static': 'Static markup only',
+                'data_island': 'First screen + inline JSON data island',
+                'data_sidecar': 'First screen + lobby-data.json sidecar'
+            }[mode],
+            help="Data modes render each section's first cards as HTML and let \"View all\" render the rest client-side with virtualized scrolling"
+        )
+        
+        stylesheet_mode = st.session_state.config['advanced'].get('stylesheet_mode', 'inline')
+        st.session_state.config['advanced']['stylesheet_mode'] = st.selectbox(
+            "Stylesheet Delivery",
+            options=STYLESHEET_MODES,
+            index=STYLESHEET_MODES.index(stylesheet_mode) if stylesheet_mode in STYLESHEET_MODES else 0,
+            format_func=lambda mode: {
+                'inline': 'Inline styles in index.html',
+                'external': 'Hashed styles.<hash>.css + inlined above-the-fold rules'
+            }[mode],
+            key="advanced_stylesheet_mode",
+            help="External mode links one content-hashed stylesheet that browsers can cache across visits and pages, and lists it in asset-manifest.json"
+        )
+        
+        st.session_state.config['advanced']['optimize_output'] = st.checkbox(
+            "Optimize Output",
+            value=st.session_state.config['advanced'].get('optimize_output', False),
+            key="advanced_optimize_output",
+            help="Drops CSS rules that match nothing on the page, merges repeated selectors and minifies the HTML and CSS"
+        )
+        if st.session_state.config['advanced']['optimize_output']:
+            report = self.get_renderer().optimization_report()
+            st.caption(" · ".join(
+                f"{OPTIMIZATION_STAGE_LABELS[row['stage']]}: −{(row['bytes_before'] - row['bytes_after']) / 1024:,.1f} KB"
+                for row in report
+            ))
+            original, optimized = report[0]['bytes_before'], report[-1]['bytes_after']
+            st.caption(
+                f"index.html: {original / 1024:,.1f} KB → {optimized / 1024:,.1f} KB "
+                f"({(1 - optimized / original) * 100 if original else 0:.0f}% smaller)"
+            )
+        
+        st.session_state.config['advanced']['precompress'] = st.checkbox(
+            "Precompress Package Files",
+            value=st.session_state.config['advanced'].get('precompress', False),
+            key="advanced_precompress",
+            help="Adds maximum-compression .gz (and .br) copies of the HTML, CSS and JSON files, plus compression-manifest.json, so static hosts can serve them without compressing on every request"
+        )
+        if st.session_state.config['advanced']['precompress'] and len(compression_encodings()) == 1:
+            st.caption("Install the optional `brotli` package to add .br copies as well.")
+        
+        st.session_state.config['advanced']['service_worker'] = st.checkbox(
+            "Offline Support",
+            value=st.session_state.config['advanced'].get('service_worker', False),
+            key="advanced_service_worker",
+            help="Adds a service worker and precache-manifest.json: after the first visit the lobby loads instantly from the browser's cache and refreshes in the background, and a re-export replaces the cache"
+        )
+        
+        # Image Assets
+        st.markdown("#### Image Assets")
+        image_assets = {**DEFAULT_IMAGE_ASSETS, **st.session_state.config['advanced'].get('image_assets', {})}
+        image_formats = available_image_formats()
+        image_assets['enabled'] = st.checkbox(
+            "Process Speaker Photos and Masthead Image",
+            value=image_assets['enabled'],
+            key="advanced_image_assets_enabled",
+            disabled=not image_formats,
+            help="Local files named in the speakers' photo column and the masthead image are resized to their display size (with 2x variants), re-encoded, named by content hash and loaded lazily"
+        )
+        if not image_formats:
+            st.caption("Install Pillow to process images.")
+        elif image_assets['enabled']:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                image_assets['source_dir'] = st.text_input(
+                    "Image Folder",
+                    value=image_assets['source_dir'],
+                    key="advanced_image_assets_source_dir",
+                    help="Relative image paths are looked up here; leave empty to use the working directory"
+                )
+            with col2:
+                image_assets['format'] = st.selectbox(
+                    "Format",
+                    options=image_formats,
+                    index=image_formats.index(image_assets['format']) if image_assets['format'] in image_formats else 0,
+                    key="advanced_image_assets_format"
+                )
+            with col3:
+                image_assets['quality'] = st.slider(
+                    "Quality",
+                    min_value=40, max_value=100,
+                    value=int(image_assets['quality']),
+                    key="advanced_image_assets_quality"
+                )
+        st.session_state.config['advanced']['image_assets'] = image_assets
+        if image_assets['enabled'] and image_formats:
+            report = self.get_renderer().image_assets()['report']
+            st.caption(
+                f"{report['images']:,} images → {report['files']:,} files, {report['bytes'] / 1024:,.1f} KB "
+                f"({report['cached']:,} variants from the on-disk cache; {report['missing']:,} missing, {report['unreadable']:,} unreadable)"
+            )
+        
+        # Static Site
+        st.markdown("#### Static Site")
+        static_site = {**DEFAULT_STATIC_SITE, **st.session_state.config['advanced'].get('static_site', {})}
+        static_site['enabled'] = st.checkbox(
+            "Export Listing and Detail Pages",
+            value=static_site['enabled'],
+            key="advanced_static_site_enabled",
+            help="Exports add paginated pages for each section, a page per session and speaker, and sitemap.xml; \"View all\", the Lobby, All Sessions and Speakers tabs, and card titles link to them"
+        )
+        if static_site['enabled']:
+            col1, col2 = st.columns(2)
+            with col1:
+                static_site['page_size'] = st.number_input(
+                    "Cards per Listing Page",
+                    min_value=6, max_value=500,
+                    value=int(static_site['page_size']),
+                    key="advanced_static_site_page_size"
+                )
+            with col2:
+                static_site['base_url'] = st.text_input(
+                    "Base URL",
+                    value=static_site['base_url'],
+                    key="advanced_static_site_base_url",
+                    help="Where the package will be hosted, e.g. https://example.com/lobby/; used for canonical links and sitemap addresses"
+                )
+        st.session_state.config['advanced']['static_site'] = static_site
+        
+        # Live Status Feed
+        st.markdown("#### Live Status Feed")
+        status_feed = {**DEFAULT_STATUS_FEED, **st.session_state.config['advanced'].get('status_feed', {})}
+        status_feed['enabled'] = st.checkbox(
+            "Poll Live Status Feed",
+            value=status_feed['enabled'],
+            key="advanced_status_feed_enabled",
+            help="The page polls a small JSON feed of session status changes and updates only the affected cards and sections, so statuses change without re-exporting"
+        )
+        if status_feed['enabled']:
+            col1, col2 = st.columns(2)
+            with col1:
+                status_feed['url'] = st.text_input(
+                    "Feed URL",
+                    value=status_feed['url'],
+                    key="advanced_status_feed_url",
+                    help="Exported packages include a baseline status-feed.json; serve it with `python lobby_cli.py feed <event dir>`"
+                )
+            with col2:
+                status_feed['poll_seconds'] = st.number_input(
+                    "Poll Interval (seconds)",
+                    min_value=1, max_value=600,
+                    value=int(status_feed['poll_seconds']),
+                    key="advanced_status_feed_poll_seconds"
+                )
+        st.session_state.config['advanced']['status_feed'] = status_feed
+        
         # Analytics
         st.markdown("#### Analytics")
         st.session_state.config['advanced']['analytics_code'] = st.text_area(
@@ -1133,668 +1515,72 @@ class LobbyCustomizer:
                 "Share Description", 
                 value=st.session_state.config['advanced']['social_sharing']['description']
             )
+        
+        self.render_cache_stats()
+
+    def render_cache_stats(self):
+        """Render hit/miss counters for the render cache"""
+        st.markdown("#### Render Cache")
+        stats = st.session_state.render_cache.stats()
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Hits", stats['hits'])
+            
+        with col2:
+            st.metric("Misses", stats['misses'])
+            
+        with col3:
+            st.metric("Cached Fragments", f"{stats['entries']} / {stats['max_entries']}")
+        
+        if st.button("🧹 Clear Render Cache"):
+            st.session_state.render_cache.clear()
+            st.rerun()
 
     def apply_theme(self, theme_name):
         """Apply a predefined theme"""
-        themes = {
-            'default': {
-                'primary': '#667eea',
-                'secondary': '#764ba2',
-                'success': '#10b981',
-                'warning': '#fbbf24',
-                'error': '#ef4444'
-            },
-            'green': {
-                'primary': '#10b981',
-                'secondary': '#059669',
-                'success': '#34d399',
-                'warning': '#fbbf24',
-                'error': '#ef4444'
-            },
-            'purple': {
-                'primary': '#8b5cf6',
-                'secondary': '#7c3aed',
-                'success': '#10b981',
-                'warning': '#fbbf24',
-                'error': '#ef4444'
-            },
-            'red': {
-                'primary': '#ef4444',
-                'secondary': '#dc2626',
-                'success': '#10b981',
-                'warning': '#fbbf24',
-                'error': '#f87171'
-            }
-        }
-        
-        if theme_name in themes:
-            theme = themes[theme_name]
+        if theme_name in THEME_PRESETS:
+            theme = THEME_PRESETS[theme_name]
             for key, value in theme.items():
                 st.session_state.config['colors'][key] = value
             st.success(f"Applied {theme_name.title()} theme!")
             st.rerun()
 
+    def get_renderer(self):
+        """Return a renderer bound to the current session state"""
+        timings = st.session_state.stage_timings
+        # Edits sync the index as they are applied, so only a table that was replaced is compared row by row
+        if st.session_state.speaker_index.data is not st.session_state.session_data:
+            with timings.time('speaker_index_sync'):
+                st.session_state.speaker_index.sync(st.session_state.session_data)
+        return LobbyRenderer(
+            st.session_state.config,
+            st.session_state.session_data,
+            st.session_state.speaker_data,
+            st.session_state.render_cache,
+            st.session_state.speaker_index,
+            timings,
+            session_hashes=st.session_state.session_data_hashes,
+            speaker_hashes=st.session_state.speaker_data_hashes
+        )
+
     def generate_css(self):
         """Generate CSS from configuration"""
-        config = st.session_state.config
-        
-        css = f"""
-/* Generated Event Lobby Styles */
-:root {{
-  --primary-color: {config['colors']['primary']};
-  --secondary-color: {config['colors']['secondary']};
-  --success-color: {config['colors']['success']};
-  --warning-color: {config['colors']['warning']};
-  --error-color: {config['colors']['error']};
-  --neutral-color: {config['colors']['neutral']};
-  --body-bg: {config['colors']['body_background']};
-  --text-primary: {config['colors']['text_primary']};
-  --text-secondary: {config['colors']['text_secondary']};
-}}
-
-/* Body */
-body {{
-  background: {config['colors']['body_background']} !important;
-  font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-}}
-
-/* Header */
-.header {{
-  background: {config['header']['background_color']} !important;
-  color: {config['header']['text_color']} !important;
-  padding: {config['header']['padding']} !important;
-}}
-
-.logo {{
-  color: {config['header']['logo_color']} !important;
-  font-size: {config['header']['logo_size']}px !important;
-}}
-
-/* Masthead */
-.masthead {{
-  background: {config['masthead']['background_gradient'] if config['masthead']['background_type'] == 'gradient' else config['masthead']['background_image']} !important;
-  color: {config['masthead']['text_color']} !important;
-  padding: {config['masthead']['padding']} !important;
-}}
-
-.masthead h1 {{
-  font-size: {config['masthead']['title_size']}px !important;
-}}
-
-.masthead p {{
-  font-size: {config['masthead']['subtitle_size']}px !important;
-}}
-
-/* Navigation */
-.nav-tabs {{
-  background: {config['navigation']['background_color']} !important;
-  border-bottom-color: {config['navigation']['border_color']} !important;
-  height: {config['navigation']['height']}px !important;
-}}
-
-.nav-tab {{
-  color: {config['navigation']['text_color']} !important;
-  font-size: {config['navigation']['font_size']}px !important;
-}}
-
-.nav-tab.active {{
-  color: {config['navigation']['active_color']} !important;
-  border-bottom-color: {config['navigation']['active_color']} !important;
-}}
-
-/* Content Layout */
-.content {{
-  max-width: {config['layout']['content_width']}px !important;
-  padding: {config['layout']['content_padding']}px !important;
-}}
-
-.sessions-grid {{
-  grid-template-columns: {config['layout']['grid_columns']} !important;
-  gap: {config['layout']['grid_gap']}px !important;
-}}
-
-.section {{
-  margin-bottom: {config['layout']['section_spacing']}px !important;
-}}
-
-.section-title {{
-  font-size: {config['content']['section_title_size']}px !important;
-  color: {config['content']['section_title_color']} !important;
-}}
-
-/* Session Cards */
-.session-card {{
-  background: {config['session_card']['background_color']} !important;
-  border-radius: {config['session_card']['border_radius']}px !important;
-  padding: {config['session_card']['padding']}px !important;
-  box-shadow: 0 4px 20px {config['session_card']['shadow_color']} !important;
-  transition: all {config['session_card']['animation_duration']}s ease !important;
-}}
-
-.session-title {{
-  color: {config['session_card']['title_color']} !important;
-}}
-
-.session-description {{
-  color: {config['session_card']['text_color']} !important;
-}}
-
-.session-time, .session-speakers {{
-  color: {config['session_card']['meta_color']} !important;
-}}
-
-.btn-primary {{
-  background: {config['session_card']['button_color']} !important;
-  color: {config['session_card']['button_text_color']} !important;
-}}
-
-/* Speaker Cards */
-.speaker-card {{
-  background: {config['speaker_card']['background_color']} !important;
-  border-radius: {config['speaker_card']['border_radius']}px !important;
-  padding: {config['speaker_card']['padding']}px !important;
-}}
-
-.speaker-avatar {{
-  background: {config['speaker_card']['avatar_color']} !important;
-  width: {config['speaker_card']['avatar_size']}px !important;
-  height: {config['speaker_card']['avatar_size']}px !important;
-}}
-
-.speaker-name {{
-  color: {config['speaker_card']['name_color']} !important;
-}}
-
-.speaker-title {{
-  color: {config['speaker_card']['title_color']} !important;
-}}
-
-/* Quick Actions */
-.quick-actions {{
-  background: {config['quick_actions']['background_color']} !important;
-  border-radius: {config['quick_actions']['border_radius']}px !important;
-  padding: {config['quick_actions']['padding']}px !important;
-}}
-
-/* Custom CSS */
-{config['advanced']['custom_css']}
-"""
-        return css
+        return self.get_renderer().generate_css()
 
     def generate_html(self):
         """Generate complete HTML file"""
-        config = st.session_state.config
-        css = self.generate_css()
-        
-        # Generate session cards HTML
-        session_html = ""
-        for _, session in st.session_state.session_data.iterrows():
-            status_class = "live" if session['status'] == 'live' else "future" if session['status'] == 'upcoming' else "finished"
-            status_text = "LIVE" if session['status'] == 'live' else "UPCOMING" if session['status'] == 'upcoming' else "ENDED"
-            
-            session_html += f"""
-            <div class="session-card {'featured' if session.get('featured', False) else ''}">
-                {'<div class="featured-badge">Featured</div>' if session.get('featured', False) else ''}
-                <div class="session-status status-{status_class}">{status_text}</div>
-                <div class="session-time">{session['time']}</div>
-                <h3 class="session-title">{session['title']}</h3>
-                <div class="session-speakers">👤 {session['speaker']}, {session['company']}</div>
-                <div class="session-description">{session['description']}</div>
-                <div class="session-actions">
-                    <button class="btn-primary">
-                        {'Join' if session['status'] == 'live' else 'Watch Recording' if session['status'] == 'finished' else 'View Details'}
-                    </button>
-                    <button class="bookmark-btn">🤍</button>
-                </div>
-            </div>
-            """
-        
-        # Generate speaker cards HTML
-        speaker_html = ""
-        for _, speaker in st.session_state.speaker_data.iterrows():
-            initial = speaker['name'][0].upper()
-            speaker_html += f"""
-            <div class="speaker-card">
-                <div class="speaker-avatar">{initial}</div>
-                <div class="speaker-name">{speaker['name']}</div>
-                <div class="speaker-title">{speaker['title']}, {speaker['company']}</div>
-                {'<div class="speaker-sessions">' + str(speaker["sessions"]) + ' sessions</div>' if config['speaker_card']['show_session_count'] else ''}
-            </div>
-            """
-        
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{config['header']['logo_text']}</title>
-    <meta name="description" content="{config['advanced']['meta_tags']['description']}">
-    <meta name="keywords" content="{config['advanced']['meta_tags']['keywords']}">
-    <meta name="author" content="{config['advanced']['meta_tags']['author']}">
-    
-    <!-- Social Sharing -->
-    <meta property="og:title" content="{config['advanced']['social_sharing']['title']}">
-    <meta property="og:description" content="{config['advanced']['social_sharing']['description']}">
-    <meta property="og:type" content="website">
-    
-    <style>
-        {css}
-        
-        /* Base styles from original lobby */
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        .header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-        }}
-        
-        .header-info {{
-            display: flex;
-            align-items: center;
-            gap: 20px;
-            font-size: 14px;
-        }}
-        
-        .nav-tabs {{
-            border-bottom: 1px solid var(--nav-border);
-            display: flex;
-            gap: 40px;
-            padding: 0 40px;
-        }}
-        
-        .nav-tab {{
-            padding: 15px 0;
-            font-weight: 600;
-            cursor: pointer;
-            border-bottom: 3px solid transparent;
-            transition: all 0.3s ease;
-        }}
-        
-        .nav-tab.active {{
-            border-bottom-color: var(--nav-active);
-        }}
-        
-        .masthead {{
-            text-align: center;
-            position: relative;
-            overflow: hidden;
-        }}
-        
-        .masthead-content {{
-            position: relative;
-            z-index: 1;
-        }}
-        
-        .event-stats {{
-            display: flex;
-            justify-content: center;
-            gap: 40px;
-            margin-top: 30px;
-        }}
-        
-        .stat {{
-            text-align: center;
-        }}
-        
-        .stat-number {{
-            font-size: 32px;
-            font-weight: bold;
-            display: block;
-        }}
-        
-        .stat-label {{
-            font-size: 14px;
-            opacity: 0.8;
-        }}
-        
-        .quick-actions {{
-            box-shadow: 0 4px 20px rgba(0,0,0,0.08);
-            display: flex;
-            gap: 20px;
-            align-items: center;
-            flex-wrap: wrap;
-            margin-bottom: 40px;
-        }}
-        
-        .search-container {{
-            position: relative;
-            flex: 1;
-            max-width: 400px;
-        }}
-        
-        .search-input {{
-            width: 100%;
-            padding: 12px 20px 12px 45px;
-            border: 2px solid #e5e7eb;
-            border-radius: 25px;
-            font-size: 14px;
-            background: #f9fafb;
-        }}
-        
-        .search-icon {{
-            position: absolute;
-            left: 15px;
-            top: 50%;
-            transform: translateY(-50%);
-            color: #9ca3af;
-        }}
-        
-        .filter-btn {{
-            padding: 10px 20px;
-            border: 2px solid #e5e7eb;
-            background: white;
-            border-radius: 25px;
-            cursor: pointer;
-            font-weight: 500;
-            transition: all 0.3s ease;
-            font-size: 14px;
-        }}
-        
-        .filter-btn.active {{
-            background: var(--primary-color);
-            color: white;
-            border-color: var(--primary-color);
-        }}
-        
-        .sessions-grid {{
-            display: grid;
-            margin-bottom: 50px;
-        }}
-        
-        .session-card {{
-            border: 2px solid transparent;
-            transition: all 0.3s ease;
-            position: relative;
-            overflow: hidden;
-        }}
-        
-        .session-card:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 8px 30px rgba(0,0,0,0.12);
-        }}
-        
-        .session-card.featured {{
-            background: linear-gradient(135deg, #fef3c7 0%, #fbbf24 1%, white 1%);
-        }}
-        
-        .featured-badge {{
-            position: absolute;
-            top: -2px;
-            left: 15px;
-            background: #fbbf24;
-            color: white;
-            padding: 4px 12px;
-            border-radius: 0 0 8px 8px;
-            font-size: 11px;
-            font-weight: bold;
-            text-transform: uppercase;
-        }}
-        
-        .session-status {{
-            position: absolute;
-            top: 15px;
-            right: 15px;
-            padding: 4px 12px;
-            border-radius: 12px;
-            font-size: 12px;
-            font-weight: 600;
-            text-transform: uppercase;
-        }}
-        
-        .status-live {{
-            background: #fee2e2;
-            color: #dc2626;
-        }}
-        
-        .status-finished {{
-            background: #f3f4f6;
-            color: #6b7280;
-        }}
-        
-        .status-future {{
-            background: #dbeafe;
-            color: #2563eb;
-        }}
-        
-        .session-actions {{
-            display: flex;
-            gap: 10px;
-            align-items: center;
-        }}
-        
-        .btn-primary {{
-            border: none;
-            padding: 12px 24px;
-            border-radius: 8px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            flex: 1;
-        }}
-        
-        .bookmark-btn {{
-            background: none;
-            border: none;
-            font-size: 20px;
-            cursor: pointer;
-            padding: 8px;
-            border-radius: 6px;
-            transition: all 0.3s ease;
-        }}
-        
-        .speakers-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 25px;
-        }}
-        
-        .speaker-card {{
-            text-align: center;
-            box-shadow: 0 4px 20px rgba(0,0,0,0.08);
-            transition: all 0.3s ease;
-        }}
-        
-        .speaker-card:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 8px 30px rgba(0,0,0,0.12);
-        }}
-        
-        .speaker-avatar {{
-            border-radius: 50%;
-            margin: 0 auto 15px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-size: 32px;
-            font-weight: bold;
-        }}
-        
-        .speaker-name {{
-            font-size: 18px;
-            font-weight: bold;
-            margin-bottom: 5px;
-        }}
-        
-        .speaker-title {{
-            font-size: 14px;
-            margin-bottom: 10px;
-        }}
-        
-        .speaker-sessions {{
-            font-size: 12px;
-            color: var(--primary-color);
-            font-weight: 500;
-        }}
-        
-        .section {{
-            margin-bottom: var(--section-spacing, 50px);
-        }}
-        
-        .section-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 25px;
-        }}
-        
-        .section-title {{
-            font-weight: bold;
-        }}
-        
-        .section-subtitle {{
-            font-size: 16px;
-            margin-top: 5px;
-        }}
-        
-        .view-all {{
-            color: var(--primary-color);
-            text-decoration: none;
-            font-weight: 600;
-            padding: 8px 16px;
-            border-radius: 8px;
-            transition: background 0.3s ease;
-        }}
-        
-        .view-all:hover {{
-            background: #f3f4f6;
-        }}
-        
-        @media (max-width: 768px) {{
-            .header {{
-                padding: 15px 20px;
-                flex-direction: column;
-                gap: 15px;
-            }}
-            
-            .content {{
-                padding: 20px;
-            }}
-            
-            .sessions-grid {{
-                grid-template-columns: 1fr;
-            }}
-            
-            .quick-actions {{
-                flex-direction: column;
-                align-items: stretch;
-            }}
-            
-            .masthead {{
-                padding: 40px 20px;
-            }}
-            
-            .event-stats {{
-                flex-direction: column;
-                gap: 20px;
-            }}
-        }}
-    </style>
-    
-    {config['advanced']['analytics_code']}
-</head>
-<body>
-    <!-- Header -->
-    <div class="header">
-        <div class="logo">{config['header']['logo_text']}</div>
-        <div class="header-info">
-            {('<div>🔴 3 sessions live now</div>' if config['header']['show_live_indicator'] else '')}
-            {('<div>📚 7 bookmarked</div>' if config['header']['show_bookmarks'] else '')}
-            {('<div>Welcome, Alex Chen</div>' if config['header']['show_user_info'] else '')}
-        </div>
-    </div>
-
-    <!-- Navigation -->
-    <div class="nav-tabs">
-        {(''.join([f'<div class="nav-tab {"active" if i == 0 else ""}">{tab}</div>' for i, tab in enumerate(config['navigation']['tabs'])]))}
-    </div>
-
-    <!-- Masthead -->
-    <div class="masthead">
-        <div class="masthead-content">
-            <h1>{config['masthead']['title_text']}</h1>
-            <p>{config['masthead']['subtitle_text']}</p>
-            {(f"""
-            <div class="event-stats">
-                {(''.join([f'<div class="stat"><span class="stat-number">{stat["number"]}</span><span class="stat-label">{stat["label"]}</span></div>' for stat in config['masthead']['custom_stats']]))}
-            </div>
-            """ if config['masthead']['show_stats'] else '')}
-        </div>
-    </div>
-
-    <!-- Content -->
-    <div class="content">
-        <!-- Quick Actions -->
-        {(f"""
-        <div class="quick-actions">
-            {('<div class="search-container"><input type="text" class="search-input" placeholder="' + config['quick_actions']['search_placeholder'] + '"><span class="search-icon">🔍</span></div>' if config['quick_actions']['show_search'] else '')}
-            {('<button class="filter-btn active">All Sessions</button><button class="filter-btn">Live Now</button><button class="filter-btn">Upcoming</button>' if config['quick_actions']['show_filters'] else '')}
-            {('<button class="filter-btn">📅 Download Schedule</button>' if config['quick_actions']['show_actions'] else '')}
-        </div>
-        """ if any([config['quick_actions']['show_search'], config['quick_actions']['show_filters'], config['quick_actions']['show_actions']]) else '')}
-
-        <!-- Sections -->
-        {self.generate_sections_html(session_html, speaker_html)}
-    </div>
-</body>
-</html>"""
-        
-        return html
-
-    def generate_sections_html(self, session_html, speaker_html):
-        """Generate HTML for all sections based on configuration"""
-        config = st.session_state.config
-        sections_html = ""
-        
-        for section_id in config['layout']['section_order']:
-            if not config['layout']['section_visibility'][section_id]:
-                continue
-                
-            section_info = config['content']['sections'][section_id]
-            
-            if section_id == 'speakers':
-                sections_html += f"""
-                <div class="section">
-                    <div class="section-header">
-                        <div>
-                            <h2 class="section-title">{section_info['title']}</h2>
-                            <p class="section-subtitle">{section_info['subtitle']}</p>
-                        </div>
-                        <a href="#" class="view-all">View all →</a>
-                    </div>
-                    <div class="speakers-grid">
-                        {speaker_html}
-                    </div>
-                </div>
-                """
-            else:
-                sections_html += f"""
-                <div class="section">
-                    <div class="section-header">
-                        <div>
-                            <h2 class="section-title">{section_info['title']}</h2>
-                            <p class="section-subtitle">{section_info['subtitle']}</p>
-                        </div>
-                        <a href="#" class="view-all">View all →</a>
-                    </div>
-                    <div class="sessions-grid">
-                        {session_html}
-                    </div>
-                </div>
-                """
-        
-        return sections_html
+        renderer = self.get_renderer()
+        with st.session_state.stage_timings.time('generate_html'):
+            return renderer.generate_html()
 
     def render_preview(self):
         """Render live preview of the lobby"""
         st.markdown("### 🔍 Live Preview")
         
+        renderer = self.get_renderer()
+        header_texts = renderer.header_texts()
+        
         with st.container():
             # Header Preview
             header_style = f"""
@@ -1814,9 +1600,9 @@ body {{
                     {st.session_state.config['header']['logo_text']}
                 </div>
                 <div style="display: flex; gap: 20px; font-size: 14px;">
-                    {('🔴 3 sessions live now' if st.session_state.config['header']['show_live_indicator'] else '')}
-                    {('📚 7 bookmarked' if st.session_state.config['header']['show_bookmarks'] else '')}
-                    {('Welcome, Alex Chen' if st.session_state.config['header']['show_user_info'] else '')}
+                    {(header_texts['live_indicator_text'] if st.session_state.config['header']['show_live_indicator'] else '')}
+                    {(header_texts['bookmarks_text'] if st.session_state.config['header']['show_bookmarks'] else '')}
+                    {(header_texts['user_info_text'] if st.session_state.config['header']['show_user_info'] else '')}
                 </div>
             </div>
             """, unsafe_allow_html=True)
@@ -1843,6 +1629,9 @@ body {{
                 <p style="font-size: {st.session_state.config['masthead']['subtitle_size']}px; opacity: 0.9;">
                     {st.session_state.config['masthead']['subtitle_text']}
                 </p>
+                {(f'''<div style="display: flex; justify-content: center; gap: 40px; margin-top: 25px;">
+                    {''.join(f'<div><div style="font-size: 28px; font-weight: bold;">{stat["number"]}</div><div style="opacity: 0.8;">{stat["label"]}</div></div>' for stat in renderer.masthead_stats())}
+                </div>''' if st.session_state.config['masthead']['show_stats'] else '')}
             </div>
             """, unsafe_allow_html=True)
             
@@ -1904,6 +1693,36 @@ body {{
                 </div>
                 """, unsafe_allow_html=True)
 
+    def render_diagnostics(self):
+        """Render rolling per-stage timings with a histogram and JSON export"""
+        timings = st.session_state.stage_timings
+        
+        # Generate the page on every rerun while diagnostics are shown so generation stages are sampled too
+        self.generate_html()
+        
+        summary = pd.DataFrame(timings.summary())
+        st.dataframe(summary.round(2), hide_index=True, use_container_width=True)
+        
+        stage = st.selectbox("Histogram for stage", timings.stage_order, key="diagnostics_stage")
+        if stage:
+            histogram = pd.DataFrame(timings.histogram(stage), columns=['bucket', 'runs']).set_index('bucket')
+            st.bar_chart(histogram)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.download_button(
+                label="💾 Download Timings JSON",
+                data=timings.to_json(),
+                file_name=f"lobby_timings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json"
+            )
+            
+        with col2:
+            if st.button("🧹 Clear Timings"):
+                timings.clear()
+                st.rerun()
+
     def export_configuration(self):
         """Export configuration as JSON"""
         config_json = json.dumps(st.session_state.config, indent=2)
@@ -1916,65 +1735,19 @@ body {{
 
     def export_complete_package(self):
         """Export complete package with HTML, CSS, and assets"""
-        # Create temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Generate files
-            html_content = self.generate_html()
-            css_content = self.generate_css()
-            config_content = json.dumps(st.session_state.config, indent=2)
-            
-            # Write files
-            with open(os.path.join(temp_dir, "index.html"), "w") as f:
-                f.write(html_content)
-            
-            with open(os.path.join(temp_dir, "styles.css"), "w") as f:
-                f.write(css_content)
-                
-            with open(os.path.join(temp_dir, "config.json"), "w") as f:
-                f.write(config_content)
-                
-            # Export session data
-            st.session_state.session_data.to_csv(os.path.join(temp_dir, "sessions.csv"), index=False)
-            st.session_state.speaker_data.to_csv(os.path.join(temp_dir, "speakers.csv"), index=False)
-            
-            # Create README
-            readme_content = f"""# {st.session_state.config['header']['logo_text']} - Event Lobby
-
-## Files Included:
-- `index.html` - Complete lobby HTML file
-- `styles.css` - Generated CSS styles
-- `config.json` - Configuration backup
-- `sessions.csv` - Session data
-- `speakers.csv` - Speaker data
-- `README.md` - This file
-
-## Usage:
-1. Open `index.html` in a web browser to view your lobby
-2. Upload to your web hosting service
-3. Import `config.json` to restore settings in the customizer
-
-## Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-            
-            with open(os.path.join(temp_dir, "README.md"), "w") as f:
-                f.write(readme_content)
-            
-            # Create ZIP file
-            zip_buffer = StringIO()
-            with zipfile.ZipFile(f"{temp_dir}/lobby_package.zip", "w") as zip_file:
-                for file_name in ["index.html", "styles.css", "config.json", "sessions.csv", "speakers.csv", "README.md"]:
-                    zip_file.write(os.path.join(temp_dir, file_name), file_name)
-            
-            # Offer download
-            with open(f"{temp_dir}/lobby_package.zip", "rb") as f:
-                zip_data = f.read()
-                
-            st.download_button(
-                label="📦 Download Complete Package",
-                data=zip_data,
-                file_name=f"lobby_package_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
-                mime="application/zip"
-            )
+        # Stream every artifact straight into an in-memory zip
+        zip_buffer = BytesIO()
+        renderer = self.get_renderer()
+        with st.session_state.stage_timings.time('export_complete_package'):
+            renderer.write_package_zip(zip_buffer)
+        zip_buffer.seek(0)
+        
+        st.download_button(
+            label="📦 Download Complete Package",
+            data=zip_buffer,
+            file_name=f"lobby_package_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+            mime="application/zip"
+        )
 
     def reset_configuration(self):
         """Reset configuration to defaults"""
@@ -1994,8 +1767,12 @@ body {{
         self.render_tabs()
         
         # Preview section
-        with st.expander("🔍 Live Preview", expanded=True):
+        with st.expander("🔍 Live Preview", expanded=True), st.session_state.stage_timings.time('render_preview'):
             self.render_preview()
+        
+        if st.session_state.get('show_diagnostics'):
+            with st.expander("🩺 Diagnostics", expanded=True):
+                self.render_diagnostics()
 
 # Run the application
 if __name__ == "__main__":
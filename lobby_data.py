@@ -0,0 +1,575 @@
+"""Schema-driven loading and coercion of uploaded event data"""
+import ast
+import os
+import re
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# Declared layout of session data: column kinds, columns a row cannot render without,
+# allowed values for closed columns, and the column that identifies a row
+SESSION_SCHEMA = {
+    'columns': {
+        'id': 'int',
+        'title': 'string',
+        'speaker': 'string',
+        'company': 'string',
+        'time': 'string',
+        'description': 'string',
+        'status': 'category',
+        'featured': 'bool',
+        'track': 'category',
+        'level': 'category',
+        'tags': 'list'
+    },
+    'required': ['id', 'title', 'status'],
+    'allowed': {'status': ['live', 'upcoming', 'finished', 'scheduled']},
+    'key': 'id'
+}
+
+# Declared layout of speaker data; 'sessions' is derived from session data when rendering
+SPEAKER_SCHEMA = {
+    'columns': {
+        'name': 'string',
+        'title': 'string',
+        'company': 'string',
+        'bio': 'string',
+        'sessions': 'int',
+        'twitter': 'string',
+        'linkedin': 'string',
+        'photo': 'string'
+    },
+    'required': ['name'],
+    'allowed': {},
+    'key': 'name'
+}
+
+# Uploads larger than this many bytes are read in chunks of CHUNK_ROWS rows
+CHUNKED_READ_BYTES = 8 * 1024 * 1024
+CHUNK_ROWS = 50_000
+
+# Columns of the rejected-row report returned alongside loaded data
+REPORT_COLUMNS = ['row', 'column', 'value', 'reason']
+
+# Spellings accepted for boolean columns, compared case-insensitively
+BOOLEAN_VALUES = {
+    'true': True, 't': True, 'yes': True, 'y': True, '1': True,
+    'false': False, 'f': False, 'no': False, 'n': False, '0': False, '': False
+}
+
+# Value an empty cell takes on load, by column kind; list cells become [] and other kinds stay missing
+EMPTY_CELL_VALUES = {'string': '', 'bool': False}
+
+# Event statistics computed from the data, usable as {name} placeholders in header and masthead text
+EVENT_STAT_NAMES = ['sessions', 'live', 'upcoming', 'finished', 'featured', 'speakers', 'companies', 'tracks', 'tags']
+STAT_PLACEHOLDER_PATTERN = re.compile(r"\{(\w+)\}")
+
+
+def read_chunks(source, file_name, size=None):
+    """Yield raw DataFrame chunks from a CSV, JSON or JSON Lines upload"""
+    if size is None and isinstance(source, (str, os.PathLike)):
+        size = os.path.getsize(source)
+    chunked = size is not None and size > CHUNKED_READ_BYTES
+
+    if file_name.endswith('.csv'):
+        # Read every column as text; coercion to the schema happens afterwards
+        reader = pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=CHUNK_ROWS if chunked else None)
+        yield from (reader if chunked else [reader])
+    elif file_name.endswith('.jsonl'):
+        reader = pd.read_json(source, lines=True, chunksize=CHUNK_ROWS if chunked else None)
+        yield from (reader if chunked else [reader])
+    else:
+        yield pd.read_json(source)
+
+
+def parse_booleans(values):
+    """Return (parsed, valid) Series for a boolean column given as bools or text"""
+    parsed = values.fillna('').astype(str).str.strip().str.lower().map(BOOLEAN_VALUES)
+    return parsed.fillna(False).astype(bool), parsed.notna()
+
+
+def parse_lists(values):
+    """Return (parsed, valid) Series for a list column given as lists, list literals or comma-separated text
+
+    Each distinct text is parsed once and rows with the same text share the
+    resulting list, so callers must replace list cells rather than mutate them.
+    """
+    parsed_by_text = {'': []}
+    item_pool = {}
+    parsed = []
+    valid = []
+
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            items = [item_pool.setdefault(str(item), str(item)) for item in value]
+        elif value is None or (isinstance(value, float) and pd.isna(value)):
+            items = parsed_by_text['']
+        else:
+            text = str(value).strip()
+            if text not in parsed_by_text:
+                items = parse_list_text(text)
+                parsed_by_text[text] = None if items is None else [item_pool.setdefault(item, item) for item in items]
+            items = parsed_by_text[text]
+
+        parsed.append(items if items is not None else [])
+        valid.append(items is not None)
+
+    return pd.Series(parsed, index=values.index, dtype=object), pd.Series(valid, index=values.index)
+
+
+def parse_list_text(text):
+    """Parse "['a', 'b']" or "a, b" into a list of strings, or None if the text is malformed"""
+    if not text:
+        return []
+    if text.startswith('['):
+        try:
+            items = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            return None
+        return [str(item) for item in items] if isinstance(items, (list, tuple)) else None
+    return [item.strip() for item in text.split(',') if item.strip()]
+
+
+def coerce_table(data, schema, row_offset=0):
+    """Coerce raw data to the schema's dtypes
+
+    Returns the clean rows, indexed by their 1-based source row number, and a
+    report of rejected rows with the column, offending value and reason.
+    """
+    data = data.copy()
+    data.index = pd.RangeIndex(row_offset + 1, row_offset + len(data) + 1)
+    raw = data.copy()
+    rejections = []
+
+    def reject(mask, column, reason):
+        for row in mask[mask].index:
+            rejections.append({'row': row, 'column': column, 'value': str(raw.at[row, column]), 'reason': reason})
+
+    for column in schema['columns']:
+        if column not in data:
+            data[column] = raw[column] = None
+
+    for column, kind in schema['columns'].items():
+        values = data[column]
+
+        if kind == 'int':
+            numbers = pd.to_numeric(values, errors='coerce')
+            present = values.notna() & (values.astype(str).str.strip() != '')
+            invalid = present & (numbers.isna() | (numbers % 1 != 0))
+            reject(invalid, column, 'not an integer')
+            data[column] = numbers.where(~invalid).astype('Int64')
+        elif kind == 'bool':
+            data[column], valid = parse_booleans(values)
+            reject(~valid, column, 'not a boolean')
+        elif kind == 'list':
+            data[column], valid = parse_lists(values)
+            reject(~valid, column, 'not a list')
+        else:
+            data[column] = values.fillna('').astype(str).str.strip()
+
+    for column in schema['required']:
+        missing = raw[column].fillna('').astype(str).str.strip() == ''
+        reject(missing, column, 'missing required value')
+
+    for column, allowed in schema.get('allowed', {}).items():
+        reject(~data[column].isin(allowed) & (data[column] != ''), column, f"not one of {', '.join(allowed)}")
+
+    rejected = pd.DataFrame(rejections, columns=REPORT_COLUMNS)
+    clean = data.drop(index=rejected['row'].unique())
+
+    for column, kind in schema['columns'].items():
+        if kind == 'category':
+            # Closed columns keep every allowed value as a category so editors can pick any of them
+            allowed = schema.get('allowed', {}).get(column)
+            clean[column] = clean[column].astype(pd.CategoricalDtype(allowed) if allowed else 'category')
+
+    return clean, rejected
+
+
+def concat_chunks(chunks, schema):
+    """Concatenate coerced chunks, unifying categories so categorical columns stay categorical"""
+    if len(chunks) == 1:
+        return chunks[0]
+
+    for column, kind in schema['columns'].items():
+        if kind == 'category':
+            categories = list(dict.fromkeys(category for chunk in chunks for category in chunk[column].cat.categories))
+            for chunk in chunks:
+                chunk[column] = chunk[column].cat.set_categories(categories)
+
+    return pd.concat(chunks)
+
+
+def load_table(source, file_name, schema, size=None):
+    """Read an upload chunk by chunk and coerce it to the schema
+
+    Returns the clean DataFrame and the rejected-row report. Rows whose key
+    repeats an earlier row are rejected as duplicates.
+    """
+    chunks = []
+    reports = []
+    row_offset = 0
+
+    for raw in read_chunks(source, file_name, size):
+        clean, rejected = coerce_table(raw, schema, row_offset)
+        chunks.append(clean)
+        reports.append(rejected)
+        row_offset += len(raw)
+
+    data = concat_chunks(chunks, schema) if chunks else coerce_table(pd.DataFrame(), schema)[0]
+
+    key = schema.get('key')
+    if key and len(data):
+        duplicated = data[key].duplicated() & data[key].notna()
+        if duplicated.any():
+            reports.append(pd.DataFrame({
+                'row': data.index[duplicated], 'column': key,
+                'value': data.loc[duplicated, key].astype(str).tolist(), 'reason': 'duplicate key'
+            }))
+            data = data[~duplicated]
+
+    reports = [report for report in reports if len(report)]
+    rejected = pd.concat(reports, ignore_index=True) if reports else pd.DataFrame(columns=REPORT_COLUMNS)
+    return data.reset_index(drop=True), rejected
+
+
+def hash_rows(data):
+    """Return a 64-bit content hash per row of a DataFrame, equal for rows with equal values"""
+    # Object columns may hold unhashable lists such as tags, so they are hashed in their text form
+    text_columns = {column: str for column in data.columns if data[column].dtype == object}
+    return pd.util.hash_pandas_object(data.astype(text_columns) if text_columns else data, index=False).to_numpy()
+
+
+class RowHashes:
+    """Content hash of each row of a table, kept by row label and updated as rows change
+
+    The customizer edits tables in place; rehashing only the edited rows
+    keeps every render after a one-cell edit from hashing the whole table.
+    A different table object, or one whose rows no longer match the labels
+    held here, is hashed afresh.
+    """
+
+    def __init__(self):
+        self.data = None
+        self.hashes = {}
+
+    def rehash(self, data):
+        """Hash every row of data and follow it from now on"""
+        self.data = data
+        self.hashes = dict(zip(data.index.tolist(), hash_rows(data).tolist()))
+
+    def update(self, data, labels):
+        """Rehash the rows at labels after data changed in place, forgetting labels no longer in data"""
+        if data is not self.data:
+            return
+        for label in set(self.hashes).difference(data.index):
+            del self.hashes[label]
+        labels = [label for label in labels if label in data.index]
+        if labels:
+            self.hashes.update(zip(labels, hash_rows(data.loc[labels]).tolist()))
+
+    def row_hashes(self, data):
+        """Return the hash of each row of data, in row order"""
+        if data is not self.data or len(self.hashes) != len(data):
+            self.rehash(data)
+        try:
+            return np.fromiter((self.hashes[label] for label in data.index), dtype=np.uint64, count=len(data))
+        except KeyError:
+            self.rehash(data)
+            return np.fromiter((self.hashes[label] for label in data.index), dtype=np.uint64, count=len(data))
+
+
+class ChangeSet:
+    """Rows added, removed and changed between two versions of a table, identified by the table's key
+
+    changed maps each changed row's key to the columns whose values differ.
+    """
+
+    def __init__(self, added=(), removed=(), changed=None):
+        self.added = list(added)
+        self.removed = list(removed)
+        self.changed = dict(changed or {})
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    def keys(self, column=None):
+        """Return the keys of rows added, removed or changed; with column, only changed rows where it changed"""
+        changed = [row_key for row_key, columns in self.changed.items() if column is None or column in columns]
+        return self.added + self.removed + changed
+
+    def summary(self):
+        """Return the counts as text, e.g. '1 changed, 0 added, 2 removed'"""
+        return f"{len(self.changed):,} changed, {len(self.added):,} added, {len(self.removed):,} removed"
+
+
+def diff_table(previous, current, schema):
+    """Return the ChangeSet turning previous into current, matching rows by the schema's key
+
+    Rows are compared by content hash, so only changed rows have their
+    cells compared. Returns None when rows cannot be matched: the columns
+    differ, or a key is missing or repeated.
+    """
+    key = schema['key']
+    if list(previous.columns) != list(current.columns) or key not in current:
+        return None
+    for keys in (previous[key], current[key]):
+        if keys.isna().any() or keys.duplicated().any():
+            return None
+
+    previous_hashes = pd.Series(hash_rows(previous), index=pd.Index(previous[key]))
+    current_hashes = pd.Series(hash_rows(current), index=pd.Index(current[key]))
+    kept = current_hashes.index.isin(previous_hashes.index)
+    common = current_hashes.index[kept]
+    changed_keys = common[current_hashes[common].to_numpy() != previous_hashes[common].to_numpy()]
+
+    changed = {}
+    if len(changed_keys):
+        before = previous.set_index(key).loc[changed_keys].astype(str)
+        after = current.set_index(key).loc[changed_keys].astype(str)
+        differs = before.ne(after)
+        changed = {row_key: differs.columns[row].tolist() for row_key, row in zip(changed_keys.tolist(), differs.to_numpy())}
+
+    return ChangeSet(
+        added=current_hashes.index[~kept].tolist(),
+        removed=previous_hashes.index[~previous_hashes.index.isin(current_hashes.index)].tolist(),
+        changed=changed
+    )
+
+
+def changed_row_keys(previous, current):
+    """Return the keys of rows added, removed or changed between two Series of row hashes indexed by unique key"""
+    kept = current.index.isin(previous.index)
+    common = current.index[kept]
+    changed = common[current[common].to_numpy() != previous[common].to_numpy()]
+    removed = previous.index[~previous.index.isin(current.index)]
+    return current.index[~kept].tolist() + removed.tolist() + changed.tolist()
+
+
+def same_key(first, second):
+    """Return whether two key values are equal, treating missing values as equal to each other"""
+    if pd.isna(first) or pd.isna(second):
+        return pd.isna(first) and pd.isna(second)
+    return first == second
+
+
+def editor_cell(value, kind):
+    """Return a cell value from the data editor, with an empty cell given its column kind's empty value as on load"""
+    if isinstance(value, (list, tuple)) or not pd.isna(value):
+        return value
+    if kind == 'list':
+        return []
+    return EMPTY_CELL_VALUES.get(kind, value)
+
+
+def apply_editor_edits(data, base, edited, previous, current, schema):
+    """Apply a data editor's latest edits to data in place
+
+    The editor shows base and accumulates edits against it: previous and
+    current are its states (cell edits and deletions by row position in
+    base, and added rows) at the last rerun and now, and edited is the frame
+    it returned. data starts as a copy of base with the same labels, and only
+    rows whose edits differ between the two states are written. Rows added
+    in the editor are appended to data under the labels kept in the state,
+    and deleted rows restored in the editor return to their place.
+
+    Returns the ChangeSet, the state to pass as previous on the next rerun,
+    and the labels of the rows written.
+    """
+    key = schema['key']
+    added, removed, changed = [], [], {}
+    touched = []
+
+    def write(label, row, columns):
+        """Write columns of an edited row at label, appending the row if data has no such label"""
+        values = {column: editor_cell(row[column], schema['columns'].get(column)) for column in columns}
+        if label in data.index:
+            old_key = data.at[label, key]
+            for column, value in values.items():
+                data.at[label, column] = value
+            if not same_key(old_key, data.at[label, key]):
+                removed.append(old_key)
+                added.append(data.at[label, key])
+            elif columns:
+                changed[old_key] = list(columns)
+        else:
+            data.loc[label] = values
+            added.append(data.at[label, key])
+        touched.append(label)
+
+    def drop(label):
+        removed.append(data.at[label, key])
+        data.drop(index=label, inplace=True)
+
+    previous_edits, current_edits = previous['edited_rows'], current['edited_rows']
+    previous_deleted, current_deleted = set(previous['deleted_rows']), set(current['deleted_rows'])
+    positions = {
+        position for position in set(previous_edits) | set(current_edits)
+        if previous_edits.get(position) != current_edits.get(position)
+    }
+    restored = False
+    for position in sorted(positions | (previous_deleted ^ current_deleted)):
+        label = base.index[position]
+        if position in current_deleted:
+            if label in data.index:
+                drop(label)
+        elif label in data.index:
+            edited_columns = set(previous_edits.get(position, {})) | set(current_edits.get(position, {}))
+            write(label, edited.loc[label], [column for column in data.columns if column in edited_columns])
+        else:
+            write(label, edited.loc[label], list(data.columns))
+            restored = True
+
+    # Added rows follow base's rows in what the editor returns, in the order they were added
+    previous_added, current_added = previous['added_rows'], current['added_rows']
+    labels = list(previous['labels'])
+    added_rows = edited.iloc[len(edited) - len(current_added):]
+    for number in range(max(len(previous_added), len(current_added))):
+        if number >= len(current_added):
+            drop(labels.pop())
+        elif number >= len(previous_added):
+            # Integer labels past every row the table or the editor has held, so none is ever reused
+            label = max(
+                [label + 1 for label in labels] + [index.max() + 1 for index in (data.index, base.index) if len(index)],
+                default=0
+            )
+            labels.append(label)
+            write(label, added_rows.iloc[number], list(data.columns))
+        elif previous_added[number] != current_added[number]:
+            write(labels[number], added_rows.iloc[number], list(data.columns))
+
+    # A restored row was appended; labels follow the editor's row order, so sorting puts it back in place
+    if restored:
+        data.sort_index(inplace=True)
+
+    # A key both removed and added, as when added rows shift up after one is deleted, names a changed row
+    for row_key in set(added) & set(removed):
+        added.remove(row_key)
+        removed.remove(row_key)
+        changed[row_key] = list(data.columns)
+
+    state = {
+        'edited_rows': {position: dict(edits) for position, edits in current_edits.items()},
+        'deleted_rows': list(current['deleted_rows']),
+        'added_rows': [dict(row) for row in current_added],
+        'labels': labels
+    }
+    return ChangeSet(added, removed, changed), state, touched
+
+
+class SpeakerSessionIndex:
+    """Hash index joining speaker names to the ids of the sessions they present
+
+    The index remembers which speaker each session id was filed under, so
+    sync() only touches the sessions that were added, removed or reassigned,
+    and given the ids that may have changed it looks at no other rows.
+    """
+
+    def __init__(self):
+        self.speaker_by_session = {}
+        self.sessions_by_speaker = defaultdict(dict)
+        # Session table the index was last synced to
+        self.data = None
+
+    def add(self, session_id, speaker):
+        """File a session under its speaker"""
+        self.speaker_by_session[session_id] = speaker
+        self.sessions_by_speaker[speaker][session_id] = None
+
+    def remove(self, session_id):
+        """Drop a session from the index"""
+        speaker = self.speaker_by_session.pop(session_id)
+        sessions = self.sessions_by_speaker[speaker]
+        del sessions[session_id]
+        if not sessions:
+            del self.sessions_by_speaker[speaker]
+
+    def sync(self, session_data, session_ids=None):
+        """Bring the index in line with session_data, returning how many sessions changed
+
+        session_ids limits the check to the sessions that may have changed,
+        such as the keys of a ChangeSet; without it every session is compared,
+        as on a first load.
+        """
+        self.data = session_data
+        if session_ids is not None:
+            session_ids = list(dict.fromkeys(session_ids))
+            session_data = session_data[session_data['id'].isin(session_ids)]
+        current = dict(zip(session_data['id'].tolist(), session_data['speaker'].astype(str).str.strip().tolist()))
+        candidates = self.speaker_by_session if session_ids is None else session_ids
+        stale = [
+            session_id for session_id in candidates if session_id not in current and session_id in self.speaker_by_session
+        ]
+        changed = 0
+
+        for session_id in stale:
+            self.remove(session_id)
+            changed += 1
+
+        for session_id, speaker in current.items():
+            previous = self.speaker_by_session.get(session_id)
+            if previous == speaker:
+                continue
+            if previous is not None:
+                self.remove(session_id)
+            self.add(session_id, speaker)
+            changed += 1
+
+        return changed
+
+    def session_ids(self, name):
+        """Return the ids of the sessions presented by a speaker"""
+        return list(self.sessions_by_speaker.get(name, {}))
+
+    def session_counts(self, names):
+        """Return the number of sessions for each speaker name, aligned to names"""
+        return pd.Series(
+            [len(self.sessions_by_speaker.get(name, ())) for name in names.astype(str).str.strip().tolist()],
+            index=names.index,
+            dtype='Int64'
+        )
+
+
+def build_speaker_index(session_data):
+    """Build a speaker-session index over session_data in one pass"""
+    index = SpeakerSessionIndex()
+    index.sync(session_data)
+    return index
+
+
+def distinct_count(*columns):
+    """Return the number of distinct non-empty values across columns, expanding list cells"""
+    values = pd.concat([column.explode() if column.dtype == object else column for column in columns])
+    values = values.dropna().astype(str).str.strip()
+    return int(values[values != ''].nunique())
+
+
+def compute_event_stats(session_data, speaker_data):
+    """Return the event statistics named in EVENT_STAT_NAMES, reading each column once
+
+    Status counts follow the lobby sections: any status other than live,
+    upcoming or scheduled counts as finished. Speakers are the distinct
+    names in the speaker data, one per card in the Speakers section.
+    """
+    status_counts = session_data['status'].astype(str).value_counts() if 'status' in session_data else pd.Series(dtype=int)
+    empty = pd.Series([], dtype=object)
+    return {
+        'sessions': len(session_data),
+        'live': int(status_counts.get('live', 0)),
+        'upcoming': int(status_counts.get('upcoming', 0)),
+        'finished': int(status_counts.drop(['live', 'upcoming', 'scheduled'], errors='ignore').sum()),
+        'featured': int(session_data['featured'].fillna(False).astype(bool).sum()) if 'featured' in session_data else 0,
+        'speakers': distinct_count(speaker_data['name'] if 'name' in speaker_data else empty),
+        'companies': distinct_count(session_data['company'] if 'company' in session_data else empty),
+        'tracks': distinct_count(session_data['track'] if 'track' in session_data else empty),
+        'tags': distinct_count(session_data['tags'] if 'tags' in session_data else empty)
+    }
+
+
+def format_stats(text, stats):
+    """Replace {name} placeholders in text with formatted event statistics, leaving unknown ones as typed"""
+    return STAT_PLACEHOLDER_PATTERN.sub(
+        lambda match: f"{stats[match[1]]:,}" if match[1] in stats else match[0],
+        str(text)
+    )
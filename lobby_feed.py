@@ -0,0 +1,266 @@
+"""Live session status feed: compact status deltas that exported lobbies poll, and a local server for them"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from lobby_data import SESSION_SCHEMA
+from lobby_schedule import SCHEDULED_STATUS, build_schedule, schedule_errors, schedule_instant, schedule_settings
+
+# Status feed settings used when the config has no advanced.status_feed section
+DEFAULT_STATUS_FEED = {
+    'enabled': False,
+    'url': 'status-feed.json',
+    'poll_seconds': 15
+}
+
+# Package file holding the baseline feed; the feed server answers on the same path
+STATUS_FEED_FILE = "status-feed.json"
+
+# Versions whose changes are kept for deltas; clients further behind receive a full snapshot
+STATUS_FEED_HISTORY = 256
+
+# Minimum seconds between checks of the feed's source (sessions file or computed schedule)
+STATUS_FEED_REFRESH_SECONDS = 1.0
+
+
+def status_feed_settings(config):
+    """Return the advanced.status_feed section of a config merged over the defaults"""
+    return {**DEFAULT_STATUS_FEED, **config.get('advanced', {}).get('status_feed', {})}
+
+
+def section_totals(statuses):
+    """Return the number of sessions in each status section, counted as LobbyRenderer.build_session_index does"""
+    return {
+        'live': int((statuses == 'live').sum()),
+        'upcoming': int((statuses == 'upcoming').sum()),
+        'finished': int((~np.isin(statuses, ['live', 'upcoming', SCHEDULED_STATUS])).sum())
+    }
+
+
+def group_by_status(ids, statuses):
+    """Return {status: [ids]} for parallel id and status arrays, ids ascending within each status"""
+    groups = {}
+    if not len(ids):
+        return groups
+    order = np.lexsort((ids, statuses.astype(str)))
+    for status, status_ids in pd.Series(ids[order]).groupby(statuses[order], sort=True):
+        groups[str(status)] = status_ids.tolist()
+    return groups
+
+
+class StatusFeed:
+    """Versioned session statuses answering "what changed since version N" with a small delta
+
+    Each update that changes anything bumps the version and records which
+    sessions changed. Deltas list every changed session once, grouped by
+    its current status, so a client that is several versions behind still
+    gets one compact document. Section totals ride along, since the page
+    only holds markup for each section's first cards.
+    """
+
+    def __init__(self, session_data, history=STATUS_FEED_HISTORY):
+        self.ids = session_data['id'].astype('int64').to_numpy()
+        self.positions = pd.Index(self.ids)
+        self.statuses = session_data['status'].astype(str).to_numpy(dtype=object)
+        self.version = 0
+        self.history = deque(maxlen=history)
+        self.lock = threading.RLock()
+
+    def update(self, statuses):
+        """Apply a {session id: status} mapping and return the number of sessions whose status changed
+
+        Raises ValueError for unknown session ids or statuses, leaving the feed unchanged.
+        """
+        changes = pd.Series(statuses, dtype=object)
+        if changes.empty:
+            return 0
+        changes.index = changes.index.astype('int64')
+        positions = self.positions.get_indexer(changes.index)
+        if (positions < 0).any():
+            unknown = changes.index[positions < 0].tolist()
+            raise ValueError(f"Unknown session ids: {', '.join(map(str, unknown[:10]))}")
+        invalid = sorted(set(changes.astype(str)) - set(SESSION_SCHEMA['allowed']['status']))
+        if invalid:
+            raise ValueError(f"Invalid statuses: {', '.join(invalid)}")
+
+        with self.lock:
+            new_statuses = self.statuses.copy()
+            new_statuses[positions] = changes.astype(str).to_numpy(dtype=object)
+            return self.replace(new_statuses)
+
+    def replace(self, statuses):
+        """Replace every session's status (in row order) and return the number that changed"""
+        statuses = np.asarray(statuses, dtype=object)
+        with self.lock:
+            changed = np.flatnonzero(statuses != self.statuses)
+            if not len(changed):
+                return 0
+            self.statuses = statuses
+            self.version += 1
+            self.history.append((self.version, changed))
+            return len(changed)
+
+    def delta(self, since=0):
+        """Return the changes a client at version since needs to reach the current version
+
+        Clients older than the kept history, or ahead of it after a server
+        restart, receive every session's status with 'full' set.
+        """
+        with self.lock:
+            oldest = self.history[0][0] if self.history else self.version + 1
+            full = since > self.version or since < oldest - 1
+            if full:
+                positions = np.arange(len(self.ids))
+            else:
+                changed = [positions for version, positions in self.history if version > since]
+                positions = np.unique(np.concatenate(changed)) if changed else np.array([], dtype=np.int64)
+            return {
+                'version': self.version,
+                'full': bool(full),
+                'changes': group_by_status(self.ids[positions], self.statuses[positions]),
+                'totals': section_totals(self.statuses)
+            }
+
+    def to_json(self, since=0):
+        """Return the delta since a version as compact JSON"""
+        return json.dumps(self.delta(since), separators=(',', ':'))
+
+
+class FeedSource:
+    """Keeps a StatusFeed in step with an event's sessions file or computed schedule
+
+    With a computed schedule, statuses are recomputed for the current
+    instant; otherwise the sessions file is reloaded whenever it changes.
+    Checks are throttled so frequent polling stays cheap. If the file fails
+    to load, the feed keeps the last good sessions and the load is retried.
+    """
+
+    def __init__(self, feed, config, session_data, sessions_path=None, load_sessions=None, log=None):
+        self.feed = feed
+        self.settings = schedule_settings(config)
+        # Like the renderer, settings statuses cannot be computed with leave the entered statuses in place
+        if self.settings['status_mode'] == 'computed' and schedule_errors(self.settings):
+            self.settings['status_mode'] = 'manual'
+        self.session_data = session_data
+        self.sessions_path = sessions_path
+        self.load_sessions = load_sessions
+        self.log = log
+        self.lock = threading.Lock()
+        self.modified = os.stat(sessions_path).st_mtime_ns if sessions_path else None
+        # Modification time of the last version that failed to load, so each bad version is reported once
+        self.failed = None
+        self.checked = 0.0
+        self.schedule = None
+
+    def refresh(self):
+        """Bring the feed up to date if the refresh interval has passed; returns the number of changes"""
+        with self.lock:
+            now = time.monotonic()
+            if now - self.checked < STATUS_FEED_REFRESH_SECONDS:
+                return 0
+            self.checked = now
+
+            modified = None
+            try:
+                reloaded = False
+                if self.sessions_path:
+                    modified = os.stat(self.sessions_path).st_mtime_ns
+                    if modified != self.modified:
+                        self.session_data = self.load_sessions(self.sessions_path)
+                        self.modified = modified
+                        self.schedule = None
+                        reloaded = True
+
+                if self.settings['status_mode'] == 'computed':
+                    if self.schedule is None:
+                        self.schedule = build_schedule(self.session_data, self.settings)
+                    statuses = self.schedule.statuses_at(
+                        schedule_instant(self.settings),
+                        timedelta(minutes=self.settings['upcoming_window_minutes']),
+                        self.session_data['status'].astype(object)
+                    )
+                elif reloaded:
+                    statuses = self.session_data['status'].astype(str).to_numpy(dtype=object)
+                else:
+                    return 0
+
+                # Sessions added to the file after export have no card to update, so only known ids are fed
+                ids = self.session_data['id'].astype('int64').to_numpy()
+                known = np.isin(ids, self.feed.ids)
+                return self.feed.update(dict(zip(ids[known].tolist(), statuses[known].tolist())))
+            except Exception as e:
+                # Typically the file caught mid-save or left malformed; it is loaded again on the next check
+                if self.log and (modified is None or modified != self.failed):
+                    self.log(f"Status refresh failed, keeping the previous statuses: {type(e).__name__}: {e}")
+                self.failed = modified
+                return 0
+
+
+class StatusFeedHandler(SimpleHTTPRequestHandler):
+    """Serves the status feed at /<feed path>?since=N, accepts status updates by POST, and other files statically"""
+
+    def __init__(self, *args, feed_path, source, **kwargs):
+        self.feed_path = feed_path
+        self.source = source
+        super().__init__(*args, **kwargs)
+
+    def send_feed_headers(self, status, length):
+        """Send headers for a feed response that browsers must not cache and any origin may read"""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != self.feed_path:
+            return super().do_GET()
+
+        try:
+            since = int(parse_qs(url.query).get('since', ['0'])[0])
+        except ValueError:
+            since = 0
+        self.source.refresh()
+        body = self.source.feed.to_json(since).encode('utf-8')
+        self.send_feed_headers(200, len(body))
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if urlsplit(self.path).path != self.feed_path:
+            self.send_error(404)
+            return
+
+        try:
+            statuses = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            changed = self.source.feed.update(statuses)
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+        body = json.dumps({'version': self.source.feed.version, 'changed': changed}).encode('utf-8')
+        self.send_feed_headers(200, len(body))
+        self.wfile.write(body)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.end_headers()
+
+
+def serve_feed(source, host="127.0.0.1", port=8765, directory=".", feed_path="/" + STATUS_FEED_FILE):
+    """Serve the status feed, plus static files from directory, until interrupted"""
+    handler = partial(StatusFeedHandler, feed_path=feed_path, source=source, directory=directory)
+    with ThreadingHTTPServer((host, port), handler) as server:
+        server.serve_forever()
@@ -0,0 +1,203 @@
+"""Image asset stage: speaker photos and masthead backgrounds resized, re-encoded and named by content hash"""
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    # Pillow is optional; without it images are referenced as they are
+    Image = None
+
+# Image asset settings used when the config has no advanced.image_assets section
+DEFAULT_IMAGE_ASSETS = {
+    'enabled': False,
+    'source_dir': '',
+    'format': 'webp',
+    'quality': 80,
+    'cache_dir': '.lobby_image_cache'
+}
+
+# Output formats, most preferred first, with the Pillow feature each needs (None for built-in encoders)
+IMAGE_FORMATS = {'webp': 'webp', 'avif': 'avif', 'jpeg': None}
+
+# Package directory holding processed images
+IMAGE_ASSET_DIR = "assets"
+
+# Length of the content hash in processed image names
+IMAGE_HASH_LENGTH = 12
+
+# Width of the masthead background at 1x; its 2x variant is twice as wide
+MASTHEAD_IMAGE_WIDTH = 1280
+
+# Pixel densities each image is produced for; a density is skipped when the source is too small for it
+IMAGE_SCALES = (1, 2)
+
+# Worker threads processing images; Pillow releases the GIL while decoding, resizing and encoding
+IMAGE_WORKERS = min(8, os.cpu_count() or 1)
+
+# EXIF tag recording how the camera was held
+EXIF_ORIENTATION = 0x0112
+
+# Image references that are not local files and are linked as they are
+REMOTE_IMAGE_PREFIXES = ('http://', 'https://', '//', 'data:')
+
+
+def image_asset_settings(config):
+    """Return the advanced.image_assets section of a config merged over the defaults"""
+    return {**DEFAULT_IMAGE_ASSETS, **config.get('advanced', {}).get('image_assets', {})}
+
+
+def available_image_formats():
+    """Return the output formats this Pillow build can encode, or none without Pillow"""
+    if Image is None:
+        return []
+    return [name for name, feature in IMAGE_FORMATS.items() if feature is None or features.check(feature)]
+
+
+def is_remote_image(reference):
+    """Return whether an image reference is a URL rather than a local file"""
+    return str(reference).strip().lower().startswith(REMOTE_IMAGE_PREFIXES)
+
+
+def resolve_image(reference, source_dir):
+    """Return the absolute path of a local image reference, or None if it is empty, remote or missing"""
+    reference = str(reference).strip()
+    if not reference or is_remote_image(reference):
+        return None
+    path = os.path.join(source_dir, os.path.expanduser(reference))
+    return os.path.abspath(path) if os.path.isfile(path) else None
+
+
+def source_signature(path):
+    """Return (path, size, modification time), which changes whenever the file is replaced or edited"""
+    stat = os.stat(path)
+    return path, stat.st_size, stat.st_mtime_ns
+
+
+def target_sizes(source_size, width, height=None):
+    """Return (scale, width, height) for each density worth producing, never enlarging the source
+
+    With a height the image is cropped to fill width x height; without one
+    it keeps its aspect ratio. A source too small for the 1x size is used
+    at its own size, and higher densities it cannot fill are skipped.
+    """
+    source_width, source_height = source_size
+    sizes = []
+    for scale in IMAGE_SCALES:
+        fill = source_width / (width * scale)
+        if height:
+            fill = min(fill, source_height / (height * scale))
+        if fill < 1 and scale > 1:
+            break
+        fill = min(1.0, fill)
+        target_width = max(1, round(width * scale * fill))
+        if height:
+            target_height = max(1, round(height * scale * fill))
+        else:
+            target_height = max(1, round(source_height * target_width / source_width))
+        sizes.append((scale, target_width, target_height))
+    return sizes
+
+
+def encode_image(image, image_format, quality):
+    """Encode an image at the given quality and return the bytes"""
+    if image_format == 'jpeg' or (image.mode not in ('RGB', 'RGBA')):
+        image = image.convert('RGBA' if image_format != 'jpeg' and 'A' in image.getbands() else 'RGB')
+    output = BytesIO()
+    options = {'quality': quality}
+    if image_format == 'webp':
+        options['method'] = 6
+    elif image_format == 'jpeg':
+        options.update(optimize=True, progressive=True)
+    image.save(output, format=image_format.upper(), **options)
+    return output.getvalue()
+
+
+def cached_variant(cache_dir, key, render):
+    """Return a rendered variant from the on-disk cache, rendering and storing it on a miss"""
+    path = os.path.join(cache_dir, key)
+    if os.path.isfile(path):
+        with open(path, "rb") as f:
+            return f.read(), True
+    data = render()
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write under a temporary name so parallel exports never read a half-written file
+    partial_path = f"{path}.{os.getpid()}.partial"
+    with open(partial_path, "wb") as f:
+        f.write(data)
+    os.replace(partial_path, path)
+    return data, False
+
+
+def process_image(path, width, height, settings):
+    """Produce an image's variants for one display size
+
+    Returns a list of (file name, width, height, scale, bytes, cached), or
+    None when the file is not a readable image. Variants are cached on disk
+    under the source's content hash, so unchanged images are only read,
+    never decoded or re-encoded, and named after their own content hash,
+    so identical images share one file.
+    """
+    try:
+        with open(path, "rb") as f:
+            source = f.read()
+        opened = Image.open(BytesIO(source))
+    except (OSError, Image.DecompressionBombError):
+        return None
+    source_hash = hashlib.sha256(source).hexdigest()[:32]
+    image_format = settings['format'] if settings['format'] in available_image_formats() else 'jpeg'
+    extension = 'jpg' if image_format == 'jpeg' else image_format
+
+    # Only the header has been read so far; EXIF rotations by 90 degrees swap the displayed sides
+    rotated = opened.getexif().get(EXIF_ORIENTATION, 1) in (5, 6, 7, 8)
+    sizes = target_sizes(opened.size[::-1] if rotated else opened.size, width, height)
+    decoded = []
+
+    def decode():
+        if not decoded:
+            _, largest_width, largest_height = sizes[-1]
+            # JPEG sources decode straight at a reduced scale that still covers the largest variant
+            opened.draft('RGB', (largest_height, largest_width) if rotated else (largest_width, largest_height))
+            decoded.append(ImageOps.exif_transpose(opened))
+        return decoded[0]
+
+    variants = []
+    try:
+        for scale, variant_width, variant_height in sizes:
+            def render():
+                if height:
+                    resized = ImageOps.fit(decode(), (variant_width, variant_height), Image.LANCZOS)
+                else:
+                    resized = decode().resize((variant_width, variant_height), Image.LANCZOS)
+                return encode_image(resized, image_format, settings['quality'])
+
+            key = f"{source_hash}-{variant_width}x{variant_height}-q{settings['quality']}.{extension}"
+            data, cached = cached_variant(settings['cache_dir'], key, render)
+            file_name = f"{IMAGE_ASSET_DIR}/{hashlib.sha256(data).hexdigest()[:IMAGE_HASH_LENGTH]}.{extension}"
+            variants.append((file_name, variant_width, variant_height, scale, data, cached))
+    except (OSError, ValueError):
+        # A header that parsed but pixel data that does not
+        return None
+    finally:
+        opened.close()
+    return variants
+
+
+def process_images(requests, settings, workers=IMAGE_WORKERS):
+    """Process (path, width, height) requests in parallel and return {request: variants or None}"""
+    requests = list(dict.fromkeys(requests))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda request: process_image(*request, settings), requests)
+        return dict(zip(requests, results))
+
+
+def image_srcset(variants):
+    """Return a srcset attribute value listing each variant with its density"""
+    return ", ".join(f"{file_name} {scale}x" for file_name, _, _, scale, _, _ in variants)
+
+
+def image_set(variants):
+    """Return a CSS image-set() of the variants, for backgrounds"""
+    return "image-set(" + ", ".join(f'url("{file_name}") {scale}x' for file_name, _, _, scale, _, _ in variants) + ")"
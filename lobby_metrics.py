@@ -0,0 +1,85 @@
+"""Rolling per-stage timing instrumentation for the customizer and renderer"""
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Number of most recent samples kept per stage
+TIMING_WINDOW = 200
+
+# Upper edges (milliseconds) of the histogram buckets; the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[rank]
+
+
+class StageTimings:
+    """Rolling window of wall-clock samples per named stage"""
+
+    def __init__(self, window=TIMING_WINDOW):
+        self.window = window
+        self.samples = {}
+        self.stage_order = []
+
+    @contextmanager
+    def time(self, stage):
+        """Time the enclosed block and record it under stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def record(self, stage, seconds):
+        """Add one sample, in seconds, for stage"""
+        if stage not in self.samples:
+            self.samples[stage] = deque(maxlen=self.window)
+            self.stage_order.append(stage)
+        self.samples[stage].append(seconds * 1000)
+
+    def clear(self):
+        """Forget every sample"""
+        self.samples.clear()
+        self.stage_order.clear()
+
+    def summary(self):
+        """Return one row per stage with run count and last, mean, p50, p95 and max times in ms"""
+        rows = []
+        for stage in self.stage_order:
+            values = sorted(self.samples[stage])
+            rows.append({
+                'stage': stage,
+                'runs': len(values),
+                'last_ms': self.samples[stage][-1],
+                'mean_ms': sum(values) / len(values),
+                'p50_ms': percentile(values, 0.5),
+                'p95_ms': percentile(values, 0.95),
+                'max_ms': values[-1]
+            })
+        return rows
+
+    def histogram(self, stage):
+        """Return (bucket label, sample count) pairs for a stage's rolling window"""
+        labels = [f"≤{edge} ms" for edge in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]} ms"]
+        counts = [0] * len(labels)
+        for value in self.samples.get(stage, ()):
+            bucket = next((i for i, edge in enumerate(HISTOGRAM_BUCKETS_MS) if value <= edge), len(HISTOGRAM_BUCKETS_MS))
+            counts[bucket] += 1
+        return list(zip(labels, counts))
+
+    def to_json(self):
+        """Serialise the raw samples and summaries for offline analysis"""
+        return json.dumps({
+            'exported': datetime.now().isoformat(timespec='seconds'),
+            'window': self.window,
+            'histogram_buckets_ms': HISTOGRAM_BUCKETS_MS,
+            'summary': self.summary(),
+            'samples_ms': {stage: list(self.samples[stage]) for stage in self.stage_order}
+        }, indent=2)
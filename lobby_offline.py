@@ -0,0 +1,37 @@
+"""Offline support: a generated service worker that precaches the lobby and revalidates it in the background"""
+import hashlib
+import json
+
+from lobby_scripts import SERVICE_WORKER_SCRIPT
+
+# Package file holding the service worker; it controls the directory it is served from
+SERVICE_WORKER_FILE = "service-worker.js"
+
+# Package file listing the files the service worker precaches, with a revision of each
+PRECACHE_MANIFEST_FILE = "precache-manifest.json"
+
+# Hex digits of the content hash recorded as each precached file's revision
+PRECACHE_REVISION_LENGTH = 12
+
+
+def precache_entry(url, content, immutable=False):
+    """Return the manifest entry of one precached file
+
+    immutable marks files whose names carry their content hash, which are
+    served from the cache without revalidation.
+    """
+    data = content if isinstance(content, bytes) else content.encode('utf-8')
+    return {'url': url, 'revision': hashlib.sha256(data).hexdigest()[:PRECACHE_REVISION_LENGTH], 'immutable': immutable}
+
+
+def service_worker_source(version, manifest_file=PRECACHE_MANIFEST_FILE):
+    """Return the service worker for a cache version
+
+    The version is part of the file, so every export whose content differs
+    ships a byte-different worker, which browsers install in place of the old.
+    """
+    return (
+        f"var CACHE_VERSION = {json.dumps(version)};\n"
+        f"var PRECACHE_MANIFEST = {json.dumps(manifest_file)};\n"
+        + SERVICE_WORKER_SCRIPT
+    )
@@ -0,0 +1,175 @@
+"""Output optimization for generated pages: unused-rule pruning, duplicate-rule merging and minification"""
+import re
+
+from lobby_styles import merge_rules, minify_css, parse_css, prune_rules, selector_parts
+
+# Optimization stages in the order they run over a page
+OPTIMIZATION_STAGES = ['prune_css', 'merge_css', 'minify_css', 'minify_html']
+
+# Readable stage names for reports
+OPTIMIZATION_STAGE_LABELS = {
+    'prune_css': 'Unused CSS rules removed',
+    'merge_css': 'Duplicate selectors merged',
+    'minify_css': 'CSS minified',
+    'minify_html': 'HTML minified'
+}
+
+# Elements around which whitespace never renders, so the minifier drops it instead of collapsing it to one space
+BLOCK_ELEMENTS = {
+    '!doctype', 'html', 'head', 'body', 'title', 'meta', 'link', 'style', 'script', 'noscript', 'base',
+    'div', 'section', 'header', 'footer', 'nav', 'main', 'article', 'aside', 'p', 'h1', 'h2', 'h3', 'h4', 'h5',
+    'h6', 'ul', 'ol', 'li', 'dl', 'dt', 'dd', 'table', 'thead', 'tbody', 'tfoot', 'tr', 'td', 'th', 'form',
+    'fieldset', 'figure', 'figcaption', 'blockquote', 'hr', 'br', 'option'
+}
+
+STYLE_BLOCK_PATTERN = re.compile(r"(<style\b[^>]*>)(.*?)(</style\s*>)", re.DOTALL | re.IGNORECASE)
+SCRIPT_PATTERN = re.compile(r"<script\b([^>]*)>(.*?)</script\s*>", re.DOTALL | re.IGNORECASE)
+NAME_ATTRIBUTE_PATTERN = re.compile(r"""\s(class|id)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE)
+ELEMENT_NAME_PATTERN = re.compile(r"<([a-zA-Z][\w-]*)")
+SCRIPT_WORD_PATTERN = re.compile(r"[\w-]+")
+
+# Raw-text elements the HTML minifier copies as they are, comments, and tags (which may quote a '>')
+HTML_TOKEN_PATTERN = re.compile(
+    r"<(script|style|pre|textarea)\b[^>]*>.*?</\1\s*>|<!--.*?-->|<[^>\"']*(?:(?:\"[^\"]*\"|'[^']*')[^>\"']*)*>",
+    re.DOTALL | re.IGNORECASE
+)
+TAG_NAME_PATTERN = re.compile(r"</?(!?[a-zA-Z][\w-]*)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def byte_length(text):
+    """Return the UTF-8 size of text in bytes"""
+    return len(text.encode('utf-8'))
+
+
+class MarkupUsage:
+    """Class names, ids and elements that a page's markup and scripts can produce
+
+    Script text is read as a bag of words, and a word ending in a hyphen
+    (such as 'status-') counts as a prefix that scripts complete at
+    runtime, so rules for classes a script builds are never pruned.
+    """
+
+    def __init__(self, html):
+        markup = STYLE_BLOCK_PATTERN.sub('', html)
+        self.words = set()
+        for attributes, script in SCRIPT_PATTERN.findall(markup):
+            # JSON data islands hold card text, not class names
+            if 'json' not in attributes.lower():
+                self.words.update(SCRIPT_WORD_PATTERN.findall(script))
+        self.prefixes = tuple(word for word in self.words if word.endswith('-') and len(word) > 1)
+
+        markup = SCRIPT_PATTERN.sub('', markup)
+        self.classes = set()
+        self.ids = set()
+        for kind, *values in NAME_ATTRIBUTE_PATTERN.findall(markup):
+            (self.classes if kind.lower() == 'class' else self.ids).update(''.join(values).split())
+        self.elements = {name.lower() for name in ELEMENT_NAME_PATTERN.findall(markup)}
+
+    def produces(self, name, names):
+        """Return whether the page has, or a script may build, the class or id name"""
+        return name in names or name in self.words or name.startswith(self.prefixes)
+
+    def keeps(self, selector):
+        """Return whether some element of the page may match selector"""
+        ids, classes, types, _ = selector_parts(selector)
+        return (
+            all(self.produces(name, self.classes) for name in classes)
+            and all(self.produces(name, self.ids) for name in ids)
+            and all(name in self.elements or name in self.words for name in types)
+        )
+
+
+def optimize_css(css, usage=None):
+    """Prune rules no element can match (when usage is given), merge duplicate selectors and minify
+
+    Returns the stylesheet and the bytes each stage that ran saved. Pruning
+    and merging are measured on minified rules, so formatting and comments
+    count towards minification alone.
+    """
+    original_size = byte_length(css)
+    rules = parse_css(css)
+    savings = []
+    minified_size = byte_length(minify_css(rules))
+    # Comments and formatting count as minification; later stages are measured between minified forms
+    savings.append(('minify_css', original_size - minified_size))
+    if usage is not None:
+        rules = prune_rules(rules, usage.keeps)
+        pruned_size = byte_length(minify_css(rules))
+        savings.append(('prune_css', minified_size - pruned_size))
+        minified_size = pruned_size
+    rules = merge_rules(rules)
+    css = minify_css(rules)
+    savings.append(('merge_css', minified_size - byte_length(css)))
+    return css, savings
+
+
+def minify_html(html):
+    """Collapse whitespace between tags, dropping it next to block elements, and strip comments
+
+    Scripts, styles, pre and textarea content and conditional comments are
+    left as they are.
+    """
+    pieces = []
+    position = 0
+    for match in HTML_TOKEN_PATTERN.finditer(html):
+        pieces.append((None, html[position:match.start()]))
+        token = match.group(0)
+        if token.startswith('<!--'):
+            if token.startswith(('<!--[if', '<!--<![endif')):
+                pieces.append(('!doctype', token))
+        else:
+            name = TAG_NAME_PATTERN.match(token)
+            pieces.append((name[1].lower() if name else '', token))
+        position = match.end()
+    pieces.append((None, html[position:]))
+
+    # The nearest tag after each piece; the start and end of the page count as block boundaries
+    following = []
+    name_after = '!doctype'
+    for name, _ in reversed(pieces):
+        following.append(name_after)
+        name_after = name if name is not None else name_after
+    following.reverse()
+
+    output = []
+    previous = '!doctype'
+    for (name, text), name_after in zip(pieces, following):
+        if name is not None:
+            output.append(text)
+            previous = name
+            continue
+        text = WHITESPACE_PATTERN.sub(' ', text)
+        if previous in BLOCK_ELEMENTS:
+            text = text.lstrip()
+        if name_after in BLOCK_ELEMENTS:
+            text = text.rstrip()
+        output.append(text)
+    return ''.join(output)
+
+
+def optimize_html(html):
+    """Run every optimization stage over a page
+
+    Returns the optimized page and one report row per stage with the page
+    size before and after it.
+    """
+    usage = MarkupUsage(html)
+    savings = dict.fromkeys(OPTIMIZATION_STAGES, 0)
+
+    def optimize_block(match):
+        css, block_savings = optimize_css(match[2], usage)
+        for stage, saved in block_savings:
+            savings[stage] += saved
+        return match[1] + css + match[3]
+
+    size = byte_length(html)
+    html = STYLE_BLOCK_PATTERN.sub(optimize_block, html)
+    minified = minify_html(html)
+    savings['minify_html'] = byte_length(html) - byte_length(minified)
+
+    report = []
+    for stage in OPTIMIZATION_STAGES:
+        report.append({'stage': stage, 'bytes_before': size, 'bytes_after': size - savings[stage]})
+        size -= savings[stage]
+    return minified, report
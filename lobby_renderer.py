@@ -0,0 +1,1861 @@
+"""Streamlit-independent rendering of lobby HTML, CSS and export packages"""
+import json
+import hashlib
+import os
+import time
+import warnings
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from io import StringIO, TextIOWrapper
+
+import numpy as np
+import pandas as pd
+
+from lobby_compress import (
+    COMPRESSION_MANIFEST_FILE, COMPRESSION_WORKERS, compress_file, compression_encodings, is_compressible
+)
+from lobby_data import (
+    SESSION_SCHEMA, build_speaker_index, changed_row_keys, compute_event_stats, format_stats, hash_rows
+)
+from lobby_feed import STATUS_FEED_FILE, StatusFeed, status_feed_settings
+from lobby_images import (
+    IMAGE_ASSET_DIR, MASTHEAD_IMAGE_WIDTH, available_image_formats, image_asset_settings, image_set, image_srcset,
+    is_remote_image, process_images, resolve_image, source_signature
+)
+from lobby_offline import (
+    PRECACHE_MANIFEST_FILE, PRECACHE_REVISION_LENGTH, SERVICE_WORKER_FILE, precache_entry, service_worker_source
+)
+from lobby_optimize import minify_html, optimize_css, optimize_html
+from lobby_schedule import SCHEDULED_STATUS, build_schedule, schedule_errors, schedule_instant, schedule_settings
+from lobby_scripts import (
+    SEARCH_SCRIPT, SERVICE_WORKER_REGISTRATION_SCRIPT, STATUS_FEED_SCRIPT, THEME_SWITCHER_SCRIPT, VIRTUAL_GRID_SCRIPT
+)
+from lobby_search import (
+    SEARCH_INDEX_FILE, SEARCH_RESULT_LIMIT, SUGGESTION_INDEX_FILE, SUGGESTION_LIMIT, SUGGESTION_MIN_SIMILARITY,
+    build_search_index, build_suggestion_index
+)
+from lobby_site import (
+    ALL_SESSIONS_INFO, ALL_SESSIONS_SECTION, NAV_TAB_PAGES, SITE_SECTION_DIR, SITE_SESSION_DIR, SITE_SPEAKER_DIR, SITEMAP_FILE,
+    listing_page, page_count, page_url, pagination_html, sitemap_files, static_site_settings, unique_slugs
+)
+from lobby_styles import (
+    BASE_CSS, THEME_PRESETS, THEMED_CSS, critical_css, preset_variables, theme_block, theme_variables
+)
+
+# Per-status labels used when rendering session cards; unknown statuses render as ended
+SESSION_STATUS_CLASSES = {'live': 'live', 'upcoming': 'future', 'scheduled': 'future'}
+SESSION_STATUS_TEXTS = {'live': 'LIVE', 'upcoming': 'UPCOMING', 'scheduled': 'LATER'}
+SESSION_BUTTON_LABELS = {'live': 'Join', 'finished': 'Watch Recording'}
+
+# Characters escaped in card text fields; '&' must come first
+HTML_ESCAPES = [('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;')]
+
+# Stands in for a speaker's session cards in cached detail page bodies; escaped text can never contain a raw '<'
+SPEAKER_SESSIONS_PLACEHOLDER = '<lobby-speaker-sessions></lobby-speaker-sessions>'
+
+# Header texts used when the config has none; {name} placeholders are filled from the event statistics
+DEFAULT_HEADER_TEXTS = {
+    'live_indicator_text': '🔴 {live} sessions live now',
+    'bookmarks_text': '📚 7 bookmarked',
+    'user_info_text': 'Welcome, Alex Chen'
+}
+
+# Maximum number of cards rendered per lobby section before "View all" takes over
+DEFAULT_SECTION_LIMIT = 12
+
+# How card data reaches the page: all cards as static markup, or the first screen as markup plus the
+# full data as a JSON island inlined in index.html or shipped as a sidecar file
+OUTPUT_MODES = ['static', 'data_island', 'data_sidecar']
+
+# Package file holding the card data in data_sidecar mode
+DATA_SIDECAR_FILE = "lobby-data.json"
+
+# Session columns shipped in the data island, in the order the client-side renderer reads them
+ISLAND_SESSION_COLUMNS = ['time', 'title', 'speaker', 'company', 'description', 'status']
+ISLAND_SPEAKER_COLUMNS = ['name', 'title', 'company']
+
+# Session columns shipped with the search index to display and link hits
+SEARCH_DOC_COLUMNS = ['id', 'title', 'speaker', 'time']
+
+# How styles reach the page: inlined into index.html, or as one content-hashed stylesheet
+# linked from it with only the above-the-fold rules inlined
+STYLESHEET_MODES = ['inline', 'external']
+
+# Hex digits of the content hash in hashed asset names such as styles.<hash>.css
+ASSET_HASH_LENGTH = 12
+
+# Package file mapping each hashed asset's logical name to its file name, size and digest
+ASSET_MANIFEST_FILE = "asset-manifest.json"
+
+# The base stylesheet indented to sit inside the page's <style> element
+INLINE_BASE_CSS = '\n'.join(' ' * 8 + line for line in BASE_CSS.rstrip('\n').split('\n'))
+
+# Island columns with fewer distinct values than 1 / ISLAND_DICTIONARY_RATIO of their rows are dictionary-encoded
+ISLAND_DICTIONARY_RATIO = 2
+
+# Upper bound on fragments kept by the render cache before least-recently-used ones are evicted
+RENDER_CACHE_SIZE = 256
+
+# Characters written per chunk when streaming artifacts into an export archive
+ZIP_CHUNK_SIZE = 64 * 1024
+
+# Earliest time a ZIP entry can record; SOURCE_DATE_EPOCH values before it are clamped to it
+ZIP_EPOCH = datetime(1980, 1, 1)
+
+# Markup shared by every static site page: the head up to the header (a format string), the optional
+# canonical link, the markup between header and body, and the end of the page
+SITE_PAGE_SHELL = (
+    """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <base href="../">
+    <title>{title} - {logo_text}</title>
+    <meta name="description" content="{description}">{canonical}
+    <link rel="stylesheet" href="{stylesheet}">
+</head>
+<body>
+    """,
+    """
+    <link rel="canonical" href="{url}">""",
+    """
+
+    <!-- Content -->
+    <div class="content">""",
+    """
+    </div>
+</body>
+</html>"""
+)
+
+# CSS blocks emitted by generate_css, with the config paths each one depends on
+CSS_BLOCKS = [
+    ('theme', [
+        ('colors',), ('header',), ('masthead',), ('navigation',), ('layout',), ('content',),
+        ('session_card',), ('speaker_card',), ('quick_actions',)
+    ]),
+    ('presets', [('advanced', 'theme_switcher')]),
+    ('components', []),
+    ('images', [('advanced', 'image_assets'), ('masthead', 'background_type'), ('masthead', 'background_image')]),
+    ('site', [('advanced', 'static_site')]),
+    ('custom', [('advanced', 'custom_css')])
+]
+
+# CSS blocks that carry the theme; the rest of the stylesheet is the same for every theme
+THEME_CSS_BLOCKS = ['theme', 'presets']
+
+
+def select_config(config, paths):
+    """Return the config values found at each key path, in order"""
+    values = []
+    for path in paths:
+        value = config
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        values.append(value)
+    return values
+
+
+def fingerprint_config(value):
+    """Return a stable content hash of a JSON-serialisable config subtree"""
+    encoded = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def fingerprint_data(data, row_hashes=None):
+    """Return a cheap content hash of a DataFrame's columns and row values, from its row hashes if already known"""
+    if row_hashes is None:
+        row_hashes = hash_rows(data)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([str(column) for column in data.columns]).encode('utf-8'))
+    digest.update(row_hashes.tobytes())
+    return digest.hexdigest()
+
+
+def hashed_file_name(file_name, content):
+    """Return file_name with a hash of content before its extension, e.g. styles.3f2a9c41d0b7.css"""
+    stem, extension = os.path.splitext(file_name)
+    return f"{stem}.{hashlib.sha256(content.encode('utf-8')).hexdigest()[:ASSET_HASH_LENGTH]}{extension}"
+
+
+def escape_attribute(text):
+    """Return text escaped for use inside a double-quoted HTML attribute"""
+    for character, entity in HTML_ESCAPES + [('"', '&quot;')]:
+        text = text.replace(character, entity)
+    return text
+
+
+def encode_island_column(values):
+    """Return a column as a plain list, or as a value table plus codes when values repeat a lot"""
+    values = values.astype(str)
+    codes, uniques = pd.factorize(values)
+    if len(uniques) * ISLAND_DICTIONARY_RATIO >= len(values):
+        return values.tolist()
+    return {'values': uniques.tolist(), 'codes': codes.tolist()}
+
+
+class RenderCache:
+    """Bounded LRU cache of rendered fragments keyed by content fingerprints"""
+    
+    def __init__(self, max_entries=RENDER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+    def get_or_render(self, key, render):
+        """Return the cached fragment for key, rendering and storing it on a miss"""
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        
+        self.misses += 1
+        fragment = render()
+        self.entries[key] = fragment
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return fragment
+    
+    def get(self, key, default=None):
+        """Return the cached fragment for key without rendering or counting a miss"""
+        if key not in self.entries:
+            return default
+        self.entries.move_to_end(key)
+        return self.entries[key]
+    
+    def put(self, key, fragment):
+        """Store a fragment under key, replacing any earlier one"""
+        self.entries[key] = fragment
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop every cached fragment and reset the counters"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def stats(self):
+        """Return hit/miss counters and current occupancy"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.entries),
+            'max_entries': self.max_entries
+        }
+
+
+def package_timestamp():
+    """Return the package generation time, honouring SOURCE_DATE_EPOCH for reproducible builds
+
+    Without SOURCE_DATE_EPOCH the package is stamped with the current time,
+    in the README and on every archive entry, so two exports of the same
+    data only match byte for byte when it is set.
+    """
+    source_date_epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if source_date_epoch:
+        return max(datetime.fromtimestamp(int(source_date_epoch), tz=timezone.utc).replace(tzinfo=None), ZIP_EPOCH)
+    return datetime.now()
+
+
+def write_chunked(stream, text, chunk_size=ZIP_CHUNK_SIZE):
+    """Write text to stream in fixed-size pieces so it is encoded incrementally"""
+    for start in range(0, len(text), chunk_size):
+        stream.write(text[start:start + chunk_size])
+
+
+class LobbyRenderer:
+    """Render a lobby from a configuration and its session and speaker data"""
+    
+    def __init__(self, config, session_data, speaker_data, cache=None, speaker_index=None, timings=None, now=None,
+                 base_dir=None, session_hashes=None, speaker_hashes=None):
+        self.config = config
+        self.source_session_data = session_data
+        self.speaker_data = speaker_data
+        self.cache = cache if cache is not None else RenderCache()
+        # An up-to-date SpeakerSessionIndex may be supplied; otherwise one is built from session_data
+        self.speaker_index = speaker_index
+        # Optional StageTimings that records how long each generation stage takes
+        self.timings = timings
+        # Instant computed statuses are rendered for; defaults to the configured preview time or the clock
+        self.now = now
+        # Directory that relative image paths are resolved from; defaults to the working directory
+        self.base_dir = base_dir
+        # RowHashes kept up to date as the session and speaker data are edited; otherwise every row is hashed
+        self.session_hashes = session_hashes
+        self.speaker_hashes = speaker_hashes
+        self.schedule = None
+        self.schedule_key = None
+        # Problems with the schedule settings that kept statuses from being computed
+        self.schedule_errors = []
+        self._session_data = None
+        self._session_fingerprint = None
+        self._speaker_fingerprint = None
+        self._session_row_hashes = None
+        self._speaker_row_hashes = None
+        # Cards rendered afresh rather than reused from the previous render, by card kind
+        self.rows_rendered = {}
+
+    @property
+    def session_data(self):
+        """Session data as rendered, with statuses derived from session times when the schedule computes them"""
+        if self._session_data is None:
+            self._session_data = self.apply_schedule(self.source_session_data)
+        return self._session_data
+
+    def apply_schedule(self, session_data):
+        """Return session_data with each status computed from its time range at the render instant
+
+        Schedule settings that cannot be used keep the entered statuses,
+        with a warning; the problems are listed in schedule_errors.
+        """
+        settings = schedule_settings(self.config)
+        if settings['status_mode'] != 'computed' or 'time' not in session_data:
+            return session_data
+        self.schedule_errors = schedule_errors(settings)
+        if self.schedule_errors:
+            warnings.warn(
+                f"Keeping the entered session statuses: {'; '.join(self.schedule_errors)}", RuntimeWarning, stacklevel=2
+            )
+            return session_data
+        
+        with self.timed('apply_schedule'):
+            self.schedule_key = (
+                'schedule', fingerprint_data(session_data[['time']]), settings['event_date'], settings['timezone']
+            )
+            self.schedule = self.cache.get_or_render(self.schedule_key, lambda: build_schedule(session_data, settings))
+            statuses = self.schedule.statuses_at(
+                schedule_instant(settings, self.now),
+                timedelta(minutes=settings['upcoming_window_minutes']),
+                session_data['status'].astype(object)
+            )
+            return session_data.assign(
+                status=pd.Categorical(statuses, categories=SESSION_SCHEMA['allowed']['status'])
+            )
+
+    def session_row_hashes(self):
+        """Return the content hash of each session row as rendered, computed once per renderer"""
+        if self._session_row_hashes is None:
+            # Statuses computed from the schedule are not part of the source rows the kept hashes cover
+            if self.session_hashes is not None and self.session_data is self.source_session_data:
+                self._session_row_hashes = self.session_hashes.row_hashes(self.session_data)
+            else:
+                self._session_row_hashes = hash_rows(self.session_data)
+        return self._session_row_hashes
+
+    def speaker_row_hashes(self):
+        """Return the content hash of each speaker row, computed once per renderer"""
+        if self._speaker_row_hashes is None:
+            if self.speaker_hashes is not None:
+                self._speaker_row_hashes = self.speaker_hashes.row_hashes(self.speaker_data)
+            else:
+                self._speaker_row_hashes = hash_rows(self.speaker_data)
+        return self._speaker_row_hashes
+
+    def session_fingerprint(self):
+        """Return the fingerprint of the session data as rendered, computed once per renderer"""
+        if self._session_fingerprint is None:
+            fingerprint = fingerprint_data(self.session_data, self.session_row_hashes())
+            # Computed schedules also order sections by start time, which depends on the schedule settings
+            if self.schedule_key is not None:
+                fingerprint = fingerprint_config([fingerprint, list(self.schedule_key)])
+            self._session_fingerprint = fingerprint
+        return self._session_fingerprint
+
+    def speaker_fingerprint(self):
+        """Return the fingerprint of the speaker data, computed once per renderer"""
+        if self._speaker_fingerprint is None:
+            self._speaker_fingerprint = fingerprint_data(self.speaker_data, self.speaker_row_hashes())
+        return self._speaker_fingerprint
+
+    def event_stats(self):
+        """Return the event statistics, computed once per version of the session and speaker data"""
+        return self.cache.get_or_render(
+            ('event_stats', self.session_fingerprint(), self.speaker_fingerprint()),
+            lambda: compute_event_stats(self.session_data, self.speaker_data)
+        )
+
+    def header_texts(self):
+        """Return the header's live indicator, bookmarks and user texts with statistics filled in"""
+        stats = self.event_stats()
+        header = self.config['header']
+        return {name: format_stats(header.get(name, default), stats) for name, default in DEFAULT_HEADER_TEXTS.items()}
+
+    def masthead_stats(self):
+        """Return the masthead stats with statistics filled in; stats typed as plain numbers are kept as overrides"""
+        stats = self.event_stats()
+        return [
+            {**stat, 'number': format_stats(stat['number'], stats), 'label': format_stats(stat['label'], stats)}
+            for stat in self.config['masthead']['custom_stats']
+        ]
+
+    def timed(self, stage):
+        """Return a context manager timing stage when timings are being collected"""
+        return self.timings.time(stage) if self.timings is not None else nullcontext()
+
+    def generate_css(self, block_names=None):
+        """Generate CSS from configuration, reusing cached blocks whose config is unchanged
+
+        block_names limits the output to those CSS_BLOCKS, in their usual order.
+        """
+        config = self.config
+        cache = self.cache
+        
+        blocks = []
+        with self.timed('generate_css'):
+            for block_name, config_paths in CSS_BLOCKS:
+                if block_names is not None and block_name not in block_names:
+                    continue
+                key = ('css', block_name, fingerprint_config(select_config(config, config_paths)))
+                if block_name == 'images':
+                    # Processed image names follow the images' content, which the config alone does not capture
+                    key += (self.image_fingerprint(),)
+                render_block = getattr(self, f"generate_{block_name}_css")
+                blocks.append(cache.get_or_render(key, lambda: render_block(config)))
+        
+        return "\n" + "\n".join(block for block in blocks if block)
+
+    def stylesheet_mode(self):
+        """Return the configured stylesheet mode, falling back to inline styles"""
+        mode = self.config.get('advanced', {}).get('stylesheet_mode', 'inline')
+        return mode if mode in STYLESHEET_MODES else 'inline'
+
+    def generate_stylesheet(self):
+        """Return the theme-independent stylesheet: component and custom rules followed by the base rules
+
+        The theme's variable blocks are inlined into the page instead, so
+        switching themes leaves the hashed file, and browser caches, intact.
+        """
+        block_names = [block_name for block_name, _ in CSS_BLOCKS if block_name not in THEME_CSS_BLOCKS]
+        stylesheet = self.generate_css(block_names) + "\n\n" + BASE_CSS
+        if self.optimization_enabled():
+            # Rules are merged and minified but not pruned: the file's name must not depend on the page's markup
+            stylesheet = self.cache.get_or_render(
+                ('optimized_stylesheet', hashlib.sha256(stylesheet.encode('utf-8')).hexdigest()),
+                lambda: optimize_css(stylesheet)[0]
+            )
+        return stylesheet
+
+    def hashed_stylesheet(self):
+        """Return the content-hashed file name and text of the complete stylesheet"""
+        stylesheet = self.generate_stylesheet()
+        return hashed_file_name("styles.css", stylesheet), stylesheet
+
+    def asset_manifest_enabled(self):
+        """Return whether the package has hashed assets to list in the asset manifest"""
+        return self.stylesheet_mode() == 'external' or self.image_assets_enabled() or self.static_site_enabled()
+
+    def asset_manifest(self):
+        """Return each hashed asset's logical name mapped to its file name, size and SHA-256 digest
+
+        That is the external stylesheet, the static site's stylesheet and
+        every processed image, which is already named by its own content.
+        """
+        manifest = {}
+        stylesheets = []
+        if self.stylesheet_mode() == 'external':
+            stylesheets.append(("styles.css", *self.hashed_stylesheet()))
+        if self.static_site_enabled():
+            stylesheets.append(("site.css", *self.site_stylesheet()))
+        for logical_name, stylesheet_name, stylesheet in stylesheets:
+            data = stylesheet.encode('utf-8')
+            manifest[logical_name] = {'file': stylesheet_name, 'bytes': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+        for file_name, data in self.package_assets():
+            manifest[file_name] = {'file': file_name, 'bytes': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+        return manifest
+
+    def generate_theme_css(self, config):
+        """Generate the :root block holding every themeable value as a custom property"""
+        return "/* Generated Event Lobby Styles */\n" + theme_block(':root', theme_variables(config))
+
+    def generate_presets_css(self, config):
+        """Generate one variable block per preset theme, applied by setting data-theme on the page root"""
+        if not config['advanced'].get('theme_switcher'):
+            return ""
+        return "/* Theme Presets */\n" + "\n".join(
+            theme_block(f':root[data-theme="{name}"]', preset_variables(palette)) for name, palette in THEME_PRESETS.items()
+        ) + """
+.theme-switcher {
+  background: transparent;
+  color: inherit;
+  border: 1px solid currentColor;
+  border-radius: 6px;
+  padding: 4px 8px;
+  font: inherit;
+}
+"""
+
+    def generate_theme_switcher_html(self):
+        """Return the header's preset theme picker and its script, or nothing when the switcher is off"""
+        if not self.config['advanced'].get('theme_switcher'):
+            return ''
+        
+        options = ''.join(f'<option value="{name}">{name.title()}</option>' for name in THEME_PRESETS)
+        return f"""
+            <select class="theme-switcher" aria-label="Theme"><option value="">Event Theme</option>{options}</select>
+            <script>{THEME_SWITCHER_SCRIPT}</script>"""
+
+    def generate_header_html(self, header_texts, active_page='index.html'):
+        """Return the page header and navigation tabs
+
+        With the static site on, tabs that have a site page link to it, and
+        the tab for active_page is highlighted; otherwise the first tab is.
+        """
+        config = self.config
+        tabs = config['navigation']['tabs']
+        if self.static_site_enabled():
+            active = next((i for i, tab in enumerate(tabs) if NAV_TAB_PAGES.get(tab) == active_page), None)
+            tabs_html = ''.join(
+                f'<a class="nav-tab {"active" if i == active else ""}" href="{NAV_TAB_PAGES[tab]}">{tab}</a>' if tab in NAV_TAB_PAGES
+                else f'<div class="nav-tab {"active" if i == active else ""}">{tab}</div>'
+                for i, tab in enumerate(tabs)
+            )
+        else:
+            tabs_html = ''.join([f'<div class="nav-tab {"active" if i == 0 else ""}">{tab}</div>' for i, tab in enumerate(tabs)])
+        
+        return f"""<!-- Header -->
+    <div class="header">
+        <div class="logo">{config['header']['logo_text']}</div>
+        <div class="header-info">
+            {(f"<div>{header_texts['live_indicator_text']}</div>" if config['header']['show_live_indicator'] else '')}
+            {(f"<div>{header_texts['bookmarks_text']}</div>" if config['header']['show_bookmarks'] else '')}
+            {(f"<div>{header_texts['user_info_text']}</div>" if config['header']['show_user_info'] else '')}{self.generate_theme_switcher_html()}
+        </div>
+    </div>
+
+    <!-- Navigation -->
+    <div class="nav-tabs">
+        {tabs_html}
+    </div>"""
+
+    def generate_components_css(self, config):
+        """Generate the component rules, which read only custom properties and so never change with the config"""
+        return THEMED_CSS
+
+    def generate_images_css(self, config):
+        """Generate the rules for speaker photos, and the masthead background when it is a processed image"""
+        if not self.image_assets_enabled():
+            return ""
+        
+        css = """/* Image Assets */
+.speaker-avatar img {
+  width: 100%;
+  height: 100%;
+  border-radius: 50%;
+  object-fit: cover;
+}
+"""
+        masthead = self.image_assets()['masthead']
+        if masthead:
+            css += theme_block(':root', [('--masthead-bg', f"{image_set(masthead)} center / cover no-repeat")])
+        return css
+
+    def generate_site_css(self, config):
+        """Generate the rules for detail links, breadcrumbs and pagers, or nothing when the static site is off"""
+        if not self.static_site_enabled():
+            return ""
+        return """/* Static Site */
+a.nav-tab,
+.session-title a,
+.speaker-name a {
+  color: inherit;
+  text-decoration: none;
+}
+
+.session-title a:hover,
+.speaker-name a:hover {
+  text-decoration: underline;
+}
+
+.breadcrumbs {
+  display: flex;
+  gap: 8px;
+  margin-bottom: 20px;
+  font-size: 14px;
+  color: #6b7280;
+}
+
+.breadcrumbs a,
+.session-speakers a,
+.pagination a {
+  color: var(--primary-color);
+  text-decoration: none;
+}
+
+.page-count,
+.session-meta {
+  font-size: 14px;
+  color: #6b7280;
+}
+
+.session-detail,
+.speaker-detail {
+  margin-bottom: var(--section-spacing);
+}
+
+.speaker-bio {
+  max-width: 720px;
+  margin: 15px auto 0;
+  line-height: 1.6;
+}
+
+.pagination {
+  display: flex;
+  flex-wrap: wrap;
+  justify-content: center;
+  gap: 8px;
+  margin-top: 30px;
+}
+
+.pagination a,
+.pagination span {
+  padding: 8px 14px;
+  border-radius: 8px;
+  font-weight: 600;
+}
+
+.pagination .current {
+  background: var(--primary-color);
+  color: #ffffff;
+}
+"""
+
+    def generate_custom_css(self, config):
+        """Generate the user-supplied custom CSS CSS block"""
+        return f"""/* Custom CSS */
+{config['advanced']['custom_css']}
+"""
+
+    def generate_html(self, optimize=True):
+        """Generate complete HTML file
+
+        With output optimization on, the page is pruned and minified unless
+        optimize is False.
+        """
+        config = self.config
+        css = self.generate_css()
+        
+        with self.timed('fingerprint_data'):
+            session_fingerprint = self.session_fingerprint()
+            speaker_fingerprint = self.speaker_fingerprint()
+        status_feed = self.status_feed_enabled()
+        with self.timed('event_stats'):
+            header_texts = self.header_texts()
+            masthead_stats = self.masthead_stats()
+        
+        # Generate card HTML column-wise, one string per row
+        with self.timed('render_session_cards'):
+            # Search results scroll to the card of the session they name
+            session_cards = self.session_cards(status_feed, config['quick_actions']['show_search'])
+        with self.timed('render_speaker_cards'):
+            speaker_cards = self.speaker_cards()
+        with self.timed('generate_sections_html'):
+            sections_html = self.generate_sections_html(
+                session_cards, speaker_cards, session_fingerprint, speaker_fingerprint
+            )
+        with self.timed('generate_data_island'):
+            data_island = self.generate_data_island_html(session_fingerprint, speaker_fingerprint)
+        search_attributes = (
+            f' data-suggest-index="{SUGGESTION_INDEX_FILE}" data-suggest-limit="{SUGGESTION_LIMIT}"'
+            f' data-suggest-min-similarity="{SUGGESTION_MIN_SIMILARITY}"'
+            if self.suggestions_enabled() else ''
+        )
+        if self.static_site_enabled():
+            search_attributes += f' data-session-pages="{SITE_SESSION_DIR}/"'
+        search_script = f"""
+    <script>{SEARCH_SCRIPT}</script>""" if config['quick_actions']['show_search'] else ''
+        status_feed_script = self.generate_status_feed_html()
+        service_worker_script = f"""
+    <script data-service-worker="{SERVICE_WORKER_FILE}">{SERVICE_WORKER_REGISTRATION_SCRIPT}</script>""" if self.service_worker_enabled() else ''
+        
+        if self.stylesheet_mode() == 'external':
+            stylesheet_name, stylesheet = self.hashed_stylesheet()
+            # The full stylesheet loads without blocking rendering; the inlined rules cover the first screen
+            style_html = f"""<style>
+{self.generate_css(THEME_CSS_BLOCKS)}
+{self.cache.get_or_render(('critical_css', stylesheet_name), lambda: critical_css(stylesheet))}
+    </style>
+    <link rel="stylesheet" href="{stylesheet_name}" media="print" onload="this.media='all'">
+    <noscript><link rel="stylesheet" href="{stylesheet_name}"></noscript>"""
+        else:
+            style_html = f"""<style>
+        {css}
+        
+{INLINE_BASE_CSS}
+    </style>"""
+        
+        html = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{config['header']['logo_text']}</title>
+    <meta name="description" content="{config['advanced']['meta_tags']['description']}">
+    <meta name="keywords" content="{config['advanced']['meta_tags']['keywords']}">
+    <meta name="author" content="{config['advanced']['meta_tags']['author']}">
+    
+    <!-- Social Sharing -->
+    <meta property="og:title" content="{config['advanced']['social_sharing']['title']}">
+    <meta property="og:description" content="{config['advanced']['social_sharing']['description']}">
+    <meta property="og:type" content="website">
+    
+    {style_html}
+    
+    {config['advanced']['analytics_code']}
+</head>
+<body>
+    {self.generate_header_html(header_texts)}
+
+    <!-- Masthead -->
+    <div class="masthead">
+        <div class="masthead-content">
+            <h1>{config['masthead']['title_text']}</h1>
+            <p>{config['masthead']['subtitle_text']}</p>
+            {(f"""
+            <div class="event-stats">
+                {(''.join([f'<div class="stat"><span class="stat-number">{stat["number"]}</span><span class="stat-label">{stat["label"]}</span></div>' for stat in masthead_stats]))}
+            </div>
+            """ if config['masthead']['show_stats'] else '')}
+        </div>
+    </div>
+
+    <!-- Content -->
+    <div class="content">
+        <!-- Quick Actions -->
+        {(f"""
+        <div class="quick-actions">
+            {('<div class="search-container"><input type="text" class="search-input" placeholder="' + config['quick_actions']['search_placeholder'] + f'" autocomplete="off" data-search-index="{SEARCH_INDEX_FILE}" data-result-limit="{SEARCH_RESULT_LIMIT}"{search_attributes}><span class="search-icon">🔍</span><div class="search-results" hidden></div></div>' if config['quick_actions']['show_search'] else '')}
+            {('<button class="filter-btn active">All Sessions</button><button class="filter-btn">Live Now</button><button class="filter-btn">Upcoming</button>' if config['quick_actions']['show_filters'] else '')}
+            {('<button class="filter-btn">📅 Download Schedule</button>' if config['quick_actions']['show_actions'] else '')}
+        </div>
+        """ if any([config['quick_actions']['show_search'], config['quick_actions']['show_filters'], config['quick_actions']['show_actions']]) else '')}
+
+        <!-- Sections -->
+        {sections_html}
+    </div>{data_island}{search_script}{status_feed_script}{service_worker_script}
+</body>
+</html>"""
+        
+        if optimize and self.optimization_enabled():
+            html = self.optimized_html(html)[0]
+        return html
+
+    def optimization_enabled(self):
+        """Return whether generated pages are pruned of unused CSS and minified"""
+        return bool(self.config.get('advanced', {}).get('optimize_output', False))
+
+    def optimized_html(self, html):
+        """Return the optimized page and its per-stage size report, reused while the page is unchanged"""
+        with self.timed('optimize_output'):
+            return self.cache.get_or_render(
+                ('optimized_html', hashlib.sha256(html.encode('utf-8')).hexdigest()),
+                lambda: optimize_html(html)
+            )
+
+    def optimization_report(self):
+        """Return the page size before and after each optimization stage"""
+        return self.optimized_html(self.generate_html(optimize=False))[1]
+
+    def escape_column(self, data, column):
+        """Return the column as a list of HTML-escaped strings"""
+        # Columns repeat values (companies, tracks, times), so each distinct value is escaped once
+        codes, uniques = pd.factorize(data[column].astype(str))
+        escaped = []
+        for value in uniques.tolist():
+            for character, entity in HTML_ESCAPES:
+                value = value.replace(character, entity)
+            escaped.append(value)
+        return [escaped[code] for code in codes.tolist()]
+
+    def render_session_cards(self, session_data, status_attributes=False, links=None, id_attributes=False):
+        """Render one session card per row, computing per-row fields as whole columns
+
+        With status_attributes, each card carries its session id and status
+        so the live status feed script can find and update it. links
+        optionally holds each row's detail page, which its title links to.
+        With id_attributes, each card carries its session id, which search
+        results scroll to.
+        """
+        status = session_data['status'].astype(str)
+        status_classes = status.map(SESSION_STATUS_CLASSES).fillna('finished').tolist()
+        status_texts = status.map(SESSION_STATUS_TEXTS).fillna('ENDED').tolist()
+        button_labels = status.map(SESSION_BUTTON_LABELS).fillna('View Details').tolist()
+        
+        if 'featured' in session_data:
+            featured = session_data['featured'].fillna(False).astype(bool)
+        else:
+            featured = pd.Series(False, index=session_data.index)
+        featured_classes = featured.map({True: 'featured', False: ''}).tolist()
+        featured_badges = featured.map({True: '<div class="featured-badge">Featured</div>', False: ''}).tolist()
+        if status_attributes:
+            card_attributes = (
+                ' data-session-id="' + session_data['id'].astype(str) + '" data-status="' + status + '"'
+            ).tolist()
+        elif id_attributes:
+            card_attributes = (' data-session-id="' + session_data['id'].astype(str) + '"').tolist()
+        else:
+            card_attributes = [''] * len(session_data)
+        titles = self.escape_column(session_data, 'title')
+        if links is not None:
+            titles = [f'<a href="{link}">{title}</a>' for link, title in zip(links, titles)]
+        
+        return [
+            f"""
+            <div class="session-card {featured_class}"{card_attribute}>
+                {featured_badge}
+                <div class="session-status status-{status_class}">{status_text}</div>
+                <div class="session-time">{time}</div>
+                <h3 class="session-title">{title}</h3>
+                <div class="session-speakers">👤 {speaker}, {company}</div>
+                <div class="session-description">{description}</div>
+                <div class="session-actions">
+                    <button class="btn-primary">
+                        {button_label}
+                    </button>
+                    <button class="bookmark-btn">🤍</button>
+                </div>
+            </div>
+            """
+            for featured_class, card_attribute, featured_badge, status_class, status_text, time, title, speaker, company, description, button_label
+            in zip(
+                featured_classes, card_attributes, featured_badges, status_classes, status_texts,
+                self.escape_column(session_data, 'time'),
+                titles,
+                self.escape_column(session_data, 'speaker'),
+                self.escape_column(session_data, 'company'),
+                self.escape_column(session_data, 'description'),
+                button_labels
+            )
+        ]
+
+    def render_rows(self, key, row_keys, render):
+        """Return one card per row, rendering only rows whose content has no card from the previous render
+
+        row_keys identify what each row's card is rendered from. The cards of
+        the last render are kept under key by row key, so after an edit only
+        changed and added rows are rendered; render(positions) renders those.
+        """
+        previous = self.cache.get(key, {})
+        missing = [position for position, row_key in enumerate(row_keys) if row_key not in previous]
+        rendered = dict(zip((row_keys[position] for position in missing), render(missing))) if missing else {}
+        cards = [previous[row_key] if row_key in previous else rendered[row_key] for row_key in row_keys]
+        self.cache.put(key, dict(zip(row_keys, cards)))
+        self.rows_rendered[key[0]] = len(missing)
+        return cards
+
+    def session_cards(self, status_attributes=False, id_attributes=False):
+        """Return every session's card, reused while the session data is unchanged
+
+        After a change, only the cards of changed and added rows are rendered.
+        """
+        def render():
+            links = self.session_pages()
+            row_keys = self.session_row_hashes().tolist()
+            if links is not None:
+                row_keys = list(zip(row_keys, links))
+            return self.render_rows(
+                ('session_cards', status_attributes, id_attributes, links is not None), row_keys,
+                lambda positions: self.render_session_cards(
+                    self.session_data.iloc[positions], status_attributes,
+                    None if links is None else [links[position] for position in positions], id_attributes
+                )
+            )
+
+        return self.cache.get_or_render(
+            ('session_cards', self.session_fingerprint(), status_attributes, id_attributes, self.static_site_enabled()),
+            render
+        )
+
+    def speaker_cards(self):
+        """Return every speaker's card, reused while the speaker and session data are unchanged
+
+        After a change, only the cards of speakers whose row, session count,
+        photo or page changed are rendered.
+        """
+        session_fingerprint = self.session_fingerprint()
+        show_session_count = self.config['speaker_card']['show_session_count']
+
+        def render():
+            session_counts = self.speaker_session_counts(session_fingerprint)
+            avatars = self.speaker_avatars()
+            links = self.speaker_pages()
+            columns = [self.speaker_row_hashes().tolist(), session_counts.tolist()]
+            columns += [values for values in (avatars, links) if values is not None]
+            return self.render_rows(
+                ('speaker_cards', show_session_count, avatars is not None, links is not None), list(zip(*columns)),
+                lambda positions: self.render_speaker_cards(
+                    self.speaker_data.iloc[positions], session_counts.iloc[positions], show_session_count,
+                    None if avatars is None else [avatars[position] for position in positions],
+                    None if links is None else [links[position] for position in positions]
+                )
+            )
+
+        return self.cache.get_or_render(
+            (
+                'speaker_cards', self.speaker_fingerprint(), session_fingerprint, show_session_count,
+                self.image_fingerprint(), self.static_site_enabled()
+            ),
+            render
+        )
+
+    def speaker_session_counts(self, session_fingerprint):
+        """Return each speaker's session count, joined from the session data by speaker name"""
+        if self.speaker_index is None:
+            self.speaker_index = self.cached_speaker_index(session_fingerprint)
+        return self.speaker_index.session_counts(self.speaker_data['name'])
+
+    def cached_speaker_index(self, session_fingerprint):
+        """Return the speaker-session index of the session data, syncing the cached one by the rows that changed
+
+        One index is kept across versions of the session data with the row
+        hash of each session id it was synced to, so a new version touches
+        only the ids whose rows were added, removed or changed. It is built
+        afresh on first use, or when session ids are missing or repeated.
+        """
+        cached = self.cache.get(('speaker_index',))
+        if cached is not None and cached['fingerprint'] == session_fingerprint:
+            return cached['index']
+
+        ids = pd.Index(self.session_data['id'])
+        row_hashes = pd.Series(self.session_row_hashes(), index=ids) if ids.is_unique and not ids.hasnans else None
+        if cached is None or cached['row_hashes'] is None or row_hashes is None:
+            index = build_speaker_index(self.session_data)
+        else:
+            index = cached['index']
+            index.sync(self.session_data, changed_row_keys(cached['row_hashes'], row_hashes))
+        self.cache.put(('speaker_index',), {'fingerprint': session_fingerprint, 'row_hashes': row_hashes, 'index': index})
+        return index
+
+    def render_speaker_cards(self, speaker_data, session_counts, show_session_count, avatars=None, links=None):
+        """Render one speaker card per row, computing per-row fields as whole columns
+
+        avatars optionally holds each row's photo markup; rows without one show the speaker's initial.
+        links optionally holds each row's detail page, which its name links to.
+        """
+        initials = self.escape_column(
+            pd.DataFrame({'initial': speaker_data['name'].astype(str).str[0].str.upper()}),
+            'initial'
+        )
+        if avatars is not None:
+            initials = [avatar or initial for avatar, initial in zip(avatars, initials)]
+        
+        if show_session_count:
+            session_counts = [
+                f'<div class="speaker-sessions">{count} sessions</div>'
+                for count in session_counts.tolist()
+            ]
+        else:
+            session_counts = [''] * len(speaker_data)
+        names = self.escape_column(speaker_data, 'name')
+        if links is not None:
+            names = [f'<a href="{link}">{name}</a>' for link, name in zip(links, names)]
+        
+        return [
+            f"""
+            <div class="speaker-card">
+                <div class="speaker-avatar">{initial}</div>
+                <div class="speaker-name">{name}</div>
+                <div class="speaker-title">{title}, {company}</div>
+                {session_count}
+            </div>
+            """
+            for initial, name, title, company, session_count
+            in zip(
+                initials,
+                names,
+                self.escape_column(speaker_data, 'title'),
+                self.escape_column(speaker_data, 'company'),
+                session_counts
+            )
+        ]
+
+    def build_session_index(self, session_data):
+        """Partition session row positions by status and featured flag
+
+        Sessions computed as scheduled belong to no status section, and any
+        other unknown status renders as ended, so it belongs with finished.
+        With a computed schedule, upcoming sessions are listed by start time.
+        """
+        status = session_data['status'].astype(str).to_numpy()
+        if 'featured' in session_data:
+            featured = session_data['featured'].fillna(False).astype(bool).to_numpy()
+        else:
+            featured = np.zeros(len(session_data), dtype=bool)
+        
+        upcoming = np.flatnonzero(status == 'upcoming')
+        if self.schedule is not None:
+            upcoming = upcoming[np.argsort(self.schedule.starts[upcoming], kind='stable')]
+        
+        return {
+            'live': np.flatnonzero(status == 'live').tolist(),
+            'upcoming': upcoming.tolist(),
+            'featured': np.flatnonzero(featured).tolist(),
+            'finished': np.flatnonzero(~np.isin(status, ['live', 'upcoming', SCHEDULED_STATUS])).tolist()
+        }
+
+    def generate_sections_html(self, session_cards, speaker_cards, session_fingerprint, speaker_fingerprint):
+        """Generate HTML for all sections based on configuration"""
+        config = self.config
+        cache = self.cache
+        section_limits = config['layout'].get('section_limits', {})
+        session_index = cache.get_or_render(
+            ('session_index', session_fingerprint),
+            lambda: self.build_session_index(self.session_data)
+        )
+        # Sections marked with their id can be expanded client-side from the data island
+        expandable = self.output_mode() != 'static'
+        # The live status feed moves cards between sections and keeps their totals current
+        status_feed = self.status_feed_enabled()
+        # With the static site on, "View all" leads to the section's listing pages
+        site = self.static_site_enabled()
+        sections_html = ""
+        
+        for section_id in config['layout']['section_order']:
+            if not config['layout']['section_visibility'][section_id]:
+                continue
+                
+            section_info = config['content']['sections'][section_id]
+            limit = section_limits.get(section_id, DEFAULT_SECTION_LIMIT)
+            if section_id == 'speakers':
+                cards_key = (
+                    speaker_fingerprint, session_fingerprint, config['speaker_card']['show_session_count'],
+                    self.image_fingerprint()
+                )
+            else:
+                cards_key = (session_fingerprint,)
+            key = ('section', section_id, fingerprint_config(section_info), limit, expandable, status_feed, site) + cards_key
+            
+            sections_html += cache.get_or_render(
+                key,
+                lambda: self.render_section(
+                    section_id, section_info, limit, session_cards, speaker_cards, session_index, expandable, status_feed,
+                    listing_page(section_id) if site else '#'
+                )
+            )
+        
+        return sections_html
+
+    def render_section(self, section_id, section_info, limit, session_cards, speaker_cards, session_index,
+                       expandable=False, status_feed=False, view_all_href='#'):
+        """Render one section wrapper around its capped share of the cards"""
+        if section_id == 'speakers':
+            grid_class = 'speakers-grid'
+            cards = speaker_cards[:limit]
+            total = len(speaker_cards)
+        else:
+            grid_class = 'sessions-grid'
+            partition = session_index.get(section_id, [])
+            cards = [session_cards[position] for position in partition[:limit]]
+            total = len(partition)
+        
+        view_all_text = f"View all {total} →" if total > limit else "View all →"
+        section_attributes = f' data-section="{section_id}"' if expandable or status_feed else ''
+        if status_feed:
+            section_attributes += f' data-total="{total}" data-limit="{limit}"'
+        
+        return f"""
+                <div class="section"{section_attributes}>
+                    <div class="section-header">
+                        <div>
+                            <h2 class="section-title">{section_info['title']}</h2>
+                            <p class="section-subtitle">{section_info['subtitle']}</p>
+                        </div>
+                        <a href="{view_all_href}" class="view-all">{view_all_text}</a>
+                    </div>
+                    <div class="{grid_class}">
+                        {''.join(cards)}
+                    </div>
+                </div>
+                """
+
+    def output_mode(self):
+        """Return the configured output mode, falling back to static markup"""
+        mode = self.config.get('advanced', {}).get('output_mode', 'static')
+        return mode if mode in OUTPUT_MODES else 'static'
+
+    def generate_data_island(self, session_fingerprint, speaker_fingerprint):
+        """Return every session and speaker as compact column-oriented JSON, with section memberships
+
+        Text is shipped raw and escaped by the client-side renderer, and each
+        column is a single array so field names are not repeated per row.
+        """
+        session_data = self.session_data
+        speaker_data = self.speaker_data
+        session_index = self.cache.get_or_render(
+            ('session_index', session_fingerprint),
+            lambda: self.build_session_index(session_data)
+        )
+        featured = session_data['featured'].fillna(False).astype(bool) if 'featured' in session_data else None
+        
+        sessions = {
+            column: encode_island_column(session_data[column] if column in session_data else pd.Series([''] * len(session_data)))
+            for column in ISLAND_SESSION_COLUMNS
+        }
+        sessions['featured'] = featured.astype(int).tolist() if featured is not None else [0] * len(session_data)
+        # Session ids let the grid script apply live status feed updates to the data and link detail pages
+        if self.status_feed_enabled() or self.static_site_enabled():
+            sessions['id'] = session_data['id'].astype(str).tolist()
+        speakers = {
+            column: encode_island_column(speaker_data[column] if column in speaker_data else pd.Series([''] * len(speaker_data)))
+            for column in ISLAND_SPEAKER_COLUMNS
+        }
+        speakers['sessions'] = self.speaker_session_counts(session_fingerprint).fillna(0).astype(int).tolist()
+        # Photo markup lets the grid script render speaker cards exactly as the server does
+        avatars = self.speaker_avatars()
+        if avatars is not None:
+            speakers['avatar'] = encode_island_column(pd.Series(avatars, dtype=object))
+        speaker_pages = self.speaker_pages()
+        if speaker_pages is not None:
+            speakers['page'] = speaker_pages
+        
+        return json.dumps({
+            'sessions': sessions,
+            'speakers': speakers,
+            'sections': session_index,
+            'labels': {
+                'statusClasses': SESSION_STATUS_CLASSES,
+                'statusTexts': SESSION_STATUS_TEXTS,
+                'buttonLabels': SESSION_BUTTON_LABELS
+            }
+        }, ensure_ascii=False, separators=(',', ':'))
+
+    def cached_data_island(self, session_fingerprint, speaker_fingerprint):
+        """Return the data island JSON, reusing it while session and speaker data are unchanged"""
+        return self.cache.get_or_render(
+            (
+                'data_island', session_fingerprint, speaker_fingerprint, self.status_feed_enabled(), self.image_fingerprint(),
+                self.static_site_enabled()
+            ),
+            lambda: self.generate_data_island(session_fingerprint, speaker_fingerprint)
+        )
+
+    def generate_data_island_html(self, session_fingerprint, speaker_fingerprint):
+        """Return the data island and virtualized grid script for the page, or nothing in static mode"""
+        mode = self.output_mode()
+        if mode == 'static':
+            return ''
+        
+        show_session_count = 'true' if self.config['speaker_card']['show_session_count'] else 'false'
+        attributes = f'id="lobby-data" type="application/json" data-show-session-count="{show_session_count}"'
+        if self.static_site_enabled():
+            attributes += f' data-session-pages="{SITE_SESSION_DIR}/"'
+        if mode == 'data_sidecar':
+            island = f'<script {attributes} data-src="{DATA_SIDECAR_FILE}"></script>'
+        else:
+            # '<' is escaped so no text in the data can close the script element early
+            island_json = self.cached_data_island(session_fingerprint, speaker_fingerprint).replace('<', '\\u003c')
+            island = f'<script {attributes}>{island_json}</script>'
+        
+        return f"""
+    {island}
+    <script>{VIRTUAL_GRID_SCRIPT}</script>"""
+
+    def status_feed_enabled(self):
+        """Return whether the page polls a live status feed"""
+        return bool(status_feed_settings(self.config)['enabled'])
+
+    def generate_status_feed_html(self):
+        """Return the status feed polling script for the page, or nothing when the feed is off"""
+        if not self.status_feed_enabled():
+            return ''
+        
+        settings = status_feed_settings(self.config)
+        labels = json.dumps({
+            'statusClasses': SESSION_STATUS_CLASSES,
+            'statusTexts': SESSION_STATUS_TEXTS,
+            'buttonLabels': SESSION_BUTTON_LABELS
+        })
+        url = settings['url'] or STATUS_FEED_FILE
+        for character, entity in HTML_ESCAPES + [('"', '&quot;')]:
+            url = url.replace(character, entity)
+        return f"""
+    <script data-status-feed="{url}" data-poll-seconds="{settings['poll_seconds']}" data-status-labels='{labels}'>{STATUS_FEED_SCRIPT}</script>"""
+
+    def write_status_feed(self, stream):
+        """Stream the baseline status feed (version 0, no changes) into a text stream"""
+        stream.write(StatusFeed(self.session_data).to_json())
+
+    def image_assets_enabled(self):
+        """Return whether local images are processed into the package (which needs Pillow)"""
+        return bool(image_asset_settings(self.config)['enabled']) and bool(available_image_formats())
+
+    def image_assets(self):
+        """Return the processed speaker photos and masthead background
+
+        The result maps each photo reference to its variants ('photos'),
+        holds the masthead's variants or None ('masthead'), the package files
+        ('files'), a fingerprint of those files and a processing report. It
+        is reused until a setting or a source file changes.
+        """
+        settings = image_asset_settings(self.config)
+        source_dir = os.path.join(self.base_dir or os.getcwd(), settings['source_dir'])
+        avatar_size = int(self.config['speaker_card']['avatar_size'])
+        
+        references = []
+        if 'photo' in self.speaker_data:
+            references = [reference for reference in self.speaker_data['photo'].dropna().astype(str).unique() if reference.strip()]
+        photo_paths = {reference: resolve_image(reference, source_dir) for reference in references}
+        photo_paths = {reference: path for reference, path in photo_paths.items() if path}
+        masthead = self.config['masthead']
+        masthead_path = resolve_image(masthead['background_image'], source_dir) if masthead['background_type'] == 'image' else None
+        
+        signatures = {path: source_signature(path) for path in set(photo_paths.values()) | {masthead_path} - {None}}
+        key = ('image_assets', fingerprint_config([
+            settings, avatar_size, sorted((reference, signatures[path]) for reference, path in photo_paths.items()),
+            signatures.get(masthead_path)
+        ]))
+        
+        def build():
+            requests = [(path, avatar_size, avatar_size) for path in photo_paths.values()]
+            if masthead_path:
+                requests.append((masthead_path, MASTHEAD_IMAGE_WIDTH, None))
+            results = process_images(requests, settings)
+            photos = {reference: results[(path, avatar_size, avatar_size)] for reference, path in photo_paths.items()}
+            masthead_variants = results[(masthead_path, MASTHEAD_IMAGE_WIDTH, None)] if masthead_path else None
+            
+            files = {}
+            for variants in results.values():
+                for file_name, _, _, _, data, _ in variants or ():
+                    files[file_name] = data
+            variants = [variant for variants in results.values() for variant in variants or ()]
+            return {
+                'photos': {reference: variants for reference, variants in photos.items() if variants},
+                'masthead': masthead_variants,
+                'files': sorted(files.items()),
+                'fingerprint': fingerprint_config(sorted(files)),
+                'report': {
+                    'images': sum(1 for variants in results.values() if variants),
+                    'unreadable': sum(1 for variants in results.values() if not variants),
+                    'missing': sum(1 for reference in references if reference not in photo_paths and not is_remote_image(reference)),
+                    'files': len(files),
+                    'bytes': sum(len(data) for data in files.values()),
+                    'cached': sum(1 for variant in variants if variant[5])
+                }
+            }
+        
+        with self.timed('image_assets'):
+            return self.cache.get_or_render(key, build)
+
+    def image_fingerprint(self):
+        """Return a fingerprint of the processed image files, or None when images are not processed"""
+        return self.image_assets()['fingerprint'] if self.image_assets_enabled() else None
+
+    def speaker_avatars(self):
+        """Return each speaker's photo markup ('' for none), or None when images are not processed
+
+        Processed photos get a 1x/2x srcset; remote photo URLs are linked as
+        they are. Both load lazily, since speakers sit below the fold.
+        """
+        if not self.image_assets_enabled() or 'photo' not in self.speaker_data:
+            return None
+        
+        size = int(self.config['speaker_card']['avatar_size'])
+        attributes = f'width="{size}" height="{size}" alt="" loading="lazy" decoding="async"'
+        markup = {}
+        for reference, variants in self.image_assets()['photos'].items():
+            markup[reference] = f'<img src="{variants[0][0]}" srcset="{image_srcset(variants)}" {attributes}>'
+        for reference in self.speaker_data['photo'].dropna().astype(str).unique():
+            if reference not in markup and is_remote_image(reference):
+                url = reference.strip()
+                for character, entity in HTML_ESCAPES + [('"', '&quot;')]:
+                    url = url.replace(character, entity)
+                markup[reference] = f'<img src="{url}" {attributes}>'
+        return self.speaker_data['photo'].astype(object).map(markup).fillna('').tolist()
+
+    def package_assets(self):
+        """Return the (file name, bytes) pairs of processed images shipped with the package"""
+        return self.image_assets()['files'] if self.image_assets_enabled() else []
+
+    def static_site_enabled(self):
+        """Return whether the package carries section listings, detail pages and a sitemap besides the lobby"""
+        return bool(static_site_settings(self.config)['enabled'])
+
+    def session_pages(self):
+        """Return each session's detail page, named by its id, or None when the static site is off"""
+        if not self.static_site_enabled():
+            return None
+        return (f"{SITE_SESSION_DIR}/" + self.session_data['id'].astype(str) + ".html").tolist()
+
+    def speaker_pages(self):
+        """Return each speaker's detail page, named by a unique slug of their name, or None when the static site is off"""
+        if not self.static_site_enabled():
+            return None
+        return self.cache.get_or_render(
+            ('speaker_pages', self.speaker_fingerprint()),
+            lambda: [f"{SITE_SPEAKER_DIR}/{slug}.html" for slug in unique_slugs(self.speaker_data['name'].astype(str), 'speaker')]
+        )
+
+    def site_stylesheet(self):
+        """Return the content-hashed file name and text of the stylesheet every site page links
+
+        It carries the theme as well, so pages hold no styles of their own.
+        """
+        stylesheet = self.generate_css() + "\n\n" + BASE_CSS
+        if self.optimization_enabled():
+            stylesheet = self.cache.get_or_render(
+                ('optimized_stylesheet', hashlib.sha256(stylesheet.encode('utf-8')).hexdigest()),
+                lambda: optimize_css(stylesheet)[0]
+            )
+        return hashed_file_name("site.css", stylesheet), stylesheet
+
+    def render_session_details(self, session_data, speaker_links):
+        """Render the body of each session's detail page, computing per-row fields as whole columns
+
+        speaker_links holds each row's speaker page, or None for speakers without one.
+        """
+        status = session_data['status'].astype(str)
+        status_classes = status.map(SESSION_STATUS_CLASSES).fillna('finished').tolist()
+        status_texts = status.map(SESSION_STATUS_TEXTS).fillna('ENDED').tolist()
+        if 'featured' in session_data:
+            featured = session_data['featured'].fillna(False).astype(bool)
+        else:
+            featured = pd.Series(False, index=session_data.index)
+        featured_classes = featured.map({True: 'featured', False: ''}).tolist()
+        featured_badges = featured.map({True: '<div class="featured-badge">Featured</div>', False: ''}).tolist()
+        speakers = [
+            f'<a href="{link}">{speaker}</a>' if isinstance(link, str) else speaker
+            for link, speaker in zip(speaker_links, self.escape_column(session_data, 'speaker'))
+        ]
+        
+        # Track, level and tags share one line, leaving out whichever a session lacks
+        meta_columns = []
+        for column in ('track', 'level', 'tags'):
+            if column not in session_data:
+                continue
+            values = session_data[column].astype(object)
+            values = values.where(values.notna(), '')
+            if column == 'tags':
+                values = values.map(lambda tags: ', '.join(map(str, tags)) if isinstance(tags, (list, tuple)) else tags)
+            meta_columns.append(self.escape_column(pd.DataFrame({column: values}), column))
+        metas = [
+            f'<div class="session-meta">{" · ".join(part for part in parts if part)}</div>' if any(parts) else ''
+            for parts in zip(*meta_columns)
+        ] if meta_columns else [''] * len(session_data)
+        
+        return [
+            f"""
+        <nav class="breadcrumbs"><a href="index.html">Lobby</a><span>›</span><a href="{listing_page(ALL_SESSIONS_SECTION)}">{ALL_SESSIONS_INFO['title']}</a></nav>
+        <div class="session-card session-detail {featured_class}">
+            {featured_badge}
+            <div class="session-status status-{status_class}">{status_text}</div>
+            <div class="session-time">{time}</div>
+            <h1 class="session-title">{title}</h1>
+            <div class="session-speakers">👤 {speaker}, {company}</div>
+            <div class="session-description">{description}</div>
+            {meta}
+        </div>"""
+            for featured_class, featured_badge, status_class, status_text, time, title, speaker, company, description, meta
+            in zip(
+                featured_classes, featured_badges, status_classes, status_texts,
+                self.escape_column(session_data, 'time'),
+                self.escape_column(session_data, 'title'),
+                speakers,
+                self.escape_column(session_data, 'company'),
+                self.escape_column(session_data, 'description'),
+                metas
+            )
+        ]
+
+    def render_speaker_details(self, speaker_data, avatars, session_cards):
+        """Render the body of each speaker's detail page: their card at full size, bio and session cards
+
+        session_cards holds each speaker's session cards, already joined into one string.
+        """
+        initials = self.escape_column(
+            pd.DataFrame({'initial': speaker_data['name'].astype(str).str[0].str.upper()}),
+            'initial'
+        )
+        if avatars is not None:
+            initials = [avatar or initial for avatar, initial in zip(avatars, initials)]
+        if 'bio' in speaker_data:
+            bios = [
+                f'<p class="speaker-bio">{bio}</p>' if bio else ''
+                for bio in self.escape_column(speaker_data.assign(bio=speaker_data['bio'].fillna('')), 'bio')
+            ]
+        else:
+            bios = [''] * len(speaker_data)
+        speakers_title = self.config['content']['sections']['speakers']['title']
+        
+        return [
+            f"""
+        <nav class="breadcrumbs"><a href="index.html">Lobby</a><span>›</span><a href="{listing_page('speakers')}">{speakers_title}</a></nav>
+        <div class="speaker-card speaker-detail">
+            <div class="speaker-avatar">{initial}</div>
+            <h1 class="speaker-name">{name}</h1>
+            <div class="speaker-title">{title}, {company}</div>
+            {bio}
+        </div>{sessions}"""
+            for initial, name, title, company, bio, sessions
+            in zip(
+                initials,
+                self.escape_column(speaker_data, 'name'),
+                self.escape_column(speaker_data, 'title'),
+                self.escape_column(speaker_data, 'company'),
+                bios,
+                [
+                    f"""
+        <div class="section">
+            <div class="section-header">
+                <div>
+                    <h2 class="section-title">Sessions</h2>
+                </div>
+            </div>
+            <div class="sessions-grid">
+                {cards}
+            </div>
+        </div>""" if cards else ''
+                    for cards in session_cards
+                ]
+            )
+        ]
+
+    def site_fragments(self, key, render):
+        """Return rendered fragments for site pages, reused while key is unchanged
+
+        With output optimization on, the fragments are minified once here,
+        so pages assembled from them need no minifying of their own.
+        """
+        if not self.optimization_enabled():
+            return self.cache.get_or_render(key, render)
+        return self.cache.get_or_render(('minified',) + key, lambda: [minify_html(fragment) for fragment in render()])
+
+    def site_listings(self, session_cards, speaker_cards, compact):
+        """Return (path, title, description, body, active page) for every page of every section listing
+
+        Each section of the lobby gets a listing, and so do the speakers
+        (which the Speakers tab links to) and all sessions together.
+        Cards come pre-rendered; compact is applied to the markup around them.
+        """
+        config = self.config
+        page_size = max(1, int(static_site_settings(config)['page_size']))
+        session_index = self.cache.get_or_render(
+            ('session_index', self.session_fingerprint()),
+            lambda: self.build_session_index(self.session_data)
+        )
+        
+        listings = []
+        for section_id in dict.fromkeys(config['layout']['section_order'] + ['speakers', ALL_SESSIONS_SECTION]):
+            if section_id == ALL_SESSIONS_SECTION:
+                section_info, grid_class, cards = ALL_SESSIONS_INFO, 'sessions-grid', session_cards
+            elif section_id == 'speakers':
+                section_info, grid_class, cards = config['content']['sections'][section_id], 'speakers-grid', speaker_cards
+            else:
+                cards = [session_cards[position] for position in session_index.get(section_id, [])]
+                section_info, grid_class = config['content']['sections'][section_id], 'sessions-grid'
+            active_page = NAV_TAB_PAGES['Speakers'] if section_id == 'speakers' else NAV_TAB_PAGES['All Sessions']
+            
+            pages = page_count(len(cards), page_size)
+            for page in range(1, pages + 1):
+                title = section_info['title'] if page == 1 else f"{section_info['title']} (page {page})"
+                body_start = f"""
+        <nav class="breadcrumbs"><a href="index.html">Lobby</a><span>›</span><span>{section_info['title']}</span></nav>
+        <div class="section">
+            <div class="section-header">
+                <div>
+                    <h2 class="section-title">{section_info['title']}</h2>
+                    <p class="section-subtitle">{section_info['subtitle']}</p>
+                </div>
+                <span class="page-count">Page {page} of {pages}</span>
+            </div>
+            <div class="{grid_class}">
+                """
+                body_end = f"""
+            </div>
+            {pagination_html(section_id, page, pages)}
+        </div>"""
+                body = compact(body_start) + ''.join(cards[(page - 1) * page_size:page * page_size]) + compact(body_end)
+                listings.append((listing_page(section_id, page), title, section_info['subtitle'], body, active_page))
+        return listings
+
+    def site_session_pages(self):
+        """Return (path, title, description, body, active page) for every session's detail page"""
+        session_data = self.session_data
+        
+        def render():
+            speaker_pages = dict(zip(self.speaker_data['name'].astype(str).str.strip(), self.speaker_pages()))
+            speaker_links = session_data['speaker'].astype(str).str.strip().map(speaker_pages).tolist()
+            return self.render_session_details(session_data, speaker_links)
+        
+        bodies = self.site_fragments(('session_details', self.session_fingerprint(), self.speaker_fingerprint()), render)
+        descriptions = [
+            description.replace('"', '&quot;') for description in self.escape_column(session_data, 'description')
+        ] if 'description' in session_data else [''] * len(session_data)
+        return list(zip(
+            self.session_pages(), self.escape_column(session_data, 'title'), descriptions, bodies,
+            [NAV_TAB_PAGES['All Sessions']] * len(session_data)
+        ))
+
+    def site_speaker_pages(self, session_cards):
+        """Return (path, title, description, body, active page) for every speaker's detail page"""
+        speaker_data = self.speaker_data
+        session_fingerprint = self.session_fingerprint()
+        
+        self.speaker_session_counts(session_fingerprint)
+        positions = pd.Index(self.session_data['id'].tolist())
+        cards = [
+            ''.join(session_cards[position] for position in positions.get_indexer(self.speaker_index.session_ids(name)))
+            for name in speaker_data['name'].astype(str).str.strip()
+        ]
+        # Bodies are rendered around a placeholder for the cards, which arrive in their final form
+        bodies = self.site_fragments(
+            (
+                'speaker_details', self.speaker_fingerprint(), session_fingerprint, self.image_fingerprint(),
+                fingerprint_config(self.config['content']['sections']['speakers'])
+            ),
+            lambda: self.render_speaker_details(
+                speaker_data, self.speaker_avatars(), [SPEAKER_SESSIONS_PLACEHOLDER if card else '' for card in cards]
+            )
+        )
+        bodies = [body.replace(SPEAKER_SESSIONS_PLACEHOLDER, card, 1) for body, card in zip(bodies, cards)]
+        names = self.escape_column(speaker_data, 'name')
+        descriptions = [
+            f"{title}, {company}".replace('"', '&quot;')
+            for title, company in zip(self.escape_column(speaker_data, 'title'), self.escape_column(speaker_data, 'company'))
+        ]
+        return list(zip(self.speaker_pages(), names, descriptions, bodies, [NAV_TAB_PAGES['Speakers']] * len(speaker_data)))
+
+    def generate_page_html(self, path, title, description, body, header_html, stylesheet_name, shell=SITE_PAGE_SHELL):
+        """Return one static site page around its header and body
+
+        Every page sits one directory below the package root and sets its
+        base there, so links and asset paths are written from the root.
+        shell holds the page's own markup, minified or as in SITE_PAGE_SHELL.
+        """
+        head, canonical, content_start, end = shell
+        base_url = static_site_settings(self.config)['base_url']
+        head = head.format(
+            title=title,
+            logo_text=self.config['header']['logo_text'],
+            description=description,
+            canonical=canonical.format(url=escape_attribute(page_url(path, base_url))) if base_url else '',
+            stylesheet=stylesheet_name
+        )
+        return head + header_html + content_start + body + end
+
+    def site_pages(self):
+        """Return the (file name, text) pairs of the static site: its stylesheet, pages and sitemap
+
+        Pages are assembled from cached fragments (the lobby's cards and
+        detail bodies rendered column-wise), so a re-export with unchanged
+        data only formats the page shells. With output optimization on,
+        fragments are minified once rather than once per page they appear on.
+        """
+        with self.timed('render_site_pages'):
+            optimize = self.optimization_enabled()
+            compact = minify_html if optimize else str
+            header_texts = self.header_texts()
+            headers = {page: compact(self.generate_header_html(header_texts, page)) for page in NAV_TAB_PAGES.values()}
+            shell = tuple(compact(markup) for markup in SITE_PAGE_SHELL)
+            stylesheet_name, stylesheet = self.site_stylesheet()
+            status_feed = self.status_feed_enabled()
+            session_cards = self.site_fragments(
+                ('site_session_cards', self.session_fingerprint(), status_feed), lambda: self.session_cards(status_feed)
+            )
+            speaker_cards = self.site_fragments(
+                ('site_speaker_cards', self.speaker_fingerprint(), self.session_fingerprint(), self.image_fingerprint()),
+                self.speaker_cards
+            )
+            
+            files = [(stylesheet_name, stylesheet)]
+            for path, title, description, body, active_page in (
+                self.site_listings(session_cards, speaker_cards, compact)
+                + self.site_session_pages()
+                + self.site_speaker_pages(session_cards)
+            ):
+                files.append((path, self.generate_page_html(
+                    path, title, description, body, headers[active_page], stylesheet_name, shell
+                )))
+            
+            base_url = static_site_settings(self.config)['base_url']
+            files.extend(sitemap_files(['index.html'] + [path for path, _ in files[1:]], base_url))
+        return files
+
+    def service_worker_enabled(self):
+        """Return whether the package carries a service worker that keeps the lobby available offline"""
+        return bool(self.config.get('advanced', {}).get('service_worker', False))
+
+    def precache_manifest(self):
+        """Return the service worker's cache version and the files it precaches
+
+        That is the lobby page, the indexes and data it fetches, and every
+        hashed asset from the asset manifest. The version is derived from
+        the config and data fingerprints and each file's revision, so any
+        re-export that changes what attendees see starts a fresh cache.
+        """
+        files = [precache_entry("index.html", self.generate_html())]
+        session_fingerprint = self.session_fingerprint()
+        if self.config['quick_actions']['show_search']:
+            files.append(precache_entry(SEARCH_INDEX_FILE, self.generate_search_index(session_fingerprint)[0]))
+        if self.suggestions_enabled():
+            files.append(precache_entry(SUGGESTION_INDEX_FILE, self.generate_suggestion_index(session_fingerprint)[0]))
+        if self.output_mode() == 'data_sidecar':
+            files.append(precache_entry(
+                DATA_SIDECAR_FILE, self.cached_data_island(session_fingerprint, self.speaker_fingerprint())
+            ))
+        for asset in self.asset_manifest().values():
+            files.append({'url': asset['file'], 'revision': asset['sha256'][:PRECACHE_REVISION_LENGTH], 'immutable': True})
+        
+        version = fingerprint_config([
+            fingerprint_config(self.config), session_fingerprint, self.speaker_fingerprint(),
+            [(file['url'], file['revision']) for file in files]
+        ])
+        return {'version': version, 'files': files}
+
+    def generate_search_index(self, session_fingerprint):
+        """Return the search index JSON and a report of its size and build time, cached by session data"""
+        def build():
+            started = time.perf_counter()
+            index = build_search_index(self.session_data)
+            index['docs'] = {
+                column: encode_island_column(
+                    self.session_data[column] if column in self.session_data else pd.Series([''] * len(self.session_data))
+                )
+                for column in SEARCH_DOC_COLUMNS
+            }
+            index_json = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+            report = {
+                'terms': len(index['terms']),
+                'postings': sum(len(postings) for postings in index['postings']),
+                'bytes': len(index_json.encode('utf-8')),
+                'seconds': time.perf_counter() - started
+            }
+            return index_json, report
+        
+        with self.timed('build_search_index'):
+            return self.cache.get_or_render(('search_index', session_fingerprint), build)
+
+    def suggestions_enabled(self):
+        """Return whether the search box offers autocomplete suggestions"""
+        quick_actions = self.config['quick_actions']
+        return quick_actions['show_search'] and quick_actions.get('search_suggestions', False)
+
+    def generate_suggestion_index(self, session_fingerprint):
+        """Return the suggestion index JSON and a report of its size and build time, cached by session data"""
+        def build():
+            started = time.perf_counter()
+            index = build_suggestion_index(self.session_data)
+            index_json = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+            report = {
+                'phrases': len(index['phrases']),
+                'trigrams': len(index['trigrams']),
+                'bytes': len(index_json.encode('utf-8')),
+                'seconds': time.perf_counter() - started
+            }
+            return index_json, report
+        
+        with self.timed('build_suggestion_index'):
+            return self.cache.get_or_render(('suggestion_index', session_fingerprint), build)
+
+    def suggestion_index_report(self):
+        """Return the phrase count, trigram count, size in bytes and build time of the suggestion index"""
+        return self.generate_suggestion_index(self.session_fingerprint())[1]
+
+    def write_suggestion_index(self, stream):
+        """Stream the suggestion index JSON into a text stream"""
+        write_chunked(stream, self.generate_suggestion_index(self.session_fingerprint())[0])
+
+    def search_index_report(self):
+        """Return the term count, encoded posting count, size in bytes and build time of the search index"""
+        return self.generate_search_index(self.session_fingerprint())[1]
+
+    def write_search_index(self, stream):
+        """Stream the search index JSON into a text stream"""
+        write_chunked(stream, self.generate_search_index(self.session_fingerprint())[0])
+
+    def generate_readme(self, generated_at):
+        """Generate the README shipped with an export package"""
+        sidecar_lines = (
+            f"- `{DATA_SIDECAR_FILE}` - Card data loaded by \"View all\" (serve over HTTP)\n"
+            if self.output_mode() == 'data_sidecar' else ''
+        )
+        if self.status_feed_enabled():
+            sidecar_lines += f"- `{STATUS_FEED_FILE}` - Live session statuses polled by the page (replace it, or run `python lobby_cli.py feed`)\n"
+        if self.suggestions_enabled():
+            sidecar_lines = f"- `{SUGGESTION_INDEX_FILE}` - Autocomplete suggestions for the search box\n" + sidecar_lines
+        if self.config['quick_actions']['show_search']:
+            sidecar_lines = f"- `{SEARCH_INDEX_FILE}` - Search index queried by the search box (serve over HTTP)\n" + sidecar_lines
+        if self.stylesheet_mode() == 'external':
+            stylesheet_line = (
+                f"- `{self.hashed_stylesheet()[0]}` - Complete stylesheet; its name changes with its content, so it can be cached indefinitely\n"
+            )
+        else:
+            stylesheet_line = "- `styles.css` - Generated CSS styles\n"
+        if self.image_assets_enabled():
+            sidecar_lines += f"- `{IMAGE_ASSET_DIR}/` - Speaker photos and masthead images, resized and named by content hash\n"
+        if self.static_site_enabled():
+            sidecar_lines += (
+                f"- `{SITE_SECTION_DIR}/`, `{SITE_SESSION_DIR}/`, `{SITE_SPEAKER_DIR}/` - Section listings and session and speaker pages, "
+                f"styled by `{self.site_stylesheet()[0]}`\n"
+                f"- `{SITEMAP_FILE}` - Every page for search engines"
+                f"{'' if static_site_settings(self.config)['base_url'] else ' (set a Base URL in the Advanced tab to make its addresses absolute)'}\n"
+            )
+        if self.asset_manifest_enabled():
+            sidecar_lines += f"- `{ASSET_MANIFEST_FILE}` - Hashed asset names, sizes and digests\n"
+        if self.service_worker_enabled():
+            sidecar_lines += (
+                f"- `{SERVICE_WORKER_FILE}` - Keeps the lobby available offline once visited (needs HTTPS; serve it with `Cache-Control: no-cache`)\n"
+                f"- `{PRECACHE_MANIFEST_FILE}` - Files the service worker caches on install, with their revisions\n"
+            )
+        if self.precompress_enabled():
+            suffixes = ", ".join(f"`*{suffix}`" for _, suffix in compression_encodings())
+            sidecar_lines += (
+                f"- {suffixes} - Precompressed copies of the HTML, CSS and JSON files; serve them with the matching Content-Encoding\n"
+                f"- `{COMPRESSION_MANIFEST_FILE}` - Original and compressed sizes of each file\n"
+            )
+        return f"""# {self.config['header']['logo_text']} - Event Lobby
+
+## Files Included:
+- `index.html` - Complete lobby HTML file
+{stylesheet_line}- `config.json` - Configuration backup
+- `sessions.csv` - Session data
+- `speakers.csv` - Speaker data
+{sidecar_lines}- `README.md` - This file
+
+## Usage:
+1. Open `index.html` in a web browser to view your lobby
+2. Upload to your web hosting service
+3. Import `config.json` to restore settings in the customizer
+
+## Generated: {generated_at.strftime('%Y-%m-%d %H:%M:%S')}
+"""
+
+    def speaker_data_with_counts(self):
+        """Return speaker data with the sessions column replaced by counts derived from session data"""
+        session_counts = self.speaker_session_counts(self.session_fingerprint())
+        return self.speaker_data.assign(sessions=session_counts)
+
+    def write_data_sidecar(self, stream):
+        """Stream the data island JSON into a text stream"""
+        island = self.cached_data_island(self.session_fingerprint(), self.speaker_fingerprint())
+        write_chunked(stream, island)
+
+    def package_writers(self, generated_at):
+        """Return (file name, writer) pairs; each writer streams one artifact's text into a text stream"""
+        if self.stylesheet_mode() == 'external':
+            stylesheet_name, stylesheet = self.hashed_stylesheet()
+            stylesheet_writer = (stylesheet_name, lambda stream: write_chunked(stream, stylesheet))
+        else:
+            stylesheet_writer = ("styles.css", lambda stream: write_chunked(stream, self.generate_css()))
+        writers = [
+            ("index.html", lambda stream: write_chunked(stream, self.generate_html())),
+            stylesheet_writer,
+            ("config.json", lambda stream: json.dump(self.config, stream, indent=2)),
+            ("sessions.csv", lambda stream: self.session_data.to_csv(stream, index=False)),
+            ("speakers.csv", lambda stream: self.speaker_data_with_counts().to_csv(stream, index=False)),
+            ("README.md", lambda stream: stream.write(self.generate_readme(generated_at)))
+        ]
+        if self.static_site_enabled():
+            writers[-1:-1] = [
+                (file_name, lambda stream, text=text: write_chunked(stream, text)) for file_name, text in self.site_pages()
+            ]
+        if self.asset_manifest_enabled():
+            writers.insert(-1, (ASSET_MANIFEST_FILE, lambda stream: json.dump(self.asset_manifest(), stream, indent=2)))
+        if self.service_worker_enabled():
+            # The manifest hashes every precached file, so it is computed once for both artifacts
+            precache = self.precache_manifest()
+            writers.insert(-1, (SERVICE_WORKER_FILE, lambda stream: stream.write(service_worker_source(precache['version']))))
+            writers.insert(-1, (PRECACHE_MANIFEST_FILE, lambda stream: json.dump(precache, stream, indent=2)))
+        if self.status_feed_enabled():
+            writers.insert(1, (STATUS_FEED_FILE, self.write_status_feed))
+        if self.output_mode() == 'data_sidecar':
+            writers.insert(1, (DATA_SIDECAR_FILE, self.write_data_sidecar))
+        if self.suggestions_enabled():
+            writers.insert(1, (SUGGESTION_INDEX_FILE, self.write_suggestion_index))
+        if self.config['quick_actions']['show_search']:
+            writers.insert(1, (SEARCH_INDEX_FILE, self.write_search_index))
+        return writers
+
+    def precompress_enabled(self):
+        """Return whether export packages carry precompressed copies of their text assets"""
+        return bool(self.config.get('advanced', {}).get('precompress', False))
+
+    def compressed_files(self, compressions):
+        """Return the siblings of finished (file name, compression job) pairs, then the compression manifest"""
+        files = []
+        manifest = {'encodings': [encoding for encoding, _ in compression_encodings()], 'files': {}}
+        for file_name, job in compressions:
+            siblings, manifest['files'][file_name] = job.result()
+            files.extend(siblings)
+        manifest['totals'] = {
+            'bytes': sum(entry['bytes'] for entry in manifest['files'].values()),
+            **{
+                encoding: sum(entry[encoding]['bytes'] for entry in manifest['files'].values())
+                for encoding in manifest['encodings']
+            }
+        }
+        files.append((COMPRESSION_MANIFEST_FILE, json.dumps(manifest, indent=2).encode('utf-8')))
+        return files
+
+    def package_files(self, generated_at=None):
+        """Return the (file name, content) pairs that make up an export package
+
+        Content is text, except for processed images, precompressed copies
+        and their manifest, which are bytes. Files are compressed in parallel as they are rendered.
+        """
+        generated_at = generated_at or package_timestamp()
+        precompress = self.precompress_enabled()
+        files = []
+        compressions = []
+        with ThreadPoolExecutor(max_workers=COMPRESSION_WORKERS) as pool:
+            for file_name, write in self.package_writers(generated_at):
+                stream = StringIO()
+                write(stream)
+                files.append((file_name, stream.getvalue()))
+                if precompress and is_compressible(file_name):
+                    compressions.append((file_name, pool.submit(compress_file, file_name, files[-1][1].encode('utf-8'))))
+            files.extend(self.package_assets())
+            if precompress:
+                files.extend(self.compressed_files(compressions))
+        return files
+
+    def write_package_zip(self, fileobj, generated_at=None):
+        """Stream every package artifact into a DEFLATE zip written to fileobj
+
+        Artifacts are rendered and compressed one at a time, straight into the
+        archive; files that get precompressed copies are rendered whole and
+        compressed in parallel while later artifacts render. Entries are
+        stamped with generated_at rather than the wall clock, so equal inputs
+        and timestamp give a byte-identical archive.
+        """
+        generated_at = generated_at or package_timestamp()
+        precompress = self.precompress_enabled()
+        compressions = []
+        with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zip_file, \
+                ThreadPoolExecutor(max_workers=COMPRESSION_WORKERS) as pool:
+            for file_name, write in self.package_writers(generated_at):
+                info = zipfile.ZipInfo(file_name, date_time=generated_at.timetuple()[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                if precompress and is_compressible(file_name):
+                    stream = StringIO()
+                    write(stream)
+                    data = stream.getvalue().encode('utf-8')
+                    zip_file.writestr(info, data)
+                    compressions.append((file_name, pool.submit(compress_file, file_name, data)))
+                    continue
+                with zip_file.open(info, "w") as entry:
+                    stream = TextIOWrapper(entry, encoding="utf-8", newline="")
+                    write(stream)
+                    stream.flush()
+                    stream.detach()
+            
+            for file_name, data in self.package_assets():
+                info = zipfile.ZipInfo(file_name, date_time=generated_at.timetuple()[:6])
+                # Images are compressed already, so they are stored
+                info.compress_type = zipfile.ZIP_STORED
+                info.external_attr = 0o644 << 16
+                zip_file.writestr(info, data)
+            
+            if precompress:
+                for file_name, data in self.compressed_files(compressions):
+                    info = zipfile.ZipInfo(file_name, date_time=generated_at.timetuple()[:6])
+                    # Compressed copies would not shrink further, so they are stored
+                    info.compress_type = zipfile.ZIP_DEFLATED if file_name == COMPRESSION_MANIFEST_FILE else zipfile.ZIP_STORED
+                    info.external_attr = 0o644 << 16
+                    zip_file.writestr(info, data)
@@ -0,0 +1,270 @@
+"""Typed session schedule: parsed time ranges, an interval index and status at a given instant"""
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+import pandas as pd
+
+# Schedule settings used when the config has no 'schedule' section
+DEFAULT_SCHEDULE = {
+    'status_mode': 'manual',
+    'event_date': '2024-03-15',
+    'timezone': 'UTC',
+    'upcoming_window_minutes': 120,
+    'preview_time': ''
+}
+
+# 'manual' renders the status column as entered; 'computed' derives status from session times
+STATUS_MODES = ['manual', 'computed']
+
+# Status of a session that starts after the upcoming window; it appears in no status section
+SCHEDULED_STATUS = 'scheduled'
+
+# "[YYYY-MM-DD | Day N] start - end [zone]", e.g. "Day 2, 10:00 AM - 11:30 AM Europe/Berlin"
+TIME_RANGE_PATTERN = re.compile(
+    r"^\s*(?:(?P<date>\d{4}-\d{2}-\d{2})|day\s*(?P<day>\d+))?[\s,]*"
+    r"(?P<start>\d{1,2}(?::\d{2})?\s*(?:[ap]\.?m\.?)?)\s*(?:-|–|—|to)\s*"
+    r"(?P<end>\d{1,2}(?::\d{2})?\s*(?:[ap]\.?m\.?)?)"
+    r"\s*(?P<zone>[A-Za-z]+/[A-Za-z_/+-]+|UTC|GMT|Z|[+-]\d{2}:?\d{2})?\s*$",
+    re.IGNORECASE
+)
+# A fixed offset from UTC as a time zone, e.g. "+05:30" or "-0800"
+OFFSET_PATTERN = re.compile(r"^[+-]\d{2}:?\d{2}$")
+CLOCK_PATTERN = re.compile(r"^(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<meridiem>[ap])?", re.IGNORECASE)
+
+
+def resolve_zone(name):
+    """Return a tzinfo for an IANA name, UTC/GMT/Z, or a +HH:MM offset"""
+    if name.upper() in ('UTC', 'GMT', 'Z'):
+        return timezone.utc
+    if name[:1] in ('+', '-'):
+        if not OFFSET_PATTERN.match(name):
+            raise ValueError(f"Time zone offset {name!r} is not in +HH:MM form")
+        digits = name[1:].replace(':', '')
+        offset = timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+        return timezone(offset if name[0] == '+' else -offset)
+    return ZoneInfo(name)
+
+
+def parse_clock(text):
+    """Return (hour, minute, meridiem) for "10", "10:30", "10:30 AM" or "22:30"; meridiem is 'a', 'p' or None"""
+    match = CLOCK_PATTERN.match(text.strip())
+    return int(match['hour']), int(match['minute'] or 0), (match['meridiem'] or '').lower() or None
+
+
+def clock_time(hour, minute, meridiem):
+    """Return the time of day for a parsed clock reading, or None if it is out of range"""
+    if minute > 59 or hour > (12 if meridiem else 23) or (meridiem and hour == 0):
+        return None
+    if meridiem:
+        hour = hour % 12 + (12 if meridiem == 'p' else 0)
+    return time(hour, minute)
+
+
+def parse_time_range(text, event_date, zone):
+    """Parse one session time string into aware (start, end) datetimes, or None if it cannot be read
+
+    The day comes from an ISO date or "Day N" prefix (counted from
+    event_date) and the zone from a trailing IANA name or offset, falling
+    back to the event's zone. A start without AM/PM borrows the end's unless
+    that would put it after the end ("11 - 1 PM"), and an end at or before
+    the start is taken to fall on the next day.
+    """
+    match = TIME_RANGE_PATTERN.match(str(text))
+    if not match:
+        return None
+
+    start_hour, start_minute, start_meridiem = parse_clock(match['start'])
+    end_hour, end_minute, end_meridiem = parse_clock(match['end'])
+    end_time = clock_time(end_hour, end_minute, end_meridiem)
+    start_time = clock_time(start_hour, start_minute, start_meridiem or end_meridiem)
+    if not start_meridiem and end_meridiem == 'p' and start_time and end_time and start_time > end_time:
+        start_time = clock_time(start_hour, start_minute, 'a')
+    if not start_time or not end_time:
+        return None
+
+    try:
+        zone = resolve_zone(match['zone']) if match['zone'] else zone
+        day = date.fromisoformat(match['date']) if match['date'] else event_date + timedelta(days=int(match['day'] or 1) - 1)
+    except (ValueError, ZoneInfoNotFoundError):
+        return None
+
+    start = datetime.combine(day, start_time, zone)
+    end = datetime.combine(day, end_time, zone)
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
+
+def parse_session_times(times, event_date, zone_name):
+    """Parse a column of time strings into UTC start and end columns, NaT where unparseable
+
+    Each distinct string is parsed once, so events with a few hundred time
+    slots parse in milliseconds regardless of session count.
+    """
+    codes, uniques = pd.factorize(times.fillna('').astype(str))
+    zone = resolve_zone(zone_name or 'UTC')
+    event_day = date.fromisoformat(event_date)
+
+    # One trailing unreadable slot stands in for missing values, which factorize codes as -1
+    parsed = [parse_time_range(text, event_day, zone) for text in uniques] + [None]
+    codes = np.where(codes < 0, len(uniques), codes)
+    unique_starts = pd.to_datetime([bounds[0] if bounds else None for bounds in parsed], utc=True).as_unit('ns')
+    unique_ends = pd.to_datetime([bounds[1] if bounds else None for bounds in parsed], utc=True).as_unit('ns')
+    return pd.DataFrame({'start': unique_starts[codes], 'end': unique_ends[codes]}, index=times.index)
+
+
+class IntervalTree:
+    """Centered interval tree over half-open [start, end) integer intervals
+
+    A stabbing query visits one node per level and reads only the matching
+    intervals at each, so it runs in O(log n + k).
+    """
+
+    def __init__(self, starts, ends):
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.nodes = []
+        self.root = self.build(np.arange(len(self.starts)))
+
+    def build(self, members):
+        """Build the subtree over members and return its node number, or -1 when empty"""
+        if not len(members):
+            return -1
+
+        starts, ends = self.starts[members], self.ends[members]
+        points = np.sort(np.concatenate([starts, ends]))
+        # The lower median endpoint always lies inside at least one interval or splits them, so each level shrinks
+        center = points[(len(points) - 1) // 2]
+        here = (starts <= center) & (ends > center)
+
+        by_start = members[here][np.argsort(starts[here], kind='stable')]
+        by_end = members[here][np.argsort(ends[here], kind='stable')]
+        node = len(self.nodes)
+        self.nodes.append([center, by_start, self.starts[by_start], by_end, self.ends[by_end], -1, -1])
+        self.nodes[node][5] = self.build(members[ends <= center])
+        self.nodes[node][6] = self.build(members[starts > center])
+        return node
+
+    def stab(self, point):
+        """Return the ids of intervals containing point"""
+        found = []
+        node = self.root
+        while node != -1:
+            center, by_start, sorted_starts, by_end, sorted_ends, left, right = self.nodes[node]
+            if point < center:
+                # Every interval here ends after center, so it contains point exactly when it starts by then
+                found.append(by_start[:np.searchsorted(sorted_starts, point, side='right')])
+                node = left
+            else:
+                # Every interval here starts by center, so it contains point exactly when it ends after it
+                found.append(by_end[np.searchsorted(sorted_ends, point, side='right'):])
+                node = right
+        return np.concatenate(found) if found else np.array([], dtype=np.int64)
+
+
+class ScheduleIndex:
+    """Interval index over session start and end times, answering status queries for an instant
+
+    Sessions sharing a time slot are grouped, so the tree holds one
+    interval per distinct slot.
+    """
+
+    def __init__(self, schedule):
+        self.size = len(schedule)
+        valid = schedule['start'].notna().to_numpy() & schedule['end'].notna().to_numpy()
+        self.valid = valid
+        self.starts = np.full(self.size, np.iinfo(np.int64).min, dtype=np.int64)
+        self.ends = np.full(self.size, np.iinfo(np.int64).min, dtype=np.int64)
+        self.starts[valid] = schedule['start'][valid].dt.as_unit('ns').astype('int64').to_numpy()
+        self.ends[valid] = schedule['end'][valid].dt.as_unit('ns').astype('int64').to_numpy()
+
+        # Session positions ordered by start, grouped into slots of identical start and end
+        positions = np.flatnonzero(valid)
+        self.start_order = positions[np.lexsort((self.ends[positions], self.starts[positions]))]
+        self.sorted_starts = self.starts[self.start_order]
+        sorted_ends = self.ends[self.start_order]
+        slot_bounds = np.flatnonzero(np.r_[
+            True, (self.sorted_starts[1:] != self.sorted_starts[:-1]) | (sorted_ends[1:] != sorted_ends[:-1])
+        ]) if len(positions) else np.array([], dtype=np.int64)
+        self.slot_positions = np.split(self.start_order, slot_bounds[1:]) if len(positions) else []
+        self.tree = IntervalTree(self.sorted_starts[slot_bounds], sorted_ends[slot_bounds])
+
+    @staticmethod
+    def instant_value(instant):
+        """Return an instant as UTC nanoseconds; naive instants are taken as UTC"""
+        instant = pd.Timestamp(instant)
+        instant = instant.tz_localize('UTC') if instant.tzinfo is None else instant.tz_convert('UTC')
+        return instant.as_unit('ns').value
+
+    def live_at(self, instant):
+        """Return positions of sessions running at instant, in row order"""
+        slots = self.tree.stab(self.instant_value(instant))
+        if not len(slots):
+            return np.array([], dtype=np.int64)
+        return np.sort(np.concatenate([self.slot_positions[slot] for slot in slots.tolist()]))
+
+    def starting_between(self, begin, end):
+        """Return positions of sessions starting after begin and no later than end, in start order"""
+        low = np.searchsorted(self.sorted_starts, self.instant_value(begin), side='right')
+        high = np.searchsorted(self.sorted_starts, self.instant_value(end), side='right')
+        return self.start_order[low:high]
+
+    def statuses_at(self, instant, window, fallback):
+        """Return every session's status at instant
+
+        Sessions running at instant are live, those starting within window
+        are upcoming, those that ended are finished and later ones are
+        scheduled. Sessions whose time could not be parsed keep their
+        fallback status.
+        """
+        statuses = np.array(fallback, dtype=object)
+        instant_value = self.instant_value(instant)
+        statuses[self.valid] = np.where(self.ends[self.valid] <= instant_value, 'finished', SCHEDULED_STATUS)
+        statuses[self.starting_between(instant, pd.Timestamp(instant_value, tz='UTC') + window)] = 'upcoming'
+        statuses[self.live_at(instant)] = 'live'
+        return statuses
+
+
+def schedule_settings(config):
+    """Return the schedule section of a config merged over the defaults"""
+    return {**DEFAULT_SCHEDULE, **config.get('schedule', {})}
+
+
+def schedule_errors(settings):
+    """Return a message for each schedule setting statuses cannot be computed with; empty when all are usable"""
+    errors = []
+    try:
+        date.fromisoformat(str(settings['event_date']))
+    except ValueError:
+        errors.append(f"Event date {settings['event_date']!r} is not a YYYY-MM-DD date")
+    try:
+        resolve_zone(settings['timezone'] or 'UTC')
+    except (ValueError, ZoneInfoNotFoundError):
+        errors.append(f"Time zone {settings['timezone']!r} is not an IANA name, UTC or a +HH:MM offset")
+    else:
+        try:
+            schedule_instant(settings)
+        except ValueError:
+            errors.append(f"Preview time {settings['preview_time']!r} is not a date and time")
+    try:
+        timedelta(minutes=float(settings['upcoming_window_minutes']))
+    except (TypeError, ValueError, OverflowError):
+        errors.append(f"Upcoming window {settings['upcoming_window_minutes']!r} is not a number of minutes")
+    return errors
+
+
+def schedule_instant(settings, now=None):
+    """Return the instant statuses are computed for: now, the configured preview time, or the clock"""
+    if now is None and settings.get('preview_time'):
+        now = pd.Timestamp(settings['preview_time'])
+        if now.tzinfo is None:
+            now = now.tz_localize(resolve_zone(settings['timezone'] or 'UTC'))
+    return pd.Timestamp(now if now is not None else datetime.now(timezone.utc))
+
+
+def build_schedule(session_data, settings):
+    """Parse session times under the schedule settings and index them"""
+    times = session_data['time'] if 'time' in session_data else pd.Series([''] * len(session_data))
+    return ScheduleIndex(parse_session_times(times, settings['event_date'], settings['timezone']))
@@ -0,0 +1,645 @@
+"""Client-side scripts bundled into generated lobby pages"""
+
+# Expands a section's "View all" link into a windowed grid rendered from the lobby data island.
+# Card markup mirrors LobbyRenderer.render_session_cards / render_speaker_cards so generate_css applies.
+VIRTUAL_GRID_SCRIPT = """
+(function () {
+    var island = document.getElementById('lobby-data');
+    if (!island) return;
+    var OVERSCAN_ROWS = 3;
+    var ESTIMATED_ROW_HEIGHT = 320;
+    var VIEWPORT_FRACTION = 0.8;
+    var showSessionCount = island.getAttribute('data-show-session-count') === 'true';
+    var sessionPages = island.getAttribute('data-session-pages');
+    var pending = null, statusChanges = {}, redraws = [];
+
+    // Dictionary-encoded columns arrive as {values, codes}; expand them back into plain arrays
+    function decodeColumns(table) {
+        Object.keys(table).forEach(function (name) {
+            var column = table[name];
+            if (!Array.isArray(column)) {
+                table[name] = column.codes.map(function (code) { return column.values[code]; });
+            }
+        });
+        return table;
+    }
+
+    function loadData() {
+        if (!pending) {
+            pending = (island.getAttribute('data-src')
+                ? fetch(island.getAttribute('data-src')).then(function (response) { return response.json(); })
+                : Promise.resolve(JSON.parse(island.textContent))
+            ).then(function (data) {
+                decodeColumns(data.sessions);
+                decodeColumns(data.speakers);
+                applyStatusChanges(data);
+                return data;
+            });
+        }
+        return pending;
+    }
+
+    // Mirrors LobbyRenderer.build_session_index: scheduled sessions sit in no status section
+    function sectionFor(status) {
+        if (status === 'live' || status === 'upcoming') return status;
+        return status === 'scheduled' ? null : 'finished';
+    }
+
+    // Statuses received from the live status feed; sessions keep their section order and newcomers go last
+    function applyStatusChanges(data) {
+        var s = data.sessions, moved = false;
+        if (!s.id) return;
+        for (var i = 0; i < s.id.length; i++) {
+            var status = statusChanges[s.id[i]];
+            if (status !== undefined && status !== s.status[i]) {
+                s.status[i] = status;
+                moved = true;
+            }
+        }
+        if (!moved) return;
+        ['live', 'upcoming', 'finished'].forEach(function (id) {
+            var listed = {};
+            var rows = (data.sections[id] || []).filter(function (row) {
+                listed[row] = true;
+                return sectionFor(s.status[row]) === id;
+            });
+            for (var row = 0; row < s.status.length; row++) {
+                if (!listed[row] && sectionFor(s.status[row]) === id) rows.push(row);
+            }
+            data.sections[id] = rows;
+        });
+    }
+
+    function escapeHtml(value) {
+        return String(value).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+    }
+
+    // A hit opens the session's detail page when the static site is exported, otherwise its card in the lobby
+    function resultLink(docs, row) {
+        return sessionPages ? sessionPages + docs.id[row] + '.html' : '#session-' + docs.id[row];
+    }
+
+    // Titles and names link to their static site detail pages when the site was exported
+    function detailLink(page, html) {
+        return page ? '<a href="' + page + '">' + html + '</a>' : html;
+    }
+
+    function sessionCard(data, i) {
+        var s = data.sessions, labels = data.labels, status = s.status[i];
+        var featured = s.featured[i];
+        return '<div class="session-card ' + (featured ? 'featured' : '') + '">' +
+            (featured ? '<div class="featured-badge">Featured</div>' : '') +
+            '<div class="session-status status-' + (labels.statusClasses[status] || 'finished') + '">' +
+            (labels.statusTexts[status] || 'ENDED') + '</div>' +
+            '<div class="session-time">' + escapeHtml(s.time[i]) + '</div>' +
+            '<h3 class="session-title">' + detailLink(sessionPages && s.id && sessionPages + s.id[i] + '.html', escapeHtml(s.title[i])) + '</h3>' +
+            '<div class="session-speakers">👤 ' + escapeHtml(s.speaker[i]) + ', ' + escapeHtml(s.company[i]) + '</div>' +
+            '<div class="session-description">' + escapeHtml(s.description[i]) + '</div>' +
+            '<div class="session-actions"><button class="btn-primary">' +
+            (labels.buttonLabels[status] || 'View Details') +
+            '</button><button class="bookmark-btn">🤍</button></div></div>';
+    }
+
+    function speakerCard(data, i) {
+        var s = data.speakers, name = String(s.name[i]);
+        return '<div class="speaker-card">' +
+            '<div class="speaker-avatar">' + ((s.avatar && s.avatar[i]) || escapeHtml(name.charAt(0).toUpperCase())) + '</div>' +
+            '<div class="speaker-name">' + detailLink(s.page && s.page[i], escapeHtml(name)) + '</div>' +
+            '<div class="speaker-title">' + escapeHtml(s.title[i]) + ', ' + escapeHtml(s.company[i]) + '</div>' +
+            (showSessionCount ? '<div class="speaker-sessions">' + s.sessions[i] + ' sessions</div>' : '') +
+            '</div>';
+    }
+
+    function virtualize(section, data) {
+        var sectionId = section.getAttribute('data-section');
+        var grid = section.querySelector('.sessions-grid, .speakers-grid');
+        var rows, total;
+        var renderCard = sectionId === 'speakers' ? speakerCard : sessionCard;
+
+        var viewport = document.createElement('div');
+        viewport.className = 'virtual-viewport';
+        viewport.style.cssText = 'overflow-y: auto; position: relative;';
+        var spacer = document.createElement('div');
+        spacer.style.position = 'relative';
+        grid.parentNode.replaceChild(viewport, grid);
+        viewport.appendChild(spacer);
+        spacer.appendChild(grid);
+        grid.style.cssText = 'position: absolute; left: 0; right: 0; top: 0;';
+
+        var columns = 1, rowHeight = ESTIMATED_ROW_HEIGHT, scheduled = false;
+
+        function loadRows() {
+            rows = sectionId === 'speakers' ? null : data.sections[sectionId] || [];
+            total = rows ? rows.length : data.speakers.name.length;
+        }
+
+        // The server-rendered first cards are still in the grid, so the first measurement uses real markup
+        function measure() {
+            columns = Math.max(1, getComputedStyle(grid).gridTemplateColumns.split(' ').length);
+            var renderedRows = Math.ceil(grid.children.length / columns);
+            if (renderedRows) rowHeight = (grid.offsetHeight + parseFloat(getComputedStyle(grid).rowGap || 0)) / renderedRows;
+            var height = Math.ceil(total / columns) * rowHeight;
+            spacer.style.height = height + 'px';
+            viewport.style.height = Math.min(height, window.innerHeight * VIEWPORT_FRACTION) + 'px';
+        }
+
+        function draw() {
+            scheduled = false;
+            var first = Math.max(0, Math.floor(viewport.scrollTop / rowHeight) - OVERSCAN_ROWS);
+            var last = Math.ceil((viewport.scrollTop + viewport.clientHeight) / rowHeight) + OVERSCAN_ROWS;
+            var html = '';
+            for (var position = first * columns; position < Math.min(total, last * columns); position++) {
+                html += renderCard(data, rows ? rows[position] : position);
+            }
+            grid.style.top = first * rowHeight + 'px';
+            grid.innerHTML = html;
+            // Card heights depend on content and viewport width, so the row estimate is refined after every draw
+            measure();
+        }
+
+        function schedule() {
+            if (!scheduled) {
+                scheduled = true;
+                requestAnimationFrame(draw);
+            }
+        }
+
+        viewport.addEventListener('scroll', schedule);
+        window.addEventListener('resize', schedule);
+        redraws.push(function () {
+            loadRows();
+            schedule();
+        });
+        loadRows();
+        measure();
+        draw();
+    }
+
+    document.addEventListener('lobby-status', function (event) {
+        var changes = event.detail.changes;
+        Object.keys(changes).forEach(function (status) {
+            changes[status].forEach(function (id) { statusChanges[id] = status; });
+        });
+        if (pending) {
+            pending.then(function (data) {
+                applyStatusChanges(data);
+                redraws.forEach(function (redraw) { redraw(); });
+            });
+        }
+    });
+
+    document.addEventListener('click', function (event) {
+        var link = event.target.closest('.section[data-section] .view-all');
+        if (!link) return;
+        event.preventDefault();
+        var section = link.closest('.section');
+        loadData().then(function (data) {
+            virtualize(section, data);
+            link.style.display = 'none';
+        });
+    });
+})();
+"""
+
+# Answers the quick-actions search box from the exported inverted index (see lobby_search.search).
+# Every query word must prefix-match a word of the session; hits are listed in session order.
+# When a suggestion index is attached, typo-tolerant trigram suggestions (see lobby_search.suggest) are listed first.
+# Hits link to the session's detail page, or to its card in the lobby; suggestions link to a search for the phrase.
+SEARCH_SCRIPT = """
+(function () {
+    var input = document.querySelector('.search-input[data-search-index]');
+    if (!input) return;
+    var results = input.parentNode.querySelector('.search-results');
+    var limit = parseInt(input.getAttribute('data-result-limit'), 10) || 50;
+    var suggestSource = input.getAttribute('data-suggest-index');
+    var suggestLimit = parseInt(input.getAttribute('data-suggest-limit'), 10) || 8;
+    var minSimilarity = parseFloat(input.getAttribute('data-suggest-min-similarity')) || 0.5;
+    var sessionPages = input.getAttribute('data-session-pages');
+    var SUGGESTION_KINDS = {title: 'Session', speaker: 'Speaker', company: 'Company', tags: 'Tag'};
+    var pending = null, pendingSuggestions = null, shownSuggestions = [];
+
+    function decodeColumn(column) {
+        return Array.isArray(column) ? column : column.codes.map(function (code) { return column.values[code]; });
+    }
+
+    // Posting lists hold an absolute row, then gaps; a negative value -k stands for k consecutive rows
+    function decodePostings(encoded) {
+        var rows = [], row = 0;
+        for (var i = 0; i < encoded.length; i++) {
+            if (i > 0 && encoded[i] < 0) {
+                for (var k = -encoded[i]; k > 0; k--) rows.push(++row);
+            } else {
+                row = i === 0 ? encoded[i] : row + encoded[i];
+                rows.push(row);
+            }
+        }
+        return Int32Array.from(rows);
+    }
+
+    function loadIndex() {
+        if (!pending) {
+            pending = fetch(input.getAttribute('data-search-index')).then(function (response) {
+                return response.json();
+            }).then(function (index) {
+                index.postings = index.postings.map(decodePostings);
+                Object.keys(index.docs).forEach(function (name) { index.docs[name] = decodeColumn(index.docs[name]); });
+                index.marks = new Int32Array(index.size);
+                index.generation = 0;
+                return index;
+            });
+        }
+        return pending;
+    }
+
+    function loadSuggestions() {
+        if (!suggestSource) return Promise.resolve(null);
+        if (!pendingSuggestions) {
+            pendingSuggestions = fetch(suggestSource).then(function (response) {
+                return response.json();
+            }).then(function (index) {
+                index.postings = index.postings.map(decodePostings);
+                index.shared = new Int32Array(index.phrases.length);
+                return index;
+            });
+        }
+        return pendingSuggestions;
+    }
+
+    function tokenize(text) {
+        return text.toLowerCase().match(/[\\p{L}\\p{N}_]+/gu) || [];
+    }
+
+    function lowerBound(terms, word) {
+        var low = 0, high = terms.length;
+        while (low < high) {
+            var middle = (low + high) >> 1;
+            if (terms[middle] < word) low = middle + 1; else high = middle;
+        }
+        return low;
+    }
+
+    function search(index, query) {
+        var words = tokenize(query);
+        if (!words.length) return null;
+        // marks[row] === base + n means the row matched the first n words of this query
+        var marks = index.marks, base = index.generation, hits = [];
+        index.generation += words.length + 1;
+
+        words.forEach(function (word, n) {
+            for (var t = lowerBound(index.terms, word); t < index.terms.length && index.terms[t].lastIndexOf(word, 0) === 0; t++) {
+                var rows = index.postings[t];
+                for (var i = 0; i < rows.length; i++) {
+                    var row = rows[i];
+                    if (n === 0 ? marks[row] <= base : marks[row] === base + n) {
+                        marks[row] = base + n + 1;
+                        if (n === words.length - 1) hits.push(row);
+                    }
+                }
+            }
+        });
+        return hits.sort(function (a, b) { return a - b; }).slice(0, limit);
+    }
+
+    function trigrams(text) {
+        var grams = {};
+        tokenize(text).forEach(function (word) {
+            var padded = '  ' + word + ' ';
+            for (var i = 0; i + 3 <= padded.length; i++) grams[padded.substr(i, 3)] = true;
+        });
+        return Object.keys(grams);
+    }
+
+    function suggest(index, query) {
+        var grams = trigrams(query);
+        if (!grams.length) return [];
+        // shared[id] counts the query trigrams phrase id contains; touched ids are reset afterwards
+        var shared = index.shared, touched = [], candidates = [];
+        grams.forEach(function (gram) {
+            var t = lowerBound(index.trigrams, gram);
+            if (index.trigrams[t] !== gram) return;
+            var ids = index.postings[t];
+            for (var i = 0; i < ids.length; i++) {
+                if (shared[ids[i]]++ === 0) touched.push(ids[i]);
+            }
+        });
+        touched.forEach(function (id) {
+            var count = shared[id], coverage = count / grams.length;
+            shared[id] = 0;
+            if (coverage >= minSimilarity) {
+                candidates.push({id: id, coverage: coverage, similarity: count / (grams.length + index.sizes[id] - count)});
+            }
+        });
+        candidates.sort(function (a, b) {
+            return b.coverage - a.coverage || b.similarity - a.similarity || a.id - b.id;
+        });
+        return candidates.slice(0, suggestLimit).map(function (candidate) {
+            return {
+                text: index.phrases[candidate.id],
+                kind: index.kinds[candidate.id],
+                sessions: index.sessions[candidate.id]
+            };
+        });
+    }
+
+    function escapeHtml(value) {
+        return String(value).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+    }
+
+    // A hit opens the session's detail page when the static site is exported, otherwise its card in the lobby
+    function resultLink(docs, row) {
+        return sessionPages ? sessionPages + docs.id[row] + '.html' : '#session-' + docs.id[row];
+    }
+
+    function show(index, hits, suggestions) {
+        if (hits === null) {
+            results.hidden = true;
+            return;
+        }
+        var docs = index.docs;
+        shownSuggestions = suggestions;
+        results.innerHTML = suggestions.map(function (suggestion, position) {
+            return '<a class="search-suggestion" href="?q=' + encodeURIComponent(suggestion.text) +
+                '" data-suggestion="' + position + '">' + escapeHtml(suggestion.text) +
+                '<span class="search-result-meta">' + (SUGGESTION_KINDS[suggestion.kind] || suggestion.kind) +
+                ' · ' + suggestion.sessions + ' sessions</span></a>';
+        }).join('') + (hits.length ? hits.map(function (row) {
+            return '<a class="search-result" href="' + resultLink(docs, row) + '" data-session-id="' + docs.id[row] + '">' +
+                escapeHtml(docs.title[row]) +
+                '<span class="search-result-meta">' + escapeHtml(docs.speaker[row]) + ' · ' + escapeHtml(docs.time[row]) + '</span></a>';
+        }).join('') : '<div class="search-empty">No sessions match</div>');
+        results.hidden = false;
+    }
+
+    function update() {
+        var query = input.value;
+        Promise.all([loadIndex(), loadSuggestions()]).then(function (loaded) {
+            if (input.value !== query) return;
+            show(loaded[0], search(loaded[0], query), loaded[1] ? suggest(loaded[1], query) : []);
+        });
+    }
+
+    input.addEventListener('input', update);
+    input.addEventListener('focus', function () {
+        loadIndex();
+        loadSuggestions();
+    });
+    input.addEventListener('keydown', function (event) {
+        if (event.key === 'Escape') results.hidden = true;
+    });
+    results.addEventListener('click', function (event) {
+        var result = event.target.closest('.search-result');
+        if (result && result.getAttribute('href').charAt(0) === '#') {
+            var card = document.querySelector('.session-card[data-session-id="' + result.getAttribute('data-session-id') + '"]');
+            if (card) {
+                event.preventDefault();
+                results.hidden = true;
+                card.scrollIntoView({behavior: 'smooth', block: 'center'});
+            }
+            return;
+        }
+        var item = event.target.closest('.search-suggestion');
+        if (!item) return;
+        event.preventDefault();
+        input.value = shownSuggestions[+item.getAttribute('data-suggestion')].text;
+        update();
+    });
+    document.addEventListener('click', function (event) {
+        if (!input.parentNode.contains(event.target)) results.hidden = true;
+    });
+
+    // Suggestions link to ?q=<phrase>, so an opened or shared link starts with that search
+    var initialQuery = new URLSearchParams(window.location.search).get('q');
+    if (initialQuery) {
+        input.value = initialQuery;
+        update();
+    }
+})();
+"""
+
+# Polls the live status feed (see lobby_feed.StatusFeed) and restyles and moves only the session cards whose
+# status changed, keeping section totals in step. Cards carry data-session-id and data-status for this.
+STATUS_FEED_SCRIPT = """
+(function () {
+    var script = document.currentScript;
+    var url = script.getAttribute('data-status-feed');
+    var interval = (parseFloat(script.getAttribute('data-poll-seconds')) || 15) * 1000;
+    var labels = JSON.parse(script.getAttribute('data-status-labels'));
+    var STATUS_SECTIONS = ['live', 'upcoming', 'finished'];
+    var version = 0;
+
+    // Mirrors LobbyRenderer.build_session_index: scheduled sessions sit in no status section
+    function sectionFor(status) {
+        if (status === 'live' || status === 'upcoming') return status;
+        return status === 'scheduled' ? null : 'finished';
+    }
+
+    function sectionElement(id) {
+        return id ? document.querySelector('.section[data-section="' + id + '"]') : null;
+    }
+
+    function restyle(card, status) {
+        var badge = card.querySelector('.session-status');
+        badge.className = 'session-status status-' + (labels.statusClasses[status] || 'finished');
+        badge.textContent = labels.statusTexts[status] || 'ENDED';
+        card.querySelector('.btn-primary').textContent = labels.buttonLabels[status] || 'View Details';
+        card.setAttribute('data-status', status);
+    }
+
+    function setTotals(totals) {
+        STATUS_SECTIONS.forEach(function (id) {
+            var section = sectionElement(id);
+            if (!section || totals[id] === undefined) return;
+            var limit = parseInt(section.getAttribute('data-limit'), 10);
+            section.setAttribute('data-total', totals[id]);
+            var link = section.querySelector('.view-all');
+            if (link) link.textContent = totals[id] > limit ? 'View all ' + totals[id] + ' →' : 'View all →';
+        });
+    }
+
+    function apply(changes) {
+        var placements = [];
+        Object.keys(changes).forEach(function (status) {
+            var target = sectionElement(sectionFor(status));
+            changes[status].forEach(function (id) {
+                var cards = document.querySelectorAll('.session-card[data-session-id="' + id + '"]');
+                var template = null, placed = false;
+                for (var i = 0; i < cards.length; i++) {
+                    var card = cards[i];
+                    var home = card.closest('.section[data-section]');
+                    if (home === target) placed = true;
+                    if (card.getAttribute('data-status') === status) continue;
+                    restyle(card, status);
+                    // Cards in a status section leave it; cards elsewhere (featured) stay and can seed the new section
+                    if (home && home !== target && STATUS_SECTIONS.indexOf(home.getAttribute('data-section')) >= 0) {
+                        card.parentNode.removeChild(card);
+                        template = template || card;
+                    } else {
+                        template = card;
+                    }
+                }
+                if (target && template && !placed) placements.push([target, template]);
+            });
+        });
+        // Cards are placed once every changed card has left its old section, so freed slots are reused
+        placements.forEach(function (placement) {
+            var grid = placement[0].querySelector('.sessions-grid'), card = placement[1];
+            if (grid && grid.children.length < parseInt(placement[0].getAttribute('data-limit'), 10)) {
+                grid.appendChild(card.parentNode ? card.cloneNode(true) : card);
+            }
+        });
+    }
+
+    function poll() {
+        if (document.hidden) return;
+        fetch(url + (url.indexOf('?') < 0 ? '?' : '&') + 'since=' + version, {cache: 'no-store'})
+            .then(function (response) { return response.ok ? response.json() : null; })
+            .then(function (feed) {
+                if (!feed || feed.version === version) return;
+                apply(feed.changes);
+                if (feed.totals) setTotals(feed.totals);
+                version = feed.version;
+                document.dispatchEvent(new CustomEvent('lobby-status', {detail: feed}));
+            })
+            .catch(function () {});
+    }
+
+    document.addEventListener('visibilitychange', poll);
+    setInterval(poll, interval);
+    poll();
+})();
+"""
+
+# Swaps the preset theme variable blocks (see LobbyRenderer.generate_presets_css) by setting data-theme on the
+# page root, and remembers the choice. It runs inside the header, so a saved theme applies before the page paints.
+THEME_SWITCHER_SCRIPT = """
+(function () {
+    var picker = document.currentScript.previousElementSibling;
+    var root = document.documentElement;
+    var saved = null;
+    try { saved = localStorage.getItem('lobby-theme'); } catch (e) {}
+    if (saved && picker.querySelector('option[value="' + saved + '"]')) {
+        root.setAttribute('data-theme', saved);
+        picker.value = saved;
+    }
+    picker.addEventListener('change', function () {
+        if (picker.value) root.setAttribute('data-theme', picker.value); else root.removeAttribute('data-theme');
+        try { localStorage.setItem('lobby-theme', picker.value); } catch (e) {}
+    });
+})();
+"""
+
+# Registers the exported service worker once the page has loaded, so it never competes with the first paint.
+# Pages opened from disk or in the customizer preview cannot host a service worker and are skipped.
+SERVICE_WORKER_REGISTRATION_SCRIPT = """
+(function () {
+    var script = document.currentScript;
+    if (!('serviceWorker' in navigator) || !/^https?:$/.test(location.protocol)) return;
+    window.addEventListener('load', function () {
+        navigator.serviceWorker.register(script.getAttribute('data-service-worker')).catch(function () {});
+    });
+})();
+"""
+
+# Service worker shipped as its own file, after CACHE_VERSION and PRECACHE_MANIFEST declarations (see
+# lobby_offline.service_worker_source). Installing precaches every file in the manifest under a cache named
+# by the version; activating drops this lobby's older caches. Files whose names carry their content hash are
+# served from the cache outright; the lobby, its indexes and visited site pages are served from the cache and
+# revalidated in the background. Requests with a query string, such as status feed polls, go to the network.
+SERVICE_WORKER_SCRIPT = """
+var CACHE_PREFIX = 'lobby:' + self.registration.scope + ':';
+var CACHE_NAME = CACHE_PREFIX + CACHE_VERSION;
+var scope = self.registration.scope;
+var manifestUrl = new URL(PRECACHE_MANIFEST, scope).href;
+var indexUrl = new URL('index.html', scope).href;
+var precached = null;
+
+// Precached files by absolute URL, read back from the cache since the worker may restart at any time
+function loadManifest() {
+    if (!precached) {
+        precached = caches.open(CACHE_NAME).then(function (cache) {
+            return cache.match(manifestUrl);
+        }).then(function (response) {
+            return response ? response.json() : {files: []};
+        }).then(function (manifest) {
+            var files = {};
+            manifest.files.forEach(function (file) { files[new URL(file.url, scope).href] = file; });
+            return files;
+        });
+    }
+    return precached;
+}
+
+self.addEventListener('install', function (event) {
+    event.waitUntil(fetch(manifestUrl, {cache: 'no-store'}).then(function (response) {
+        if (!response.ok) throw new Error('Precache manifest unavailable');
+        return response.clone().json().then(function (manifest) {
+            return caches.open(CACHE_NAME).then(function (cache) {
+                return cache.addAll(manifest.files.map(function (file) {
+                    return new Request(new URL(file.url, scope).href, {cache: file.immutable ? 'default' : 'no-cache'});
+                })).then(function () {
+                    return cache.put(manifestUrl, response);
+                });
+            });
+        });
+    }).then(function () {
+        return self.skipWaiting();
+    }));
+});
+
+self.addEventListener('activate', function (event) {
+    event.waitUntil(caches.keys().then(function (names) {
+        return Promise.all(names.filter(function (name) {
+            return name.indexOf(CACHE_PREFIX) === 0 && name !== CACHE_NAME;
+        }).map(function (name) {
+            return caches.delete(name);
+        }));
+    }).then(function () {
+        return self.clients.claim();
+    }));
+});
+
+function cacheFirst(request, key) {
+    return caches.open(CACHE_NAME).then(function (cache) {
+        return cache.match(key).then(function (cached) {
+            return cached || fetch(request).then(function (response) {
+                if (response.ok) cache.put(key, response.clone());
+                return response;
+            });
+        });
+    });
+}
+
+function staleWhileRevalidate(event, request, key) {
+    return caches.open(CACHE_NAME).then(function (cache) {
+        return cache.match(key).then(function (cached) {
+            var network = fetch(request).then(function (response) {
+                if (!response.ok) return response;
+                return cache.put(key, response.clone()).then(function () { return response; });
+            });
+            if (cached) {
+                event.waitUntil(network.catch(function () {}));
+                return cached;
+            }
+            // Offline and never visited: navigations fall back to the lobby itself
+            return network.catch(function () {
+                return request.mode === 'navigate' ? cache.match(indexUrl).then(function (lobby) {
+                    return lobby || Response.error();
+                }) : Response.error();
+            });
+        });
+    });
+}
+
+self.addEventListener('fetch', function (event) {
+    var request = event.request;
+    var url = request.url.split('#')[0];
+    if (request.method !== 'GET' || url.indexOf(scope) !== 0 || url.indexOf('?') >= 0) return;
+    var key = url === scope ? indexUrl : url;
+    event.respondWith(loadManifest().then(function (files) {
+        var file = files[key];
+        if (file && file.immutable) return cacheFirst(request, key);
+        if (file || request.mode === 'navigate' || /\\.html$/.test(key)) return staleWhileRevalidate(event, request, key);
+        return fetch(request);
+    }));
+});
+"""
@@ -0,0 +1,270 @@
+"""Inverted search index over session data, exported with the lobby for client-side search"""
+import re
+from bisect import bisect_left
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+# Session columns whose words are indexed; list columns such as tags are indexed item by item
+SEARCH_COLUMNS = ['title', 'speaker', 'company', 'description', 'track', 'tags']
+
+# Package file holding the exported search index
+SEARCH_INDEX_FILE = "search-index.json"
+
+# Maximum number of matching sessions returned for one query
+SEARCH_RESULT_LIMIT = 50
+
+# Words are runs of letters, digits and underscores, compared case-insensitively
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Session columns whose distinct values are offered as autocomplete suggestions
+SUGGESTION_COLUMNS = ['title', 'speaker', 'company', 'tags']
+
+# Package file holding the exported suggestion index
+SUGGESTION_INDEX_FILE = "suggest-index.json"
+
+# Most frequent phrases kept in the suggestion index, which bounds its size on very large events
+SUGGESTION_PHRASE_LIMIT = 5000
+
+# Suggestions returned per query, and the share of query trigrams a phrase must contain to be suggested
+SUGGESTION_LIMIT = 8
+SUGGESTION_MIN_SIMILARITY = 0.5
+
+
+def tokenize(text):
+    """Split text into lowercase words"""
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def column_pairs(values, vocabulary):
+    """Return the row positions and term ids of every word in one column
+
+    Each distinct value is tokenized once; term ids index into vocabulary,
+    which grows as new words are seen.
+    """
+    if values.dtype == object:
+        values = pd.Series(
+            [' '.join(map(str, value)) if isinstance(value, (list, tuple)) else value for value in values.tolist()],
+            dtype=object
+        )
+    codes, uniques = pd.factorize(values.fillna('').astype(str))
+    unique_ids = [[vocabulary.setdefault(term, len(vocabulary)) for term in tokenize(unique)] for unique in uniques]
+
+    lengths = np.array([len(ids) for ids in unique_ids], dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    flat_ids = np.fromiter((term_id for ids in unique_ids for term_id in ids), dtype=np.int64, count=lengths.sum())
+
+    # Expand every row into one entry per word of its value, without a Python loop over rows
+    counts = lengths[codes]
+    rows = np.repeat(np.arange(len(codes)), counts)
+    within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return rows, flat_ids[np.repeat(offsets[codes], counts) + within]
+
+
+def encode_postings(rows, starts):
+    """Gap-encode ascending row positions per term, collapsing runs of consecutive rows
+
+    Each posting list starts with an absolute row position; after that a
+    positive value is the gap to the next row and a negative value -k stands
+    for k consecutive rows. Returns the encoded values and each term's start.
+    """
+    gaps = np.diff(rows, prepend=0)
+    gaps[starts] = rows[starts]
+
+    ones = gaps == 1
+    ones[starts] = False
+    run_starts = ones & ~np.r_[False, ones[:-1]]
+    run_ids = np.cumsum(run_starts)
+    run_lengths = np.bincount(run_ids[ones], minlength=run_ids[-1] + 1)
+
+    gaps[run_starts] = -run_lengths[run_ids[run_starts]]
+    keep = ~ones | run_starts
+    return gaps[keep], (np.cumsum(keep) - 1)[starts]
+
+
+def build_search_index(session_data):
+    """Build an inverted index from words to the row positions of the sessions containing them
+
+    Terms are sorted so prefix queries are a binary search plus a scan, and
+    posting lists are gap- and run-length-encoded to keep the exported JSON small.
+    """
+    vocabulary = {}
+    row_parts = []
+    term_parts = []
+    for column in SEARCH_COLUMNS:
+        if column in session_data:
+            rows, term_ids = column_pairs(session_data[column], vocabulary)
+            row_parts.append(rows)
+            term_parts.append(term_ids)
+
+    size = len(session_data)
+    if not vocabulary or not size:
+        return {'size': size, 'terms': [], 'postings': []}
+
+    terms = sorted(vocabulary)
+    ranks = np.empty(len(vocabulary), dtype=np.int64)
+    ranks[[vocabulary[term] for term in terms]] = np.arange(len(terms))
+
+    # One sort over (term rank, row) keys orders every posting at once; repeats are then adjacent
+    keys = np.sort(ranks[np.concatenate(term_parts)] * size + np.concatenate(row_parts))
+    keys = keys[np.r_[True, keys[1:] != keys[:-1]]]
+    term_ranks = keys // size
+    starts = np.flatnonzero(np.r_[True, term_ranks[1:] != term_ranks[:-1]])
+    encoded, encoded_starts = encode_postings(keys % size, starts)
+
+    values = encoded.tolist()
+    bounds = encoded_starts.tolist() + [len(values)]
+    return {
+        'size': size,
+        'terms': [terms[rank] for rank in term_ranks[starts].tolist()],
+        'postings': [values[begin:end] for begin, end in zip(bounds, bounds[1:])]
+    }
+
+
+def decode_postings(posting_lists):
+    """Turn encoded posting lists back into row positions, concatenated in list order"""
+    if not posting_lists:
+        return np.array([], dtype=np.int64)
+    lengths = np.array([len(encoded) for encoded in posting_lists], dtype=np.int64)
+    encoded = np.fromiter(chain.from_iterable(posting_lists), dtype=np.int64, count=lengths.sum())
+
+    runs = encoded < 0
+    repeats = np.where(runs, -encoded, 1)
+    steps = np.repeat(np.where(runs, 1, encoded), repeats)
+    totals = np.cumsum(steps)
+
+    # Each list's first value is absolute, so restart the running sum at every list boundary
+    expanded_lengths = np.add.reduceat(repeats, np.cumsum(lengths) - lengths)
+    expanded_starts = np.cumsum(expanded_lengths) - expanded_lengths
+    bases = np.where(expanded_starts > 0, totals[expanded_starts - 1], 0)
+    return totals - np.repeat(bases, expanded_lengths)
+
+
+def search(index, query, limit=SEARCH_RESULT_LIMIT):
+    """Return row positions of sessions containing a word starting with every query word, in row order
+
+    This is the reference for the bundled client-side search script and
+    follows the same matching rules.
+    """
+    words = tokenize(query)
+    if not words:
+        return []
+
+    terms = index['terms']
+    matches = np.ones(index['size'], dtype=bool)
+    for word in words:
+        word_matches = np.zeros(index['size'], dtype=bool)
+        first = bisect_left(terms, word)
+        last = first
+        while last < len(terms) and terms[last].startswith(word):
+            last += 1
+        word_matches[decode_postings(index['postings'][first:last])] = True
+        matches &= word_matches
+
+    return np.flatnonzero(matches)[:limit].tolist()
+
+
+def trigrams(text):
+    """Return the set of three-character grams of every word, padded so word starts and ends count"""
+    grams = set()
+    for word in tokenize(text):
+        padded = f"  {word} "
+        grams.update(padded[position:position + 3] for position in range(len(padded) - 2))
+    return grams
+
+
+def suggestion_phrases(session_data, limit=SUGGESTION_PHRASE_LIMIT):
+    """Return the distinct phrases worth suggesting with their kind and session count, most frequent first"""
+    counts = []
+    for column in SUGGESTION_COLUMNS:
+        if column not in session_data:
+            continue
+        values = session_data[column].explode() if session_data[column].dtype == object else session_data[column]
+        values = values.dropna().astype(str).str.strip()
+        column_counts = values[values != ''].value_counts(sort=False)
+        counts.append(pd.DataFrame({'phrase': column_counts.index, 'kind': column, 'sessions': column_counts.to_numpy()}))
+
+    if not counts:
+        return pd.DataFrame(columns=['phrase', 'kind', 'sessions'])
+
+    phrases = pd.concat(counts, ignore_index=True)
+    phrases = phrases[phrases['phrase'].astype(str).str.contains(TOKEN_PATTERN)]
+    # A phrase seen in several columns (a speaker who is also a tag) is suggested once, under its commonest use
+    phrases = phrases.sort_values('sessions', ascending=False, kind='stable').drop_duplicates('phrase')
+    return phrases.head(limit).reset_index(drop=True)
+
+
+def build_suggestion_index(session_data, limit=SUGGESTION_PHRASE_LIMIT):
+    """Build a trigram index over the most frequent session titles, speakers, companies and tags
+
+    Phrases are stored most frequent first, so phrase ids double as a
+    popularity rank, and each trigram maps to the ids of the phrases that
+    contain it, encoded like search postings.
+    """
+    phrases = suggestion_phrases(session_data, limit)
+    phrase_grams = [sorted(trigrams(phrase)) for phrase in phrases['phrase'].tolist()]
+    index = {
+        'phrases': phrases['phrase'].tolist(),
+        'kinds': phrases['kind'].tolist(),
+        'sessions': phrases['sessions'].astype(int).tolist(),
+        'sizes': [len(grams) for grams in phrase_grams],
+        'trigrams': [],
+        'postings': []
+    }
+    if not phrase_grams:
+        return index
+
+    vocabulary = sorted({gram for grams in phrase_grams for gram in grams})
+    ranks = {gram: rank for rank, gram in enumerate(vocabulary)}
+    size = len(phrase_grams)
+    keys = np.sort(np.fromiter(
+        (ranks[gram] * size + phrase_id for phrase_id, grams in enumerate(phrase_grams) for gram in grams),
+        dtype=np.int64
+    ))
+    gram_ranks = keys // size
+    starts = np.flatnonzero(np.r_[True, gram_ranks[1:] != gram_ranks[:-1]])
+    encoded, encoded_starts = encode_postings(keys % size, starts)
+
+    values = encoded.tolist()
+    bounds = encoded_starts.tolist() + [len(values)]
+    index['trigrams'] = [vocabulary[rank] for rank in gram_ranks[starts].tolist()]
+    index['postings'] = [values[begin:end] for begin, end in zip(bounds, bounds[1:])]
+    return index
+
+
+def suggest(index, query, limit=SUGGESTION_LIMIT, min_similarity=SUGGESTION_MIN_SIMILARITY):
+    """Return ranked, typo-tolerant suggestions for a partial query
+
+    A phrase qualifies when it contains at least min_similarity of the
+    query's trigrams. Candidates rank by that share, then by trigram
+    similarity of the whole phrase (shorter, closer phrases first), then by
+    popularity. This is the reference for the bundled client-side engine.
+    """
+    query_grams = trigrams(query)
+    if not query_grams or not index['phrases']:
+        return []
+
+    shared = np.zeros(len(index['phrases']), dtype=np.int64)
+    gram_list = index['trigrams']
+    for gram in query_grams:
+        position = bisect_left(gram_list, gram)
+        if position < len(gram_list) and gram_list[position] == gram:
+            shared[decode_postings([index['postings'][position]])] += 1
+
+    sizes = np.asarray(index['sizes'], dtype=np.int64)
+    coverage = shared / len(query_grams)
+    similarity = shared / (len(query_grams) + sizes - shared)
+    candidates = np.flatnonzero(coverage >= min_similarity)
+    # Phrase ids are already in popularity order, so they are the final tie-breaker
+    order = np.lexsort((candidates, -similarity[candidates], -coverage[candidates]))
+
+    return [
+        {
+            'text': index['phrases'][phrase_id],
+            'kind': index['kinds'][phrase_id],
+            'sessions': index['sessions'][phrase_id],
+            'score': round(float(coverage[phrase_id]), 4)
+        }
+        for phrase_id in candidates[order][:limit].tolist()
+    ]
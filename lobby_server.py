@@ -0,0 +1,266 @@
+"""Local preview server and lightweight origin for lobby packages: strong ETags, conditional GET and compression"""
+import hashlib
+import math
+import mimetypes
+import os
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from lobby_compress import COMPRESSIBLE_EXTENSIONS, compress, compression_encodings
+from lobby_renderer import LobbyRenderer, RenderCache, fingerprint_config, package_timestamp
+
+# Minimum seconds between checks of the event's input files, so bursts of requests share one check
+SERVE_REFRESH_SECONDS = 1.0
+
+# Cache-Control for files named by their content hash, and for everything else, which is revalidated by ETag
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Content types the standard library does not know, or knows under older names
+CONTENT_TYPES = {
+    '.js': 'text/javascript',
+    '.json': 'application/json',
+    '.md': 'text/markdown',
+    '.webp': 'image/webp',
+    '.avif': 'image/avif'
+}
+
+# Encodings tried for each response, most compact first
+ENCODING_PREFERENCE = ['br', 'gzip']
+
+
+def content_type(file_name):
+    """Return the Content-Type header for a package file, with a charset for text"""
+    extension = os.path.splitext(file_name)[1].lower()
+    mime_type = CONTENT_TYPES.get(extension) or mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+    text = mime_type.startswith('text/') or mime_type in ('application/json', 'application/xml', 'image/svg+xml')
+    return f"{mime_type}; charset=utf-8" if text else mime_type
+
+
+def accepted_encodings(header):
+    """Return the content codings an Accept-Encoding header allows, leaving out any given q=0"""
+    accepted = set()
+    for part in (header or '').split(','):
+        coding, _, parameters = part.strip().partition(';')
+        quality = 1.0
+        for parameter in parameters.split(';'):
+            name, _, value = parameter.strip().partition('=')
+            if name.lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.strip().lower())
+    if '*' in accepted:
+        accepted.update(ENCODING_PREFERENCE)
+    return accepted
+
+
+def etag_matches(header, etag):
+    """Return whether an If-None-Match header matches an ETag, comparing weakly as RFC 9110 requires"""
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return etag in (candidate.strip().removeprefix('W/') for candidate in header.split(','))
+
+
+class PackageSource:
+    """An event's package, rendered on demand and kept until the event's inputs change
+
+    Each check reloads the input files if their modification times changed, then
+    compares the fingerprint of what the renderer would produce (config,
+    session data with computed statuses, speaker data and processed images)
+    with the last render's. Only a changed fingerprint re-renders, and the
+    render cache is shared across renders, so unchanged fragments are reused.
+    """
+
+    def __init__(self, event_dir, load_event, input_files, log=None):
+        self.event_dir = event_dir
+        self.load_event = load_event
+        self.input_files = input_files
+        self.log = log
+        self.cache = RenderCache()
+        self.lock = threading.Lock()
+        # Modification times of the input files when last checked, and when last loaded
+        self.observed = None
+        self.modified = None
+        self.inputs = None
+        self.fingerprint = None
+        self.files = {}
+        self.checked = 0.0
+        self.renders = 0
+
+    def input_times(self):
+        """Return the modification time of each of the event's input files"""
+        return {
+            file_name: os.stat(os.path.join(self.event_dir, file_name)).st_mtime_ns for file_name in self.input_files
+        }
+
+    def package(self):
+        """Return the package as {file name: entry}, re-rendering first if the inputs have changed
+
+        Changed inputs are reloaded once their modification times have held
+        still between two checks, so a save in progress is not read. If the
+        reload or render fails, the last good package keeps being served.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self.files and now - self.checked < SERVE_REFRESH_SECONDS:
+                return self.files
+            self.checked = now
+
+            try:
+                times = self.input_times()
+                settled = times == self.observed
+                self.observed = times
+                # The first load cannot wait, as there is nothing to serve until it succeeds
+                if times != self.modified and (settled or self.modified is None):
+                    self.modified = times
+                    self.inputs = self.load_event(self.event_dir)
+                if self.inputs is None:
+                    return self.files
+
+                config, session_data, speaker_data = self.inputs
+                renderer = LobbyRenderer(config, session_data, speaker_data, cache=self.cache, base_dir=self.event_dir)
+                fingerprint = fingerprint_config([
+                    fingerprint_config(config), renderer.session_fingerprint(), renderer.speaker_fingerprint(),
+                    renderer.image_fingerprint()
+                ])
+                if fingerprint != self.fingerprint:
+                    # Recorded first, so inputs that fail to render are reported once rather than on every check
+                    self.fingerprint = fingerprint
+                    self.files = self.render(renderer)
+            except Exception as e:
+                # Typically a file caught mid-save or left malformed; its next save triggers another reload
+                if self.log:
+                    self.log(f"Render failed, keeping the previous package: {type(e).__name__}: {e}")
+            return self.files
+
+    def render(self, renderer):
+        """Render every package file and return the entries the server answers from
+
+        An entry holds the file's bytes, a strong ETag (the content's
+        digest), headers, and its compressed forms: precompressed siblings
+        from the package when there are any, otherwise filled in on first
+        request.
+        """
+        started = time.perf_counter()
+        package = renderer.package_files(package_timestamp())
+        hashed = {asset['file'] for asset in renderer.asset_manifest().values()} if renderer.asset_manifest_enabled() else set()
+
+        files = {}
+        for file_name, content in package:
+            data = content if isinstance(content, bytes) else content.encode('utf-8')
+            files[file_name] = {
+                'data': data,
+                'etag': f'"{hashlib.sha256(data).hexdigest()[:32]}"',
+                'type': content_type(file_name),
+                'cache_control': IMMUTABLE_CACHE_CONTROL if file_name in hashed else REVALIDATE_CACHE_CONTROL,
+                'compressible': file_name.endswith(COMPRESSIBLE_EXTENSIONS),
+                'encoded': {}
+            }
+        for file_name, entry in files.items():
+            for encoding, suffix in compression_encodings():
+                if file_name + suffix in files:
+                    entry['encoded'][encoding] = files[file_name + suffix]['data']
+
+        self.renders += 1
+        if self.log:
+            total = sum(len(entry['data']) for entry in files.values())
+            self.log(f"Rendered {len(files):,} files ({total / 1e6:.2f} MB) in {time.perf_counter() - started:.2f}s")
+        return files
+
+    def encoded(self, entry, encoding):
+        """Return a file's bytes in a content coding, compressing on first request; None if it would not shrink"""
+        if encoding not in entry['encoded']:
+            data = compress(entry['data'], encoding)
+            entry['encoded'][encoding] = data if len(data) < len(entry['data']) else None
+        return entry['encoded'][encoding]
+
+
+class PackageHandler(BaseHTTPRequestHandler):
+    """Answers GET and HEAD from a PackageSource with ETags, 304s and negotiated compression, logging latency"""
+
+    server_version = "LobbyServer"
+
+    def __init__(self, *args, source, **kwargs):
+        self.source = source
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        self.respond()
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def negotiate(self, entry):
+        """Return the preferred content coding the client accepts and that shrinks the file, or None"""
+        if not entry['compressible']:
+            return None
+        accepted = accepted_encodings(self.headers.get('Accept-Encoding'))
+        available = {encoding for encoding, _ in compression_encodings()}
+        for encoding in ENCODING_PREFERENCE:
+            if encoding in accepted and encoding in available and self.source.encoded(entry, encoding) is not None:
+                return encoding
+        return None
+
+    def respond(self, send_body=True):
+        started = time.perf_counter()
+        path = unquote(urlsplit(self.path).path).lstrip('/')
+        if path == '' or path.endswith('/'):
+            path += 'index.html'
+        files = self.source.package()
+        entry = files.get(path)
+
+        encoding = None
+        if not files:
+            # The event has never loaded and rendered; the server log says why
+            status, body = 503, b"Service Unavailable"
+            headers = {'Content-Type': 'text/plain; charset=utf-8', 'Retry-After': str(math.ceil(SERVE_REFRESH_SECONDS))}
+        elif entry is None:
+            status, body = 404, b"Not Found"
+            headers = {'Content-Type': 'text/plain; charset=utf-8'}
+        else:
+            encoding = self.negotiate(entry)
+            # Each representation gets its own strong ETag, so caches never mix compressed and plain bytes
+            etag = entry['etag'] if encoding is None else f"{entry['etag'][:-1]}-{encoding}\""
+            headers = {'ETag': etag, 'Cache-Control': entry['cache_control']}
+            if entry['compressible']:
+                headers['Vary'] = 'Accept-Encoding'
+            if etag_matches(self.headers.get('If-None-Match'), etag):
+                status, body = 304, b""
+            else:
+                status = 200
+                body = entry['data'] if encoding is None else self.source.encoded(entry, encoding)
+                headers['Content-Type'] = entry['type']
+                if encoding is not None:
+                    headers['Content-Encoding'] = encoding
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body and status != 304:
+            self.wfile.write(body)
+        self.log_message(
+            '"%s" %d %d %s %.1fms', self.requestline, status, len(body), encoding or '-',
+            (time.perf_counter() - started) * 1000
+        )
+
+    def log_request(self, code='-', size='-'):
+        # respond() logs each request once it has been answered, with its latency
+        pass
+
+
+def serve_package(source, host="127.0.0.1", port=8000):
+    """Serve an event's package until interrupted"""
+    handler = partial(PackageHandler, source=source)
+    with ThreadingHTTPServer((host, port), handler) as server:
+        server.serve_forever()
@@ -0,0 +1,125 @@
+"""Static site pages: paginated section listings, session and speaker detail pages, and a sitemap"""
+import math
+import re
+import unicodedata
+from xml.sax.saxutils import escape
+
+# Static site settings used when the config has no advanced.static_site section
+DEFAULT_STATIC_SITE = {
+    'enabled': False,
+    'page_size': 48,
+    'base_url': ''
+}
+
+# Package directories holding listing pages and detail pages; every site page sits one level deep
+SITE_SECTION_DIR = "sections"
+SITE_SESSION_DIR = "sessions"
+SITE_SPEAKER_DIR = "speakers"
+
+# Listing of every session, in data order, alongside the lobby's status sections
+ALL_SESSIONS_SECTION = 'all'
+ALL_SESSIONS_INFO = {'title': 'All Sessions', 'subtitle': 'Every session on the programme'}
+
+# Navigation tabs that link to a site page, by tab text
+NAV_TAB_PAGES = {
+    'Lobby': 'index.html',
+    'All Sessions': f"{SITE_SECTION_DIR}/{ALL_SESSIONS_SECTION}.html",
+    'Speakers': f"{SITE_SECTION_DIR}/speakers.html"
+}
+
+# Package file listing every page for search engines, and the most URLs one sitemap file may hold
+SITEMAP_FILE = "sitemap.xml"
+SITEMAP_URL_LIMIT = 50000
+
+# Pages linked either side of the current one in a listing's pager
+PAGINATION_WINDOW = 2
+
+SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+def static_site_settings(config):
+    """Return the advanced.static_site section of a config merged over the defaults"""
+    return {**DEFAULT_STATIC_SITE, **config.get('advanced', {}).get('static_site', {})}
+
+
+def slugify(text, fallback='page'):
+    """Return text as a lowercase ASCII slug such as 'dr-sarah-chen'"""
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return SLUG_PATTERN.sub('-', text.lower()).strip('-') or fallback
+
+
+def unique_slugs(names, fallback='page'):
+    """Return one slug per name, numbering repeats ('jane-doe', 'jane-doe-2') so every page name is unique"""
+    slugs = []
+    taken = set()
+    for name in names:
+        slug = base = slugify(name, fallback)
+        number = 1
+        while slug in taken:
+            number += 1
+            slug = f"{base}-{number}"
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def page_count(total, page_size):
+    """Return the number of listing pages for total items; an empty listing still has one page"""
+    return max(1, math.ceil(total / page_size))
+
+
+def listing_page(section_id, page=1):
+    """Return the package path of one page of a section listing, e.g. sections/live-2.html"""
+    suffix = '' if page == 1 else f"-{page}"
+    return f"{SITE_SECTION_DIR}/{section_id}{suffix}.html"
+
+
+def pagination_html(section_id, page, pages):
+    """Return the pager linking a listing page to its neighbours, first and last pages, or nothing for one page"""
+    if pages == 1:
+        return ''
+
+    shown = sorted({1, pages} | set(range(max(1, page - PAGINATION_WINDOW), min(pages, page + PAGINATION_WINDOW) + 1)))
+    links = []
+    if page > 1:
+        links.append(f'<a href="{listing_page(section_id, page - 1)}" rel="prev">← Previous</a>')
+    previous = 0
+    for number in shown:
+        if number > previous + 1:
+            links.append('<span class="gap">…</span>')
+        if number == page:
+            links.append(f'<span class="current" aria-current="page">{number}</span>')
+        else:
+            links.append(f'<a href="{listing_page(section_id, number)}">{number}</a>')
+        previous = number
+    if page < pages:
+        links.append(f'<a href="{listing_page(section_id, page + 1)}" rel="next">Next →</a>')
+    return f'<nav class="pagination" aria-label="Pages">{"".join(links)}</nav>'
+
+
+def page_url(path, base_url):
+    """Return a package path as a URL under base_url; the lobby itself is the site root"""
+    path = '' if path == 'index.html' else path
+    return f"{base_url.rstrip('/')}/{path}" if base_url else path or 'index.html'
+
+
+def sitemap_files(paths, base_url):
+    """Return the (file name, XML) pairs of the sitemap for the given package paths
+
+    Up to SITEMAP_URL_LIMIT pages fit in sitemap.xml itself; larger sites
+    get numbered sitemaps with sitemap.xml as their index.
+    """
+    def urlset(chunk):
+        urls = ''.join(f"  <url><loc>{escape(page_url(path, base_url))}</loc></url>\n" for path in chunk)
+        return f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n{urls}</urlset>\n'
+
+    if len(paths) <= SITEMAP_URL_LIMIT:
+        return [(SITEMAP_FILE, urlset(paths))]
+
+    files = [
+        (f"sitemap-{number}.xml", urlset(paths[start:start + SITEMAP_URL_LIMIT]))
+        for number, start in enumerate(range(0, len(paths), SITEMAP_URL_LIMIT), start=1)
+    ]
+    sitemaps = ''.join(f"  <sitemap><loc>{escape(page_url(file_name, base_url))}</loc></sitemap>\n" for file_name, _ in files)
+    index = f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n{sitemaps}</sitemapindex>\n'
+    return [(SITEMAP_FILE, index)] + files
@@ -0,0 +1,884 @@
+"""Static stylesheets bundled into generated lobby pages, and the rule-level CSS handling applied to them"""
+import re
+
+# Layout and component rules shared by every lobby; generate_css adds the configurable colors and sizes on top.
+BASE_CSS = """/* Base styles from original lobby */
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+.header {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
+}
+
+.header-info {
+    display: flex;
+    align-items: center;
+    gap: 20px;
+    font-size: 14px;
+}
+
+.nav-tabs {
+    border-bottom: 1px solid var(--nav-border);
+    display: flex;
+    gap: 40px;
+    padding: 0 40px;
+}
+
+.nav-tab {
+    padding: 15px 0;
+    font-weight: 600;
+    cursor: pointer;
+    border-bottom: 3px solid transparent;
+    transition: all 0.3s ease;
+}
+
+.nav-tab.active {
+    border-bottom-color: var(--nav-active);
+}
+
+.masthead {
+    text-align: center;
+    position: relative;
+    overflow: hidden;
+}
+
+.masthead-content {
+    position: relative;
+    z-index: 1;
+}
+
+.event-stats {
+    display: flex;
+    justify-content: center;
+    gap: 40px;
+    margin-top: 30px;
+}
+
+.stat {
+    text-align: center;
+}
+
+.stat-number {
+    font-size: 32px;
+    font-weight: bold;
+    display: block;
+}
+
+.stat-label {
+    font-size: 14px;
+    opacity: 0.8;
+}
+
+.quick-actions {
+    box-shadow: 0 4px 20px rgba(0,0,0,0.08);
+    display: flex;
+    gap: 20px;
+    align-items: center;
+    flex-wrap: wrap;
+    margin-bottom: 40px;
+}
+
+.search-container {
+    position: relative;
+    flex: 1;
+    max-width: 400px;
+}
+
+.search-input {
+    width: 100%;
+    padding: 12px 20px 12px 45px;
+    border: 2px solid #e5e7eb;
+    border-radius: 25px;
+    font-size: 14px;
+    background: #f9fafb;
+}
+
+.search-icon {
+    position: absolute;
+    left: 15px;
+    top: 50%;
+    transform: translateY(-50%);
+    color: #9ca3af;
+}
+
+.search-results {
+    position: absolute;
+    top: calc(100% + 6px);
+    left: 0;
+    right: 0;
+    z-index: 20;
+    max-height: 360px;
+    overflow-y: auto;
+    background: white;
+    border: 1px solid #e5e7eb;
+    border-radius: 12px;
+    box-shadow: 0 10px 25px rgba(0, 0, 0, 0.1);
+}
+
+.search-result, .search-suggestion {
+    display: block;
+    padding: 10px 16px;
+    color: inherit;
+    text-decoration: none;
+    font-size: 14px;
+}
+
+.search-result:hover, .search-suggestion:hover {
+    background: #f3f4f6;
+}
+
+.search-suggestion {
+    font-weight: 600;
+}
+
+.search-result-meta {
+    display: block;
+    font-size: 12px;
+    color: #6b7280;
+}
+
+.search-empty {
+    padding: 10px 16px;
+    font-size: 14px;
+    color: #6b7280;
+}
+
+.filter-btn {
+    padding: 10px 20px;
+    border: 2px solid #e5e7eb;
+    background: white;
+    border-radius: 25px;
+    cursor: pointer;
+    font-weight: 500;
+    transition: all 0.3s ease;
+    font-size: 14px;
+}
+
+.filter-btn.active {
+    background: var(--primary-color);
+    color: white;
+    border-color: var(--primary-color);
+}
+
+.sessions-grid {
+    display: grid;
+    margin-bottom: 50px;
+}
+
+.session-card {
+    border: 2px solid transparent;
+    transition: all 0.3s ease;
+    position: relative;
+    overflow: hidden;
+}
+
+.session-card:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 8px 30px rgba(0,0,0,0.12);
+}
+
+.session-card.featured {
+    background: linear-gradient(135deg, #fef3c7 0%, #fbbf24 1%, white 1%);
+}
+
+.featured-badge {
+    position: absolute;
+    top: -2px;
+    left: 15px;
+    background: #fbbf24;
+    color: white;
+    padding: 4px 12px;
+    border-radius: 0 0 8px 8px;
+    font-size: 11px;
+    font-weight: bold;
+    text-transform: uppercase;
+}
+
+.session-status {
+    position: absolute;
+    top: 15px;
+    right: 15px;
+    padding: 4px 12px;
+    border-radius: 12px;
+    font-size: 12px;
+    font-weight: 600;
+    text-transform: uppercase;
+}
+
+.status-live {
+    background: #fee2e2;
+    color: #dc2626;
+}
+
+.status-finished {
+    background: #f3f4f6;
+    color: #6b7280;
+}
+
+.status-future {
+    background: #dbeafe;
+    color: #2563eb;
+}
+
+.session-actions {
+    display: flex;
+    gap: 10px;
+    align-items: center;
+}
+
+.btn-primary {
+    border: none;
+    padding: 12px 24px;
+    border-radius: 8px;
+    font-weight: 600;
+    cursor: pointer;
+    transition: all 0.3s ease;
+    flex: 1;
+}
+
+.bookmark-btn {
+    background: none;
+    border: none;
+    font-size: 20px;
+    cursor: pointer;
+    padding: 8px;
+    border-radius: 6px;
+    transition: all 0.3s ease;
+}
+
+.speakers-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
+    gap: 25px;
+}
+
+.speaker-card {
+    text-align: center;
+    box-shadow: 0 4px 20px rgba(0,0,0,0.08);
+    transition: all 0.3s ease;
+}
+
+.speaker-card:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 8px 30px rgba(0,0,0,0.12);
+}
+
+.speaker-avatar {
+    border-radius: 50%;
+    margin: 0 auto 15px;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    color: white;
+    font-size: 32px;
+    font-weight: bold;
+}
+
+.speaker-name {
+    font-size: 18px;
+    font-weight: bold;
+    margin-bottom: 5px;
+}
+
+.speaker-title {
+    font-size: 14px;
+    margin-bottom: 10px;
+}
+
+.speaker-sessions {
+    font-size: 12px;
+    color: var(--primary-color);
+    font-weight: 500;
+}
+
+.section {
+    margin-bottom: var(--section-spacing, 50px);
+}
+
+.section-header {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    margin-bottom: 25px;
+}
+
+.section-title {
+    font-weight: bold;
+}
+
+.section-subtitle {
+    font-size: 16px;
+    margin-top: 5px;
+}
+
+.view-all {
+    color: var(--primary-color);
+    text-decoration: none;
+    font-weight: 600;
+    padding: 8px 16px;
+    border-radius: 8px;
+    transition: background 0.3s ease;
+}
+
+.view-all:hover {
+    background: #f3f4f6;
+}
+
+@media (max-width: 768px) {
+    .header {
+        padding: 15px 20px;
+        flex-direction: column;
+        gap: 15px;
+    }
+    
+    .content {
+        padding: 20px;
+    }
+    
+    .sessions-grid {
+        grid-template-columns: 1fr;
+    }
+    
+    .quick-actions {
+        flex-direction: column;
+        align-items: stretch;
+    }
+    
+    .masthead {
+        padding: 40px 20px;
+    }
+    
+    .event-stats {
+        flex-direction: column;
+        gap: 20px;
+    }
+}
+"""
+
+# Themeable values as (custom property, config section, config key, unit); THEMED_CSS reads only these
+# properties, so a theme is just a :root block. ('masthead', 'background') resolves the background type.
+THEME_VARIABLES = [
+    ('--primary-color', 'colors', 'primary', ''),
+    ('--secondary-color', 'colors', 'secondary', ''),
+    ('--success-color', 'colors', 'success', ''),
+    ('--warning-color', 'colors', 'warning', ''),
+    ('--error-color', 'colors', 'error', ''),
+    ('--neutral-color', 'colors', 'neutral', ''),
+    ('--body-bg', 'colors', 'body_background', ''),
+    ('--text-primary', 'colors', 'text_primary', ''),
+    ('--text-secondary', 'colors', 'text_secondary', ''),
+    ('--header-bg', 'header', 'background_color', ''),
+    ('--header-text', 'header', 'text_color', ''),
+    ('--header-padding', 'header', 'padding', ''),
+    ('--logo-color', 'header', 'logo_color', ''),
+    ('--logo-size', 'header', 'logo_size', 'px'),
+    ('--masthead-bg', 'masthead', 'background', ''),
+    ('--masthead-text', 'masthead', 'text_color', ''),
+    ('--masthead-padding', 'masthead', 'padding', ''),
+    ('--masthead-title-size', 'masthead', 'title_size', 'px'),
+    ('--masthead-subtitle-size', 'masthead', 'subtitle_size', 'px'),
+    ('--nav-bg', 'navigation', 'background_color', ''),
+    ('--nav-border', 'navigation', 'border_color', ''),
+    ('--nav-height', 'navigation', 'height', 'px'),
+    ('--nav-text', 'navigation', 'text_color', ''),
+    ('--nav-font-size', 'navigation', 'font_size', 'px'),
+    ('--nav-active', 'navigation', 'active_color', ''),
+    ('--content-width', 'layout', 'content_width', 'px'),
+    ('--content-padding', 'layout', 'content_padding', 'px'),
+    ('--grid-columns', 'layout', 'grid_columns', ''),
+    ('--grid-gap', 'layout', 'grid_gap', 'px'),
+    ('--section-spacing', 'layout', 'section_spacing', 'px'),
+    ('--section-title-size', 'content', 'section_title_size', 'px'),
+    ('--section-title-color', 'content', 'section_title_color', ''),
+    ('--session-card-bg', 'session_card', 'background_color', ''),
+    ('--session-card-radius', 'session_card', 'border_radius', 'px'),
+    ('--session-card-padding', 'session_card', 'padding', 'px'),
+    ('--session-card-shadow', 'session_card', 'shadow_color', ''),
+    ('--session-card-duration', 'session_card', 'animation_duration', 's'),
+    ('--session-title-color', 'session_card', 'title_color', ''),
+    ('--session-text-color', 'session_card', 'text_color', ''),
+    ('--session-meta-color', 'session_card', 'meta_color', ''),
+    ('--button-bg', 'session_card', 'button_color', ''),
+    ('--button-text', 'session_card', 'button_text_color', ''),
+    ('--speaker-card-bg', 'speaker_card', 'background_color', ''),
+    ('--speaker-card-radius', 'speaker_card', 'border_radius', 'px'),
+    ('--speaker-card-padding', 'speaker_card', 'padding', 'px'),
+    ('--avatar-bg', 'speaker_card', 'avatar_color', ''),
+    ('--avatar-size', 'speaker_card', 'avatar_size', 'px'),
+    ('--speaker-name-color', 'speaker_card', 'name_color', ''),
+    ('--speaker-title-color', 'speaker_card', 'title_color', ''),
+    ('--quick-actions-bg', 'quick_actions', 'background_color', ''),
+    ('--quick-actions-radius', 'quick_actions', 'border_radius', 'px'),
+    ('--quick-actions-padding', 'quick_actions', 'padding', 'px')
+]
+
+# Preset palettes offered by the customizer and, with the theme switcher, swappable in the exported page
+THEME_PRESETS = {
+    'default': {'primary': '#667eea', 'secondary': '#764ba2', 'success': '#10b981', 'warning': '#fbbf24', 'error': '#ef4444'},
+    'green': {'primary': '#10b981', 'secondary': '#059669', 'success': '#34d399', 'warning': '#fbbf24', 'error': '#ef4444'},
+    'purple': {'primary': '#8b5cf6', 'secondary': '#7c3aed', 'success': '#10b981', 'warning': '#fbbf24', 'error': '#ef4444'},
+    'red': {'primary': '#ef4444', 'secondary': '#dc2626', 'success': '#10b981', 'warning': '#fbbf24', 'error': '#f87171'}
+}
+
+# Configurable component rules, written once against the THEME_VARIABLES custom properties
+THEMED_CSS = """/* Body */
+body {
+  background: var(--body-bg) !important;
+  font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+}
+
+/* Header */
+.header {
+  background: var(--header-bg) !important;
+  color: var(--header-text) !important;
+  padding: var(--header-padding) !important;
+}
+
+.logo {
+  color: var(--logo-color) !important;
+  font-size: var(--logo-size) !important;
+}
+
+/* Masthead */
+.masthead {
+  background: var(--masthead-bg) !important;
+  color: var(--masthead-text) !important;
+  padding: var(--masthead-padding) !important;
+}
+
+.masthead h1 {
+  font-size: var(--masthead-title-size) !important;
+}
+
+.masthead p {
+  font-size: var(--masthead-subtitle-size) !important;
+}
+
+/* Navigation */
+.nav-tabs {
+  background: var(--nav-bg) !important;
+  border-bottom-color: var(--nav-border) !important;
+  height: var(--nav-height) !important;
+}
+
+.nav-tab {
+  color: var(--nav-text) !important;
+  font-size: var(--nav-font-size) !important;
+}
+
+.nav-tab.active {
+  color: var(--nav-active) !important;
+  border-bottom-color: var(--nav-active) !important;
+}
+
+/* Content Layout */
+.content {
+  max-width: var(--content-width) !important;
+  padding: var(--content-padding) !important;
+}
+
+.sessions-grid {
+  grid-template-columns: var(--grid-columns) !important;
+  gap: var(--grid-gap) !important;
+}
+
+.section {
+  margin-bottom: var(--section-spacing) !important;
+}
+
+.section-title {
+  font-size: var(--section-title-size) !important;
+  color: var(--section-title-color) !important;
+}
+
+/* Session Cards */
+.session-card {
+  background: var(--session-card-bg) !important;
+  border-radius: var(--session-card-radius) !important;
+  padding: var(--session-card-padding) !important;
+  box-shadow: 0 4px 20px var(--session-card-shadow) !important;
+  transition: all var(--session-card-duration) ease !important;
+}
+
+.session-title {
+  color: var(--session-title-color) !important;
+}
+
+.session-description {
+  color: var(--session-text-color) !important;
+}
+
+.session-time, .session-speakers {
+  color: var(--session-meta-color) !important;
+}
+
+.btn-primary {
+  background: var(--button-bg) !important;
+  color: var(--button-text) !important;
+}
+
+/* Speaker Cards */
+.speaker-card {
+  background: var(--speaker-card-bg) !important;
+  border-radius: var(--speaker-card-radius) !important;
+  padding: var(--speaker-card-padding) !important;
+}
+
+.speaker-avatar {
+  background: var(--avatar-bg) !important;
+  width: var(--avatar-size) !important;
+  height: var(--avatar-size) !important;
+}
+
+.speaker-name {
+  color: var(--speaker-name-color) !important;
+}
+
+.speaker-title {
+  color: var(--speaker-title-color) !important;
+}
+
+/* Quick Actions */
+.quick-actions {
+  background: var(--quick-actions-bg) !important;
+  border-radius: var(--quick-actions-radius) !important;
+  padding: var(--quick-actions-padding) !important;
+}
+"""
+
+# Leading selectors of the header, navigation, masthead and quick actions, which render above the fold
+CRITICAL_SELECTORS = {
+    '*', ':root', 'html', 'body', '.header', '.logo', '.header-info', '.nav-tabs', '.nav-tab',
+    '.masthead', '.masthead-content', '.event-stats', '.stat', '.stat-number', '.stat-label',
+    '.quick-actions', '.search-container', '.search-input', '.search-icon', '.filter-btn', '.content'
+}
+
+# At-rules whose blocks hold further rules rather than declarations
+NESTING_AT_RULES = ('@media', '@supports', '@container', '@layer', '@document')
+
+COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
+LEADING_SELECTOR_PATTERN = re.compile(r"^(\*|:root|[.#]?[\w-]+)")
+
+# Pseudo-classes whose arguments are selectors; specificity is not worked out for selectors using them
+SELECTOR_FUNCTION_PATTERN = re.compile(r":(?:not|is|where|has|matches|host|host-context|slotted)\(", re.IGNORECASE)
+ATTRIBUTE_SELECTOR_PATTERN = re.compile(r"\[[^\]]*\]")
+PSEUDO_SELECTOR_PATTERN = re.compile(r"::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?")
+ID_CLASS_PATTERN = re.compile(r"([.#])([\w-]+)")
+TYPE_SELECTOR_PATTERN = re.compile(r"[a-zA-Z][\w-]*")
+
+# Pseudo-elements that may still be written with a single colon
+LEGACY_PSEUDO_ELEMENTS = {':before', ':after', ':first-line', ':first-letter'}
+
+IMPORTANT_PATTERN = re.compile(r"!\s*important\s*$", re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+QUOTED_PATTERN = re.compile(r"(\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*')")
+
+# Whitespace the minifier removes: around selector combinators and commas, and around the punctuation of
+# declaration blocks; spaces before a colon are kept, since "a :hover" and "a:hover" differ inside nested rules
+SELECTOR_SPACE_PATTERN = re.compile(r"\s*([>+~,])\s*")
+BLOCK_SPACE_PATTERN = re.compile(r"\s*([{};,])\s*|(:)\s+|\s+(!)\s*(?=important)")
+AT_RULE_SPACE_PATTERN = re.compile(r"\s*([:,])\s*|(\()\s+|\s+(\))")
+
+
+def skip_string(css, position):
+    """Return the position just past the quoted string starting at position"""
+    quote = css[position]
+    position += 1
+    while position < len(css) and css[position] != quote:
+        position += 2 if css[position] == '\\' else 1
+    return position + 1
+
+
+def parse_css(css, position=0, nested=False):
+    """Split a stylesheet into (prelude, body) rules, ignoring comments
+
+    A rule's body is its declaration text, a list of nested rules for
+    grouping at-rules such as @media, or None for statements such as
+    @import. Returns the rules, or (rules, end position) for a nested block.
+    """
+    rules = []
+    prelude_start = position
+    while position < len(css):
+        character = css[position]
+        if css.startswith('/*', position):
+            end = css.find('*/', position + 2)
+            position = len(css) if end < 0 else end + 2
+        elif character in '"\'':
+            position = skip_string(css, position)
+        elif character == ';':
+            prelude = COMMENT_PATTERN.sub('', css[prelude_start:position]).strip()
+            if prelude:
+                rules.append((prelude, None))
+            position += 1
+            prelude_start = position
+        elif character == '{':
+            prelude = ' '.join(COMMENT_PATTERN.sub('', css[prelude_start:position]).split())
+            if prelude.lower().startswith(NESTING_AT_RULES):
+                body, position = parse_css(css, position + 1, nested=True)
+            else:
+                body_start = position + 1
+                depth = 1
+                position += 1
+                while position < len(css) and depth:
+                    if css[position] in '"\'':
+                        position = skip_string(css, position)
+                        continue
+                    depth += {'{': 1, '}': -1}.get(css[position], 0)
+                    position += 1
+                body = COMMENT_PATTERN.sub('', css[body_start:position - 1]).strip()
+            rules.append((prelude, body))
+            prelude_start = position
+        elif character == '}' and nested:
+            return rules, position + 1
+        else:
+            position += 1
+    return (rules, position) if nested else rules
+
+
+def serialize_css(rules, indent=''):
+    """Write parsed rules back out as a stylesheet, one declaration per line"""
+    parts = []
+    for prelude, body in rules:
+        if body is None:
+            parts.append(f"{indent}{prelude};")
+        elif isinstance(body, list):
+            parts.append(f"{indent}{prelude} {{\n{serialize_css(body, indent + '    ')}\n{indent}}}")
+        else:
+            declarations = '\n'.join(f"{indent}    {line.strip()}" for line in body.splitlines() if line.strip())
+            parts.append(f"{indent}{prelude} {{\n{declarations}\n{indent}}}")
+    return '\n'.join(parts)
+
+
+def select_rules(rules, keep):
+    """Return the style rules whose prelude passes keep, descending into grouping at-rules"""
+    selected = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            children = select_rules(body, keep)
+            if children:
+                selected.append((prelude, children))
+        elif body is not None and not prelude.startswith('@') and keep(prelude):
+            selected.append((prelude, body))
+    return selected
+
+
+def is_critical(prelude):
+    """Return whether any selector of a rule starts with an above-the-fold element"""
+    for selector in prelude.split(','):
+        match = LEADING_SELECTOR_PATTERN.match(selector.strip())
+        if match and match[1] in CRITICAL_SELECTORS:
+            return True
+    return False
+
+
+def critical_css(css):
+    """Return the rules of a stylesheet that style the above-the-fold header, navigation, masthead and quick actions"""
+    return serialize_css(select_rules(parse_css(css), is_critical))
+
+
+def theme_variables(config):
+    """Return a (custom property, value) pair for every themeable config value"""
+    masthead = config['masthead']
+    derived = {
+        ('masthead', 'background'):
+            masthead['background_gradient'] if masthead['background_type'] == 'gradient' else masthead['background_image']
+    }
+    return [
+        (name, f"{derived[(section, key)] if (section, key) in derived else config[section][key]}{unit}")
+        for name, section, key, unit in THEME_VARIABLES
+    ]
+
+
+def theme_block(selector, variables):
+    """Return a rule setting custom properties, e.g. a theme's :root block"""
+    declarations = ''.join(f"  {name}: {value};\n" for name, value in variables)
+    return f"{selector} {{\n{declarations}}}\n"
+
+
+def preset_variables(palette):
+    """Return the custom properties a preset palette sets"""
+    properties = {key: name for name, section, key, unit in THEME_VARIABLES if section == 'colors'}
+    return [(properties[key], value) for key, value in palette.items()]
+
+
+def split_top_level(text, separator):
+    """Split CSS text on a separator character that is outside strings, parentheses and brackets"""
+    parts = []
+    depth = 0
+    start = 0
+    position = 0
+    while position < len(text):
+        character = text[position]
+        if character in '"\'':
+            position = skip_string(text, position)
+            continue
+        if character in '([':
+            depth += 1
+        elif character in ')]':
+            depth -= 1
+        elif character == separator and depth == 0:
+            parts.append(text[start:position])
+            start = position + 1
+        position += 1
+    parts.append(text[start:])
+    return parts
+
+
+def selector_parts(selector):
+    """Split one selector into its ids, classes, element names, and attribute and pseudo-class parts
+
+    Arguments of functional pseudo-classes such as :not() are not looked into.
+    """
+    attributes = ATTRIBUTE_SELECTOR_PATTERN.findall(selector)
+    rest = ATTRIBUTE_SELECTOR_PATTERN.sub(' ', selector)
+    pseudos = PSEUDO_SELECTOR_PATTERN.findall(rest)
+    rest = PSEUDO_SELECTOR_PATTERN.sub(' ', rest)
+    ids = [name for kind, name in ID_CLASS_PATTERN.findall(rest) if kind == '#']
+    classes = [name for kind, name in ID_CLASS_PATTERN.findall(rest) if kind == '.']
+    types = [name.lower() for name in TYPE_SELECTOR_PATTERN.findall(ID_CLASS_PATTERN.sub(' ', rest))]
+    return ids, classes, types, attributes + pseudos
+
+
+def specificity(selector):
+    """Return the (id, class, type) specificity of one selector, or None when it uses selector arguments"""
+    if SELECTOR_FUNCTION_PATTERN.search(selector):
+        return None
+    ids, classes, types, others = selector_parts(selector)
+    elements = [part for part in others if part.startswith('::') or part.lower() in LEGACY_PSEUDO_ELEMENTS]
+    return len(ids), len(classes) + len(others) - len(elements), len(types) + len(elements)
+
+
+def may_tie(prelude, other):
+    """Return whether some selector of one rule may have the same specificity as one of another's"""
+    ours = [specificity(selector) for selector in split_top_level(prelude, ',')]
+    theirs = [specificity(selector) for selector in split_top_level(other, ',')]
+    return any(a is None or b is None or a == b for a in ours for b in theirs)
+
+
+def declarations(body):
+    """Return the declarations of a rule body, without their semicolons"""
+    return [declaration.strip() for declaration in split_top_level(body, ';') if declaration.strip()]
+
+
+def declared_properties(body):
+    """Return (property, important) for each declaration of a rule body"""
+    properties = []
+    for declaration in declarations(body):
+        name, _, value = declaration.partition(':')
+        properties.append((name.strip().lower(), bool(IMPORTANT_PATTERN.search(value))))
+    return properties
+
+
+def properties_overlap(name, other):
+    """Return whether two properties may set the same value, counting shorthands such as margin and margin-top"""
+    if name.startswith('--') or other.startswith('--'):
+        return name == other
+    return name == other or name.startswith(other + '-') or other.startswith(name + '-')
+
+
+def may_reorder(rule, rules):
+    """Return whether a style rule can move past rules without changing what any element ends up with
+
+    Order only decides between declarations of overlapping properties with
+    equal importance from selectors of equal specificity.
+    """
+    prelude, body = rule
+    properties = declared_properties(body)
+    for other_prelude, other_body in rules:
+        if isinstance(other_body, list):
+            if not may_reorder(rule, other_body):
+                return False
+        elif other_body is not None and not other_prelude.startswith('@') and may_tie(prelude, other_prelude):
+            for other_name, other_important in declared_properties(other_body):
+                if any(important == other_important and properties_overlap(name, other_name) for name, important in properties):
+                    return False
+    return True
+
+
+def prune_rules(rules, keep_selector):
+    """Drop the selectors keep_selector rejects, and rules left with none, descending into grouping at-rules
+
+    Other at-rules, such as @keyframes and @font-face, are kept as they are.
+    """
+    pruned = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            children = prune_rules(body, keep_selector)
+            if children:
+                pruned.append((prelude, children))
+        elif body is None or prelude.startswith('@'):
+            pruned.append((prelude, body))
+        else:
+            selectors = [selector.strip() for selector in split_top_level(prelude, ',')]
+            kept = [selector for selector in selectors if keep_selector(selector)]
+            if kept:
+                pruned.append((prelude if len(kept) == len(selectors) else ', '.join(kept), body))
+    return pruned
+
+
+def merge_rules(rules):
+    """Fold style rules that repeat a selector list at the same level into one, where the cascade allows it
+
+    The earlier rule's declarations move to the later rule's position, or
+    the later rule's to the earlier one's, whichever crosses no rule that
+    could decide the same property differently.
+    """
+    merged = [(prelude, merge_rules(body) if isinstance(body, list) else body) for prelude, body in rules]
+    keys = [
+        ','.join(' '.join(selector.split()) for selector in split_top_level(prelude, ','))
+        if isinstance(body, str) and not prelude.startswith('@') and '{' not in body else None
+        for prelude, body in merged
+    ]
+    for first in range(len(merged)):
+        if keys[first] is None:
+            continue
+        for second in range(first + 1, len(merged)):
+            if keys[second] != keys[first]:
+                continue
+            between = [rule for rule, key in zip(merged[first + 1:second], keys[first + 1:second]) if rule is not None]
+            body = ';\n'.join(declarations(merged[first][1]) + declarations(merged[second][1])) + ';'
+            if may_reorder(merged[first], between):
+                merged[second] = (merged[second][0], body)
+                merged[first], keys[first] = None, None
+            elif may_reorder(merged[second], between):
+                merged[first] = (merged[first][0], body)
+                merged[second], keys[second] = None, None
+                continue
+            break
+    return [rule for rule in merged if rule is not None]
+
+
+def minify_text(text, pattern):
+    """Collapse whitespace outside quoted strings to single spaces, dropping it where pattern matches"""
+    pieces = QUOTED_PATTERN.split(text)
+    for index in range(0, len(pieces), 2):
+        piece = pattern.sub(lambda match: ''.join(filter(None, match.groups())), WHITESPACE_PATTERN.sub(' ', pieces[index]))
+        pieces[index] = piece.replace(';}', '}')
+    return ''.join(pieces).strip()
+
+
+def minify_css(rules):
+    """Write parsed rules back out with no optional whitespace or final semicolons"""
+    parts = []
+    for prelude, body in rules:
+        at_rule = prelude.startswith('@')
+        head = minify_text(prelude, AT_RULE_SPACE_PATTERN if at_rule else SELECTOR_SPACE_PATTERN)
+        if body is None:
+            parts.append(f"{head};")
+        elif isinstance(body, list):
+            parts.append(f"{head}{{{minify_css(body)}}}")
+        elif '{' in body:
+            parts.append(f"{head}{{{minify_text(body, BLOCK_SPACE_PATTERN).rstrip(';')}}}")
+        else:
+            minified = [
+                f"{name.strip()}:{minify_text(value, BLOCK_SPACE_PATTERN)}"
+                for name, _, value in (declaration.partition(':') for declaration in declarations(body))
+            ]
+            parts.append(f"{head}{{{';'.join(minified)}}}")
+    return ''.join(parts)
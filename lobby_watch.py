@@ -0,0 +1,166 @@
+"""Watch mode: keep an event's rendered package in step with its files as they are edited"""
+import hashlib
+import json
+import os
+import time
+
+from lobby_data import SESSION_SCHEMA, SPEAKER_SCHEMA, SpeakerSessionIndex, diff_table, load_table
+from lobby_renderer import LobbyRenderer, RenderCache, package_timestamp
+
+# Seconds between checks of the event's files for changes
+WATCH_INTERVAL_SECONDS = 0.5
+
+# Schema of each event table by file name; rows are matched across versions by the schema's key
+EVENT_TABLES = {'sessions.csv': SESSION_SCHEMA, 'speakers.csv': SPEAKER_SCHEMA}
+
+
+def load_event_file(event_dir, file_name):
+    """Load one event file: the config as a dict, or a table as a clean DataFrame"""
+    path = os.path.join(event_dir, file_name)
+    if file_name in EVENT_TABLES:
+        return load_table(path, file_name, EVENT_TABLES[file_name])[0]
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_atomic(path, data):
+    """Write bytes through a temporary file, so readers see the old file or the new one and never a mix"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    partial_path = f"{path}.{os.getpid()}.partial"
+    with open(partial_path, "wb") as f:
+        f.write(data)
+    os.replace(partial_path, path)
+
+
+class EventWatcher:
+    """Re-renders an event's package into output_dir whenever its files change
+
+    Each cycle reloads only the files whose modification time changed and
+    diffs reloaded tables against the previous load by key. The render cache
+    and speaker index live across cycles, so only the cards of changed rows
+    are rendered again, and only files whose content changed are rewritten.
+    """
+
+    def __init__(self, event_dir, output_dir, input_files, log=print):
+        self.event_dir = event_dir
+        self.output_dir = output_dir
+        self.input_files = input_files
+        self.log = log
+        self.cache = RenderCache()
+        self.speaker_index = SpeakerSessionIndex()
+        # Modification time of each file when last checked, and when last loaded
+        self.observed = {}
+        self.modified = {}
+        self.inputs = {}
+        # Whether loaded content has changed since the last successful render
+        self.dirty = False
+        # Digest of each file last written to output_dir
+        self.written = {}
+
+    def changed_files(self):
+        """Return the input files modified since they were loaded and unchanged since the previous check
+
+        Waiting for a file to hold still for one check keeps a cycle from
+        reading a save that is still in progress.
+        """
+        changed = []
+        for file_name in self.input_files:
+            modified = os.stat(os.path.join(self.event_dir, file_name)).st_mtime_ns
+            settled = self.observed.get(file_name) == modified
+            self.observed[file_name] = modified
+            if settled and self.modified.get(file_name) != modified:
+                self.modified[file_name] = modified
+                changed.append(file_name)
+        return changed
+
+    def reload(self, file_names):
+        """Load the given files over the previous versions and return a note describing each change
+
+        A file saved without changes leaves the package as it is.
+        """
+        notes = []
+        for file_name in file_names:
+            previous = self.inputs.get(file_name)
+            current = self.inputs[file_name] = load_event_file(self.event_dir, file_name)
+            if file_name not in EVENT_TABLES:
+                notes.append(f"{file_name} reloaded")
+                self.dirty = self.dirty or current != previous
+                continue
+            changes = diff_table(previous, current, EVENT_TABLES[file_name]) if previous is not None else None
+            if file_name == 'sessions.csv':
+                self.speaker_index.sync(current, None if changes is None else changes.keys('speaker'))
+            if changes is not None:
+                notes.append(f"{file_name}: {changes.summary()}")
+                self.dirty = self.dirty or len(changes) > 0
+            else:
+                notes.append(f"{file_name}: {len(current):,} rows loaded")
+                self.dirty = True
+        return notes
+
+    def render(self):
+        """Render the package and write the files whose content changed
+
+        Returns the renderer and the numbers of files written and removed.
+        Pages are written after the assets they reference, the lobby last.
+        """
+        session_data = self.inputs['sessions.csv']
+        speaker_data = self.inputs['speakers.csv']
+        renderer = LobbyRenderer(
+            self.inputs['config.json'], session_data, speaker_data, self.cache, self.speaker_index,
+            base_dir=self.event_dir
+        )
+        files = {
+            file_name: content if isinstance(content, bytes) else content.encode('utf-8')
+            for file_name, content in renderer.package_files(package_timestamp())
+        }
+
+        written = 0
+        for file_name in sorted(files, key=lambda file_name: (file_name.endswith('.html'), file_name == 'index.html')):
+            digest = hashlib.sha256(files[file_name]).digest()
+            if self.written.get(file_name) != digest:
+                write_atomic(os.path.join(self.output_dir, file_name), files[file_name])
+                self.written[file_name] = digest
+                written += 1
+
+        stale = [file_name for file_name in self.written if file_name not in files]
+        for file_name in stale:
+            path = os.path.join(self.output_dir, file_name)
+            if os.path.exists(path):
+                os.remove(path)
+            del self.written[file_name]
+        return renderer, written, len(stale)
+
+    def cycle(self):
+        """Reload changed files and re-render, logging what changed; returns whether anything had"""
+        changed = self.changed_files()
+        if not changed:
+            return False
+
+        started = time.perf_counter()
+        try:
+            notes = self.reload(changed)
+            if not self.dirty:
+                self.log(f"{'; '.join(notes)} | nothing to re-render")
+                return True
+            renderer, written, removed = self.render()
+            self.dirty = False
+        except Exception as e:
+            # Typically a file caught mid-save; its next save triggers another cycle
+            self.log(f"Render failed, keeping the previous output: {type(e).__name__}: {e}")
+            return True
+
+        totals = {'session_cards': len(renderer.session_data), 'speaker_cards': len(renderer.speaker_data)}
+        cards = ", ".join(
+            f"{renderer.rows_rendered.get(name, 0):,}/{total:,} {name.replace('_', ' ')}" for name, total in totals.items()
+        )
+        self.log(
+            f"{'; '.join(notes)} | re-rendered {cards} | {written} files written, {removed} removed "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        return True
+
+    def run(self, interval=WATCH_INTERVAL_SECONDS):
+        """Check for changes every interval seconds until interrupted"""
+        while True:
+            self.cycle()
+            time.sleep(interval)
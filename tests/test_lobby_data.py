@@ -0,0 +1,176 @@
+"""Tests for table diffs, editor edits and the speaker-session index"""
+import pandas as pd
+
+from lobby_benchmark import synthetic_event
+from lobby_data import SESSION_SCHEMA, apply_editor_edits, build_speaker_index, diff_table
+
+
+def index_contents(index):
+    """Return the speaker filed for each session and the sessions filed for each speaker, order aside"""
+    return index.speaker_by_session, {speaker: sorted(sessions) for speaker, sessions in index.sessions_by_speaker.items()}
+
+
+def editor_frame(base, state):
+    """Return the frame the data editor shows for base after the edits in state"""
+    edited = base.copy()
+    for position, edits in state['edited_rows'].items():
+        for column, value in edits.items():
+            edited.at[base.index[position], column] = value
+    edited = edited.drop(index=base.index[state['deleted_rows']])
+    added = pd.DataFrame(state['added_rows'], columns=base.columns, index=range(len(state['added_rows'])))
+    return pd.concat([edited, added.astype(object)]) if len(added) else edited
+
+
+def editor_state(edited_rows=None, deleted_rows=(), added_rows=()):
+    """Return a data editor state with the given edits"""
+    return {'edited_rows': dict(edited_rows or {}), 'deleted_rows': list(deleted_rows), 'added_rows': list(added_rows)}
+
+
+def new_row(session_id, title):
+    """Return a row as the data editor adds it, with the cells left empty"""
+    return {'id': session_id, 'title': title, 'speaker': "Speaker 9"}
+
+
+def test_diff_table_reports_added_removed_and_changed_rows():
+    session_data, _ = synthetic_event(10, 3, 3)
+    edited = session_data.drop(index=[2]).reset_index(drop=True)
+    edited.loc[0, 'title'] = "Renamed"
+    edited.loc[1, 'speaker'] = "Speaker 9"
+    edited.loc[1, 'featured'] = not edited.loc[1, 'featured']
+    edited = pd.concat([edited, session_data.iloc[[4]].assign(id=100)], ignore_index=True)
+
+    changes = diff_table(session_data, edited, SESSION_SCHEMA)
+    assert changes.added == [100]
+    assert changes.removed == [3]
+    assert changes.changed == {1: ['title'], 2: ['speaker', 'featured']}
+    assert changes.keys('speaker') == [100, 3, 2]
+    assert changes.summary() == "2 changed, 1 added, 1 removed"
+
+
+def test_diff_table_ignores_reordered_rows():
+    session_data, _ = synthetic_event(10, 3, 3)
+    reordered = session_data.iloc[::-1].reset_index(drop=True)
+    changes = diff_table(session_data, reordered, SESSION_SCHEMA)
+    assert len(changes) == 0
+
+    reordered.loc[0, 'title'] = "Renamed"
+    assert diff_table(session_data, reordered, SESSION_SCHEMA).changed == {10: ['title']}
+
+
+def test_diff_table_compares_list_cells_by_value():
+    session_data, _ = synthetic_event(10, 3, 3)
+    edited = session_data.copy()
+    edited['tags'] = [list(tags) for tags in edited['tags']]
+    assert len(diff_table(session_data, edited, SESSION_SCHEMA)) == 0
+    edited.at[0, 'tags'] = ["Tag 9"]
+    assert diff_table(session_data, edited, SESSION_SCHEMA).changed == {1: ['tags']}
+
+
+def test_diff_table_gives_up_on_unmatchable_rows():
+    session_data, _ = synthetic_event(10, 3, 3)
+    duplicated = session_data.copy()
+    duplicated.loc[1, 'id'] = 1
+    missing = session_data.copy()
+    missing.loc[1, 'id'] = pd.NA
+    assert diff_table(session_data, duplicated, SESSION_SCHEMA) is None
+    assert diff_table(missing, session_data, SESSION_SCHEMA) is None
+    assert diff_table(session_data, session_data.drop(columns=['tags']), SESSION_SCHEMA) is None
+
+
+def run_editor(data, base, previous, current):
+    """Apply the editor's move from previous to current, checking data ends up as the editor shows it"""
+    changes, state, touched = apply_editor_edits(
+        data, base, editor_frame(base, current), previous, current, SESSION_SCHEMA
+    )
+    expected = editor_frame(base, current)
+    assert data['id'].tolist() == expected['id'].tolist()
+    assert data['title'].tolist() == expected['title'].tolist()
+    return changes, state, touched
+
+
+def test_editor_edits_are_applied_once():
+    base, _ = synthetic_event(6, 3, 3)
+    data = base.copy()
+    empty = dict(editor_state(), labels=[])
+
+    current = editor_state({1: {'title': "Renamed"}, 3: {'speaker': "Speaker 9"}})
+    changes, state, touched = run_editor(data, base, empty, current)
+    assert changes.changed == {2: ['title'], 4: ['speaker']} and touched == [1, 3]
+    assert data.at[3, 'speaker'] == "Speaker 9"
+
+    # A rerun without further edits writes nothing
+    changes, state, touched = run_editor(data, base, state, current)
+    assert len(changes) == 0 and touched == []
+
+    # Undoing an edit writes the row back from what the editor shows
+    current = editor_state({3: {'speaker': "Speaker 9"}})
+    changes, state, touched = run_editor(data, base, state, current)
+    assert changes.changed == {2: ['title']} and data.at[1, 'title'] == base.at[1, 'title']
+
+
+def test_editor_deletions_and_added_rows():
+    base, _ = synthetic_event(6, 3, 3)
+    data = base.copy()
+    empty = dict(editor_state(), labels=[])
+
+    current = editor_state(deleted_rows=[0, 4])
+    changes, state, _ = run_editor(data, base, empty, current)
+    assert sorted(changes.removed) == [1, 5] and changes.added == []
+
+    current = editor_state(deleted_rows=[0, 4], added_rows=[new_row(100, "Added"), new_row(101, "Also added")])
+    changes, state, touched = run_editor(data, base, state, current)
+    assert changes.added == [100, 101] and state['labels'] == [6, 7] and touched == [6, 7]
+    assert data.at[6, 'tags'] == [] and data.at[6, 'description'] == ""
+
+    # Deleting the first added row shifts the second into its place
+    current = editor_state(deleted_rows=[0, 4], added_rows=[new_row(101, "Also added")])
+    changes, state, _ = run_editor(data, base, state, current)
+    assert changes.removed == [100] and changes.changed == {101: list(data.columns)} and changes.added == []
+    assert state['labels'] == [6]
+
+    # Restoring a deleted row brings back its original values
+    current = editor_state(deleted_rows=[0], added_rows=[new_row(101, "Also added")])
+    changes, state, _ = run_editor(data, base, state, current)
+    assert changes.added == [5] and data.loc[4, 'title'] == base.loc[4, 'title']
+
+
+def test_editor_key_edits_name_removed_and_added_rows():
+    base, _ = synthetic_event(6, 3, 3)
+    data = base.copy()
+    empty = dict(editor_state(), labels=[])
+
+    changes, state, _ = run_editor(data, base, empty, editor_state({2: {'id': 30}}))
+    assert (changes.added, changes.removed, changes.changed) == ([30], [3], {})
+
+    # Setting the key back to its own value changes the row rather than replacing it
+    changes, state, _ = run_editor(data, base, state, editor_state({2: {'id': 3}}))
+    assert (changes.added, changes.removed) == ([3], [30])
+    changes, state, _ = run_editor(data, base, state, editor_state({2: {'id': 3, 'title': "Renamed"}}))
+    assert changes.changed == {3: ['id', 'title']}
+
+
+def test_speaker_index_syncs_only_the_given_sessions():
+    session_data, _ = synthetic_event(50, 10, 5)
+    index = build_speaker_index(session_data)
+
+    edited = session_data.drop(index=[3, 4]).reset_index(drop=True)
+    edited.loc[0, 'speaker'] = "Speaker 99"
+    edited.loc[1, 'title'] = "Renamed"
+    added = session_data.iloc[[5]].assign(id=1000)
+    edited = pd.concat([edited, added], ignore_index=True)
+
+    changes = diff_table(session_data, edited, SESSION_SCHEMA)
+    assert sorted(changes.keys('speaker')) == sorted([1, 4, 5, 1000])
+    assert index.sync(edited, changes.keys('speaker')) == 4
+    assert index_contents(index) == index_contents(build_speaker_index(edited))
+
+
+def test_speaker_index_ignores_sessions_outside_the_given_ids():
+    session_data, _ = synthetic_event(20, 5, 5)
+    index = build_speaker_index(session_data)
+    edited = session_data.copy()
+    edited.loc[0, 'speaker'] = "Speaker 99"
+    assert index.sync(edited, [2, 3]) == 0
+    assert index.session_ids("Speaker 99") == []
+    assert index.sync(edited) == 1
+    assert index.session_ids("Speaker 99") == [1]
@@ -0,0 +1,36 @@
+"""Tests for escaping and assembling rendered cards"""
+import json
+
+import pandas as pd
+
+from lobby_benchmark import DEFAULT_BENCHMARK_CONFIG, synthetic_event
+from lobby_renderer import LobbyRenderer
+
+
+def load_config():
+    with open(DEFAULT_BENCHMARK_CONFIG) as f:
+        return json.load(f)
+
+
+def test_escape_column_keeps_values_with_nul_on_their_own_row():
+    session_data, speaker_data = synthetic_event(3, 2, 3)
+    renderer = LobbyRenderer(load_config(), session_data, speaker_data)
+    data = pd.DataFrame({'text': ["a\0b", "<i>&</i>", "a\0b", ""]})
+    assert renderer.escape_column(data, 'text') == ["a\0b", "&lt;i&gt;&amp;&lt;/i&gt;", "a\0b", ""]
+    assert renderer.escape_column(data.iloc[:0], 'text') == []
+
+
+def test_speaker_pages_hold_their_own_sessions_when_data_has_nul():
+    session_data, speaker_data = synthetic_event(20, 4, 3)
+    session_data.loc[0, 'title'] = "Before\0After"
+    speaker_data.loc[0, 'bio'] = "Bio\0with a NUL"
+    config = load_config()
+    config['advanced']['static_site']['enabled'] = True
+    renderer = LobbyRenderer(config, session_data, speaker_data)
+
+    pages = renderer.site_speaker_pages(renderer.session_cards())
+    for (_, _, _, body, _), name in zip(pages, speaker_data['name']):
+        presented = session_data.loc[session_data['speaker'] == name, 'title']
+        assert body.count('class="session-card') == len(presented)
+        assert all(title in body for title in presented)
+    assert "Bio\0with a NUL" in pages[0][3]
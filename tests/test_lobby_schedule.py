@@ -0,0 +1,119 @@
+"""Tests for session time parsing, the interval tree and statuses computed from the schedule"""
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lobby_schedule import (
+    DEFAULT_SCHEDULE, IntervalTree, ScheduleIndex, parse_session_times, parse_time_range, resolve_zone, schedule_errors
+)
+
+EVENT_DAY = date(2024, 3, 15)
+BERLIN = ZoneInfo("Europe/Berlin")
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def schedule_index(times, event_date="2024-03-15", zone_name="UTC"):
+    return ScheduleIndex(parse_session_times(pd.Series(times), event_date, zone_name))
+
+
+@pytest.mark.parametrize("text, start, end", [
+    ("10:00 AM - 11:30 AM", utc(2024, 3, 15, 10), utc(2024, 3, 15, 11, 30)),
+    ("11 - 1 PM", utc(2024, 3, 15, 11), utc(2024, 3, 15, 13)),
+    ("Day 2, 9:00 - 10:00", utc(2024, 3, 16, 9), utc(2024, 3, 16, 10)),
+    ("2024-04-01 14:00 - 15:00 +02:00", utc(2024, 4, 1, 12), utc(2024, 4, 1, 13)),
+    # Crossing midnight: the end falls on the next day
+    ("11:00 PM - 1:00 AM", utc(2024, 3, 15, 23), utc(2024, 3, 16, 1)),
+    ("23:30 - 23:30", utc(2024, 3, 15, 23, 30), utc(2024, 3, 16, 23, 30))
+])
+def test_parse_time_range(text, start, end):
+    assert parse_time_range(text, EVENT_DAY, timezone.utc) == (start, end)
+
+
+@pytest.mark.parametrize("text", ["", "TBA", "25:00 - 26:00", "10:75 - 11:00", "10:00 - 11:00 Mars/Base"])
+def test_parse_time_range_rejects_unreadable_times(text):
+    assert parse_time_range(text, EVENT_DAY, timezone.utc) is None
+
+
+def test_sessions_across_a_dst_change_last_their_real_length():
+    # Berlin springs forward at 02:00 on 2024-03-31, so 01:30-03:30 lasts one hour
+    start, end = parse_time_range("2024-03-31 1:30 - 3:30 Europe/Berlin", EVENT_DAY, timezone.utc)
+    assert (start.astimezone(timezone.utc), end.astimezone(timezone.utc)) == (utc(2024, 3, 31, 0, 30), utc(2024, 3, 31, 1, 30))
+
+    # It falls back at 03:00 on 2024-10-27, so 23:00-03:00 across that midnight lasts five hours
+    start, end = parse_time_range("2024-10-26 11 PM - 3 AM", EVENT_DAY, BERLIN)
+    assert end - start == timedelta(hours=4)
+    assert end.astimezone(timezone.utc) - start.astimezone(timezone.utc) == timedelta(hours=5)
+
+
+def test_parse_session_times_converts_to_utc():
+    times = pd.Series(["2024-10-26 11 PM - 3 AM", "nonsense", None])
+    parsed = parse_session_times(times, "2024-10-26", "Europe/Berlin")
+    assert parsed['start'].iloc[0] == pd.Timestamp("2024-10-26 21:00", tz="UTC")
+    assert parsed['end'].iloc[0] == pd.Timestamp("2024-10-27 02:00", tz="UTC")
+    assert parsed.iloc[1:].isna().all().all()
+
+
+def brute_force_stab(starts, ends, point):
+    return sorted(i for i, (start, end) in enumerate(zip(starts, ends)) if start <= point < end)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_interval_tree_matches_brute_force_on_overlapping_intervals(seed):
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, 100, 300)
+    ends = starts + rng.integers(1, 40, 300)
+    # Identical and nested intervals
+    starts[:20], ends[:20] = 10, 50
+    starts[20:30], ends[20:30] = 20, 30
+    tree = IntervalTree(starts, ends)
+    for point in range(-5, 150):
+        assert sorted(tree.stab(point).tolist()) == brute_force_stab(starts, ends, point)
+
+
+def test_interval_tree_treats_intervals_as_half_open():
+    tree = IntervalTree([0, 10], [10, 20])
+    assert tree.stab(9).tolist() == [0]
+    assert tree.stab(10).tolist() == [1]
+    assert tree.stab(20).tolist() == []
+    assert IntervalTree([], []).stab(0).tolist() == []
+
+
+def test_statuses_for_overlapping_sessions():
+    index = schedule_index([
+        "10:00 - 12:00", "11:00 - 11:30", "10:00 - 12:00", "12:30 - 13:00", "9:00 - 10:00", "16:00 - 17:00", "TBA"
+    ])
+    statuses = index.statuses_at(utc(2024, 3, 15, 11, 15), timedelta(hours=2), ['live'] * 6 + ['finished'])
+    assert statuses.tolist() == ['live', 'live', 'live', 'upcoming', 'finished', 'scheduled', 'finished']
+    assert index.live_at(utc(2024, 3, 15, 11, 30)).tolist() == [0, 2]
+
+
+def test_statuses_for_a_session_crossing_midnight():
+    index = schedule_index(["11:00 PM - 1:00 AM", "Day 2, 0:30 - 0:45"])
+    assert index.statuses_at(utc(2024, 3, 16, 0, 40), timedelta(hours=1), [''] * 2).tolist() == ['live', 'live']
+    assert index.statuses_at(utc(2024, 3, 16, 1), timedelta(hours=1), [''] * 2).tolist() == ['finished', 'finished']
+    assert index.statuses_at(utc(2024, 3, 15, 22, 30), timedelta(hours=1), [''] * 2).tolist() == ['upcoming', 'scheduled']
+
+
+def test_statuses_across_a_dst_change():
+    index = schedule_index(["1:30 - 3:30", "3:00 - 4:00"], "2024-03-31", "Europe/Berlin")
+    # 03:10 CEST is 01:10 UTC: the first session (00:30-01:30 UTC) runs, the second starts at 01:00 UTC
+    statuses = index.statuses_at(pd.Timestamp("2024-03-31 03:10", tz=BERLIN), timedelta(hours=1), [''] * 2)
+    assert statuses.tolist() == ['live', 'live']
+    statuses = index.statuses_at(pd.Timestamp("2024-03-31 03:40", tz=BERLIN), timedelta(hours=1), [''] * 2)
+    assert statuses.tolist() == ['finished', 'live']
+
+
+def test_schedule_errors_name_unusable_settings():
+    assert schedule_errors(DEFAULT_SCHEDULE) == []
+    settings = {**DEFAULT_SCHEDULE, 'event_date': '', 'timezone': '+5', 'upcoming_window_minutes': 'soon'}
+    assert len(schedule_errors(settings)) == 3
+    assert len(schedule_errors({**DEFAULT_SCHEDULE, 'timezone': 'Mars/Base'})) == 1
+    assert len(schedule_errors({**DEFAULT_SCHEDULE, 'preview_time': 'later'})) == 1
+    with pytest.raises(ValueError):
+        resolve_zone("+5")
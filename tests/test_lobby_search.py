@@ -0,0 +1,94 @@
+"""Tests for the suggestion index and its reference ranking"""
+import json
+
+import pandas as pd
+import pytest
+
+from lobby_benchmark import DEFAULT_BENCHMARK_CONFIG, synthetic_event
+from lobby_renderer import LobbyRenderer
+from lobby_search import SUGGESTION_INDEX_FILE, SUGGESTION_PHRASE_LIMIT, build_suggestion_index, suggest
+
+
+def sessions(rows):
+    """Return session data holding only the columns suggestions are drawn from"""
+    return pd.DataFrame(rows, columns=['title', 'speaker', 'company', 'tags'])
+
+
+@pytest.fixture(scope="module")
+def event():
+    return synthetic_event(200, 40, 20)
+
+
+@pytest.fixture(scope="module")
+def index(event):
+    return build_suggestion_index(event[0])
+
+
+@pytest.mark.parametrize("query, text, kind", [
+    ("speker 12", "Speaker 12", "speaker"),
+    ("compny 7", "Company 7", "company"),
+    ("sesion 42", "Session 42: Building Systems at Scale", "title"),
+    ("tga 3", "Tag 3", "tags")
+])
+def test_misspelt_queries_resolve_to_the_intended_phrase(index, query, text, kind):
+    best = suggest(index, query)[0]
+    assert (best['text'], best['kind']) == (text, kind)
+
+
+def test_unrelated_queries_suggest_nothing(index):
+    assert suggest(index, "xylophone") == []
+    assert suggest(index, "") == []
+
+
+def test_suggestions_are_limited(index):
+    assert len(suggest(index, "speaker", limit=3)) == 3
+
+
+def test_share_of_query_trigrams_ranks_first():
+    # The misspelt title is far more popular but shares fewer of the query's trigrams
+    data = sessions([["Deep Leaning", "", "", []]] * 5 + [["Deep Learning Systems", "", "", []]])
+    assert [s['text'] for s in suggest(build_suggestion_index(data), "deep learning")] == [
+        "Deep Learning Systems", "Deep Leaning"
+    ]
+
+
+def test_whole_phrase_similarity_breaks_ties_in_share():
+    data = sessions([["Deep Learning at Planet Scale", "", "", []]] * 5 + [["Deep Learning", "", "", []]])
+    results = suggest(build_suggestion_index(data), "deep learning")
+    assert [s['score'] for s in results] == [1.0, 1.0]
+    assert [s['text'] for s in results] == ["Deep Learning", "Deep Learning at Planet Scale"]
+
+
+def test_popularity_breaks_ties_in_share_and_similarity():
+    data = sessions([["", "Speaker 1", "", []]] + [["", "Speaker 2", "", []]] * 3 + [["", "Speaker 3", "", []]] * 2)
+    results = suggest(build_suggestion_index(data), "speaker")
+    assert [(s['text'], s['sessions']) for s in results] == [("Speaker 2", 3), ("Speaker 3", 2), ("Speaker 1", 1)]
+
+
+def test_phrase_seen_in_several_columns_is_suggested_once():
+    data = sessions([["", "Ada Lovelace", "", ["Ada Lovelace"]], ["", "", "", ["Ada Lovelace"]]])
+    results = suggest(build_suggestion_index(data), "ada")
+    assert [(s['text'], s['kind'], s['sessions']) for s in results] == [("Ada Lovelace", "tags", 2)]
+
+
+def test_index_size_is_bounded_for_large_events():
+    session_data, _ = synthetic_event(20_000, 2_000, 200)
+    index = build_suggestion_index(session_data)
+    assert len(index['phrases']) == SUGGESTION_PHRASE_LIMIT
+    assert index['sessions'] == sorted(index['sessions'], reverse=True)
+    # Every company and tag appears in many sessions, so all of them outrank the one-off titles
+    assert {f"Company {number}" for number in range(500)} <= set(index['phrases'])
+    assert len(build_suggestion_index(session_data, limit=100)['phrases']) == 100
+
+
+def test_exported_index_matches_reference(event, index):
+    session_data, speaker_data = event
+    with open(DEFAULT_BENCHMARK_CONFIG) as f:
+        config = json.load(f)
+    config['quick_actions'].update(show_search=True, search_suggestions=True)
+    files = dict(LobbyRenderer(config, session_data, speaker_data).package_files())
+
+    exported = json.loads(files[SUGGESTION_INDEX_FILE])
+    assert exported == index
+    for query in ["speker 12", "compny 7", "sesion", "tag", "building systms"]:
+        assert suggest(exported, query) == suggest(index, query)
@@ -0,0 +1,129 @@
+"""Tests for content negotiation, ETag matching and conditional requests in the package server"""
+import gzip
+import http.client
+import os
+import shutil
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import lobby_server
+from lobby_cli import EVENT_FILES, load_event
+from lobby_server import PackageHandler, PackageSource, accepted_encodings, etag_matches
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("header, accepted", [
+    (None, set()),
+    ("", set()),
+    ("gzip", {'gzip'}),
+    ("gzip, br", {'gzip', 'br'}),
+    ("GZIP;q=0.5, br;q=0", {'gzip'}),
+    ("br;q=0.0, gzip;q=1", {'gzip'}),
+    ("gzip;q=0", set()),
+    ("gzip;q=junk", set()),
+    ("*", {'*', 'br', 'gzip'}),
+    ("identity, deflate", {'identity', 'deflate'})
+])
+def test_accepted_encodings(header, accepted):
+    assert accepted_encodings(header) == accepted
+
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ('"abc"', True),
+    ('"xyz"', False),
+    ('"xyz", "abc"', True),
+    ('"xyz","abc" , "def"', True),
+    ('W/"abc"', True),
+    ('"xyz", W/"abc"', True),
+    ('*', True),
+    ('"ab"', False)
+])
+def test_etag_matches(header, matches):
+    assert etag_matches(header, '"abc"') is matches
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """Serve a copy of the bundled event, returning a function that makes a request and the event directory"""
+    for file_name in EVENT_FILES:
+        shutil.copy(os.path.join(REPO_DIR, file_name), tmp_path / file_name)
+    # Every request checks the inputs, so tests see changes without waiting
+    monkeypatch.setattr(lobby_server, 'SERVE_REFRESH_SECONDS', 0.0)
+    source = PackageSource(str(tmp_path), load_event, EVENT_FILES)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), partial(PackageHandler, source=source))
+    monkeypatch.setattr(PackageHandler, "log_message", lambda self, *args: None)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    def request(path, method="GET", **headers):
+        connection = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1])
+        connection.request(method, path, headers={name.replace('_', '-'): value for name, value in headers.items()})
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return response.status, response.headers, body
+
+    yield request, tmp_path
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_conditional_get_answers_304_without_a_body(server):
+    request, _ = server
+    status, headers, body = request("/")
+    assert status == 200 and headers['ETag'] and body
+    assert headers['Cache-Control'] == "no-cache"
+
+    for if_none_match in [headers['ETag'], f'"other", {headers["ETag"]}', f'W/{headers["ETag"]}', '*']:
+        status, not_modified, body = request("/", If_None_Match=if_none_match)
+        assert (status, body) == (304, b"")
+        assert not_modified['ETag'] == headers['ETag']
+        assert 'Content-Length' not in not_modified
+
+    assert request("/", If_None_Match='"stale"')[0] == 200
+    assert request("/", method="HEAD", If_None_Match=headers['ETag'])[0] == 304
+
+
+def test_compressed_representations_have_their_own_etag(server):
+    request, _ = server
+    _, plain_headers, plain = request("/")
+    status, headers, body = request("/", Accept_Encoding="gzip")
+    assert status == 200 and headers['Content-Encoding'] == "gzip" and headers['Vary'] == "Accept-Encoding"
+    assert gzip.decompress(body) == plain
+    assert headers['ETag'] != plain_headers['ETag']
+
+    # A plain ETag does not validate the gzip representation, nor the other way round
+    assert request("/", Accept_Encoding="gzip", If_None_Match=plain_headers['ETag'])[0] == 200
+    assert request("/", If_None_Match=headers['ETag'])[0] == 200
+    assert request("/", Accept_Encoding="gzip", If_None_Match=headers['ETag'])[0] == 304
+
+    # q=0 refuses a coding even when it would be preferred
+    status, headers, _ = request("/", Accept_Encoding="gzip;q=0, br;q=0")
+    assert status == 200 and 'Content-Encoding' not in headers
+
+
+def test_edited_inputs_change_the_etag_once_they_settle(server):
+    request, event_dir = server
+    etag = request("/")[1]['ETag']
+    sessions = (event_dir / "sessions.csv").read_text()
+    (event_dir / "sessions.csv").write_text(sessions.replace("Quantum Computing Breakthrough", "Quantum Leap", 1))
+
+    # The first check sees the new modification time, the next reloads the settled file
+    assert request("/", If_None_Match=etag)[0] == 304
+    status, headers, body = request("/", If_None_Match=etag)
+    assert status == 200 and headers['ETag'] != etag and b"Quantum Leap" in body
+
+
+def test_malformed_inputs_keep_the_last_good_package(server):
+    request, event_dir = server
+    _, headers, body = request("/")
+    (event_dir / "config.json").write_text('{"layout": ')
+    for _ in range(3):
+        status, _, served = request("/")
+        assert (status, served) == (200, body)
+    assert request("/missing.html")[0] == 404